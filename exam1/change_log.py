@@ -0,0 +1,15 @@
+import json
+import time
+
+# 변경 피드(exam2 change_feed) 의 change_log 테이블에 기록 (exam1 스크립트가 같은 DB 를 쓸 때)
+
+def _encode(value):
+    return None if value is None else json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+def append_change(cursor, table_name, op, key, values=None):
+    """변경 피드(change_log) 가 있는 DB 면 같은 트랜잭션에 변경 이벤트를 기록"""
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'change_log'")
+    if cursor.fetchone() is None:
+        return
+    cursor.execute("INSERT INTO change_log (table_name, op, key, payload, created) VALUES (?, ?, ?, ?, ?)",
+                   (table_name, op, _encode(key), _encode(values), time.time()))
@@ -1,6 +1,8 @@
 import sqlite3
 from enum import Enum
 
+from change_log import append_change
+
 class Grant(Enum):
     ADMIN = 0
     SUB_ADMIN = 1
@@ -26,6 +28,9 @@ class MemberGateway:
                 INSERT INTO member (nick_name, kakao_nick_name, join_date, grant, last_login, score)
                 VALUES (?, ?, ?, ?, ?, ?)
             """, (self.nick_name, kakao_nick_name, join_date, grant.value, last_login, score))
+            append_change(cursor, "member", "insert", self.nick_name,
+                          {"kakao_nick_name": kakao_nick_name, "join_date": join_date, "grant": grant.value,
+                           "last_login": last_login, "score": score})
             conn.commit()
             print(f"User {self.nick_name} created successfully.")
         except sqlite3.Error as e:
@@ -47,7 +52,7 @@ class MemberGateway:
             result = cursor.fetchone()
             if result:
                 self.kakao_nick_name, self.join_date, grant_value, self.last_login, self.score = result
-                self.grant = Role(grant_value)
+                self.grant = Grant(grant_value)
                 print(f"Fetched data for {self.nick_name}: {self.__dict__}")
             else:
                 print(f"User {self.nick_name} not found.")
@@ -61,17 +66,25 @@ class MemberGateway:
         conn = sqlite3.connect(self.db_name)
         cursor = conn.cursor()
 
+        # 변경할 필드만 모아서 UPDATE 한 번으로 처리
+        fields = {}
+        if kakao_nick_name:
+            fields["kakao_nick_name"] = kakao_nick_name
+        if join_date:
+            fields["join_date"] = join_date
+        if grant:
+            fields["grant"] = grant.value
+        if last_login:
+            fields["last_login"] = last_login
+        if score is not None:
+            fields["score"] = score
+
         try:
-            if kakao_nick_name:
-                cursor.execute("UPDATE member SET kakao_nick_name = ? WHERE nick_name = ?", (kakao_nick_name, self.nick_name))
-            if join_date:
-                cursor.execute("UPDATE member SET join_date = ? WHERE nick_name = ?", (join_date, self.nick_name))
-            if grant:
-                cursor.execute("UPDATE member SET grant = ? WHERE nick_name = ?", (grant.value, self.nick_name))
-            if last_login:
-                cursor.execute("UPDATE member SET last_login = ? WHERE nick_name = ?", (last_login, self.nick_name))
-            if score is not None:
-                cursor.execute("UPDATE member SET score = ? WHERE nick_name = ?", (score, self.nick_name))
+            if fields:
+                set_clause = ", ".join(f"{column} = ?" for column in fields)
+                cursor.execute(f"UPDATE member SET {set_clause} WHERE nick_name = ?", (*fields.values(), self.nick_name))
+                if cursor.rowcount:
+                    append_change(cursor, "member", "update", self.nick_name, fields)
 
             conn.commit()
             print(f"User {self.nick_name}'s data updated successfully.")
@@ -88,6 +101,8 @@ class MemberGateway:
 
         try:
             cursor.execute("DELETE FROM member WHERE nick_name = ?", (self.nick_name,))
+            if cursor.rowcount:
+                append_change(cursor, "member", "delete", self.nick_name)
             conn.commit()
             print(f"User {self.nick_name} deleted successfully.")
         except sqlite3.Error as e:
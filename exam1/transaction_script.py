@@ -3,6 +3,8 @@
 import sqlite3
 from enum import Enum
 
+from change_log import append_change
+
 class Grant(Enum):
     ADMIN = 0
     SUB_ADMIN = 1
@@ -18,7 +20,9 @@ class Procedure:
         cursor = conn.cursor()
 
         try:
-            cursor.execute("UPDATE users SET grant = ? WHERE nick_name = ?", (grant.value, user_nick_name))
+            cursor.execute("UPDATE member SET grant = ? WHERE nick_name = ?", (grant.value, user_nick_name))
+            if cursor.rowcount:
+                append_change(cursor, "member", "update", user_nick_name, {"grant": grant.value})
             conn.commit()
             print(f"User {user_nick_name} is now {grant.name}")
         except sqlite3.Error as e:
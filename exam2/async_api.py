@@ -0,0 +1,110 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from connection_pool import get_connection, get_pool, configure_pool
+import transaction_script_func_base as scripts
+from permissions import permissions
+import schema
+
+# asyncio 용 트랜잭션 스크립트
+# 쓰기는 전용 writer 스레드 하나에서 순서대로, 읽기는 reader 스레드 풀에서 실행해 이벤트 루프를 막지 않음
+# 같은 읽기 요청이 동시에 여러 번 들어오면 한 번만 실행하고 결과를 나눠 가짐
+class AsyncMemberManagement:
+    def __init__(self, db_name="MemberManagement.db", readers=4):
+        self.db_name = db_name
+
+        # reader 스레드 + writer 스레드가 동시에 커넥션을 잡을 수 있도록 풀 크기 확보
+        if get_pool(db_name).size < readers + 1:
+            configure_pool(db_name, size=readers + 1)
+
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="member-writer")
+        self._readers = ThreadPoolExecutor(max_workers=readers, thread_name_prefix="member-reader")
+        self._inflight = {}
+        # 스키마 확인은 처음 get_connection() 할 때 한 번 (schema 의 처음 사용 훅), 권한 표는 처음 조회할 때 읽음
+
+        # 통계
+        self.reads = 0
+        self.coalesced_reads = 0
+        self.writes = 0
+
+    def _call(self, func, *args, **kwargs):
+        # 워커 스레드에서 실행 (커넥션은 풀에서 대여)
+        with get_connection(self.db_name) as conn:
+            return func(conn, *args, **kwargs)
+
+    async def _read(self, func, *args):
+        key = (func.__name__, args)
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced_reads += 1
+            return await asyncio.shield(future)
+
+        self.reads += 1
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self._readers, partial(self._call, func, *args))
+        self._inflight[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    async def _write(self, func, *args, **kwargs):
+        self.writes += 1
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._writer, partial(self._call, func, *args, **kwargs))
+
+    # 멤버
+    async def find_member(self, nick_name):
+        return await self._read(scripts.find_member, nick_name)
+
+    async def create_member(self, nick_name, kakao_nick_name, join_date, grant, last_login, score):
+        return await self._write(scripts.create_member, nick_name, kakao_nick_name, join_date, grant, last_login, score)
+
+    async def update_grant(self, nick_name, grant):
+        return await self._write(scripts.update_grant, nick_name, grant)
+
+    # 권한 확인은 메모리 표에서 바로 처리 (스레드로 넘기지 않음)
+    def has_grant(self, nick_name, grant):
+        return permissions.has_grant(self.db_name, nick_name, grant)
+
+    def members_with(self, *grants):
+        return permissions.members_with(self.db_name, *grants)
+
+    async def update_last_login(self, nick_name, last_login):
+        return await self._write(scripts.update_last_login, nick_name, last_login)
+
+    async def update_score(self, nick_name, score):
+        return await self._write(scripts.update_score, nick_name, score)
+
+    async def delete_member(self, nick_name):
+        return await self._write(scripts.delete_member, nick_name)
+
+    # 컨텐츠 레코드
+    async def find_content_record(self, content_name, start_date, nick_name):
+        return await self._read(scripts.find_content_record, content_name, start_date, nick_name)
+
+    async def insert_content_record(self, content_name, start_date, nick_name, score, participation_count, day):
+        return await self._write(scripts.insert_content_record, content_name, start_date, nick_name, score, participation_count, day)
+
+    async def update_content_record(self, content_name, start_date, nick_name, score, participation_count, day):
+        return await self._write(scripts.update_content_record, content_name, start_date, nick_name, score, participation_count, day)
+
+    async def delete_content_record(self, content_name, start_date, nick_name, day):
+        return await self._write(scripts.delete_content_record, content_name, start_date, nick_name, day)
+
+    def stats(self):
+        return {"reads": self.reads, "coalesced_reads": self.coalesced_reads, "writes": self.writes, "inflight": len(self._inflight)}
+
+    def close(self):
+        self._writer.shutdown(wait=True)
+        self._readers.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, tb):
+        # 실행 중인 작업이 끝날 때까지 기다리되 이벤트 루프는 막지 않음
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+        return False
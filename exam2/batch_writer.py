@@ -0,0 +1,75 @@
+import sqlite3
+from enum import Enum
+from itertools import islice
+
+from statement_registry import content_record_sql
+
+# 일괄 처리 기본 청크 크기
+DEFAULT_CHUNK_SIZE = 1000
+
+def chunked(rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    """iterable 을 chunk_size 크기의 리스트로 나눔"""
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def _db_value(value):
+    # Grant 등 Enum 이면 DB 값으로 변환
+    return value.value if isinstance(value, Enum) else value
+
+def execute_batch(conn, sql, rows, chunk_size=DEFAULT_CHUNK_SIZE):
+    """rows 를 청크 단위 executemany 로 실행 (전체를 하나의 트랜잭션으로 커밋), 처리한 행 수를 반환"""
+    count = 0
+    cursor = conn.cursor()
+    try:
+        for chunk in chunked(rows, chunk_size):
+            cursor.executemany(sql, [tuple(_db_value(value) for value in row) for row in chunk])
+            count += len(chunk)
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+    return count
+
+# 멤버
+def insert_member_sql(upsert=False):
+    sql = "INSERT INTO member (nick_name, kakao_nick_name, join_date, grant, last_login, score) VALUES (?, ?, ?, ?, ?, ?)"
+    if upsert:
+        sql += (" ON CONFLICT(nick_name) DO UPDATE SET kakao_nick_name = excluded.kakao_nick_name, join_date = excluded.join_date,"
+                " grant = excluded.grant, last_login = excluded.last_login, score = excluded.score")
+    return sql
+
+def insert_members(conn, members, chunk_size=DEFAULT_CHUNK_SIZE, upsert=False):
+    """members: (nick_name, kakao_nick_name, join_date, grant, last_login, score)"""
+    return execute_batch(conn, insert_member_sql(upsert), members, chunk_size)
+
+def update_members(conn, members, chunk_size=DEFAULT_CHUNK_SIZE):
+    """members: (nick_name, grant, last_login, score)"""
+    rows = ((grant, last_login, score, nick_name) for nick_name, grant, last_login, score in members)
+    return execute_batch(conn, "UPDATE member SET grant = ?, last_login = ?, score = ? WHERE nick_name = ?", rows, chunk_size)
+
+def delete_members(conn, nick_names, chunk_size=DEFAULT_CHUNK_SIZE):
+    rows = ((nick_name,) for nick_name in nick_names)
+    return execute_batch(conn, "DELETE FROM member WHERE nick_name = ?", rows, chunk_size)
+
+# 컨텐츠 레코드
+def insert_content_records(conn, table_name, records, chunk_size=DEFAULT_CHUNK_SIZE, upsert=False):
+    """records: (nick_name, score, participation_count, day)
+    upsert 는 (nick_name, day) 에 UNIQUE 인덱스가 있어야 함"""
+    sql = content_record_sql(conn, "upsert" if upsert else "insert", table_name)
+    return execute_batch(conn, sql, records, chunk_size)
+
+def update_content_records(conn, table_name, records, chunk_size=DEFAULT_CHUNK_SIZE):
+    """records: (nick_name, score, participation_count, day)"""
+    rows = ((score, participation_count, nick_name, day) for nick_name, score, participation_count, day in records)
+    return execute_batch(conn, content_record_sql(conn, "update_day", table_name), rows, chunk_size)
+
+def delete_content_records(conn, table_name, keys, chunk_size=DEFAULT_CHUNK_SIZE):
+    """keys: (nick_name, day)"""
+    return execute_batch(conn, content_record_sql(conn, "delete_day", table_name), keys, chunk_size)
@@ -0,0 +1,614 @@
+# 벤치마크 모음 : exam1 / exam2 의 데이터 접근 경로를 같은 데이터로 측정
+#
+#   python benchmark_suite.py --members 10000 --periods 4 --ops 2000 --output baseline.json
+#   python benchmark_suite.py --members 10000 --periods 4 --ops 2000 --compare baseline.json
+#   python benchmark_suite.py --content-store   (기간별 테이블을 통합 저장소로 옮긴 뒤 측정)
+#   python benchmark_suite.py --query-log       (쿼리 계측 후 비용이 큰 문장 출력)
+#   python benchmark_suite.py --scenario connection_pool batch_write   (개별 시나리오, all 이면 전부)
+#
+# 시나리오마다 처리량(ops/s), 지연 시간 p50/p95/p99, 작업당 새로 연 커넥션 수를 보고
+import argparse
+import asyncio
+import contextlib
+import gc
+import importlib.util
+import io
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+from connection_pool import close_all_pools, configure_pool, get_connection
+from async_api import AsyncMemberManagement
+from permissions import Grant, permissions
+import content_store
+import query_log
+import row_data_gateway
+import schema
+import transaction_script
+import transaction_script_func_base as scripts
+
+EXAM2_DIR = os.path.dirname(os.path.abspath(__file__))
+EXAM1_DIR = os.path.join(EXAM2_DIR, "..", "exam1")
+
+def load_exam1_module(name):
+    # exam2 와 모듈 이름이 같으므로 별도 이름으로 불러옴
+    # exam1 에만 있는 모듈(change_log) 은 import 로 찾도록 경로 뒤쪽에 추가 (같은 이름이면 exam2 가 먼저)
+    if EXAM1_DIR not in sys.path:
+        sys.path.append(EXAM1_DIR)
+    spec = importlib.util.spec_from_file_location(f"exam1_{name}", os.path.join(EXAM1_DIR, f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+# sqlite3.connect 호출 횟수 (작업당 커넥션 수 측정용)
+class ConnectCounter:
+    def __init__(self):
+        self.count = 0
+        self._connect = sqlite3.connect
+
+    def __enter__(self):
+        def counting_connect(*args, **kwargs):
+            self.count += 1
+            return self._connect(*args, **kwargs)
+
+        sqlite3.connect = counting_connect
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        sqlite3.connect = self._connect
+        return False
+
+# 합성 데이터 생성
+def nick_name_of(index):
+    return f"User_{index:07d}"
+
+def period_start_dates(periods):
+    return [f"2024{month:02d}01" for month in range(1, periods + 1)]
+
+def generate_db(db_name, members, periods, days=7, participation=0.5, seed=42, chunk_size=10000):
+    rng = random.Random(seed)
+    conn = sqlite3.connect(db_name)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("CREATE TABLE member (nick_name TEXT PRIMARY KEY, kakao_nick_name TEXT, join_date TEXT, grant INTEGER, last_login INTEGER, score INTEGER)")
+    conn.execute("CREATE TABLE content_schedule (content_name TEXT, start_date TEXT, end_date TEXT)")
+
+    def member_rows():
+        for i in range(members):
+            yield (nick_name_of(i), f"Kakao_{i:07d}", f"2023{rng.randint(1, 12):02d}{rng.randint(1, 28):02d}",
+                   rng.choice((0, 1, 2, 2, 2, 2)), rng.randint(0, 7), rng.randint(0, 15))
+
+    rows = member_rows()
+    while True:
+        chunk = [row for _, row in zip(range(chunk_size), rows)]
+        if not chunk:
+            break
+        conn.executemany("INSERT INTO member VALUES (?, ?, ?, ?, ?, ?)", chunk)
+
+    for start_date in period_start_dates(periods):
+        table_name = f"raid_{start_date}"
+        conn.execute(f"CREATE TABLE {table_name} (nick_name TEXT, score INTEGER, participation_count INTEGER, day INTEGER)")
+        conn.execute("INSERT INTO content_schedule VALUES (?, ?, ?)", ("raid", start_date, start_date[:6] + "28"))
+        records = ((nick_name_of(i), rng.randint(0, 15), 1, day)
+                   for i in range(members) if rng.random() < participation
+                   for day in range(1, days + 1))
+        while True:
+            chunk = [row for _, row in zip(range(chunk_size), records)]
+            if not chunk:
+                break
+            conn.executemany(f"INSERT INTO {table_name} VALUES (?, ?, ?, ?)", chunk)
+    conn.commit()
+    conn.close()
+
+# 시나리오 : (이름, 읽기 작업, 쓰기 작업) - 작업은 op(rng) 형태
+def build_scenarios(db_name, members, periods):
+    exam1_gateway = load_exam1_module("row_data_gateway")
+    exam1_script = load_exam1_module("transaction_script")
+    start_dates = period_start_dates(periods)
+
+    def pick_member(rng):
+        return nick_name_of(rng.randrange(members))
+
+    def pick_period(rng):
+        return rng.choice(start_dates)
+
+    procedure = exam1_script.Procedure(db_name)
+    finder = row_data_gateway.Finder(db_name)
+
+    def func_base(func, *args):
+        with scripts.get_connection(db_name) as conn:
+            return func(conn, *args)
+
+    def exam2_script_main(rng):
+        # transaction_script.main() 은 현재 디렉터리의 MemberManagement.db 를 사용
+        transaction_script.main()
+
+    return [
+        ("exam1.MemberGateway",
+         lambda rng: exam1_gateway.MemberGateway(db_name, pick_member(rng)).fetch(),
+         lambda rng: exam1_gateway.MemberGateway(db_name, pick_member(rng)).update(score=rng.randint(0, 15), last_login=rng.randint(1, 7))),
+        ("exam1.Procedure.change_grant",
+         None,
+         lambda rng: procedure.change_grant(pick_member(rng), exam1_script.Grant(rng.randint(0, 2)))),
+        ("exam2.Finder",
+         lambda rng: finder.find_member(pick_member(rng)),
+         None),
+        ("exam2.Finder.find_content_record",
+         lambda rng: finder.find_content_record("raid", pick_period(rng), pick_member(rng)),
+         None),
+        ("exam2.MemberGateway",
+         lambda rng: row_data_gateway.MemberGateway(db_name, pick_member(rng)).find(),
+         lambda rng: row_data_gateway.MemberGateway(db_name, pick_member(rng)).update_score(rng.randint(0, 15))),
+        ("exam2.ContentRecordGateway",
+         lambda rng: row_data_gateway.ContentRecordGateway(db_name, f"raid_{pick_period(rng)}", pick_member(rng), rng.randint(1, 7)).find(),
+         lambda rng: row_data_gateway.ContentRecordGateway(db_name, f"raid_{pick_period(rng)}", pick_member(rng), rng.randint(1, 7)).update(rng.randint(0, 15), 1)),
+        ("exam2.func_base.member",
+         lambda rng: func_base(scripts.find_member, pick_member(rng)),
+         lambda rng: func_base(scripts.update_score, pick_member(rng), rng.randint(0, 15))),
+        ("exam2.func_base.content_record",
+         lambda rng: func_base(scripts.find_content_record, "raid", pick_period(rng), pick_member(rng)),
+         lambda rng: func_base(scripts.update_content_record, "raid", pick_period(rng), pick_member(rng), rng.randint(0, 15), 1, rng.randint(1, 7))),
+        ("exam2.transaction_script.main",
+         None,
+         exam2_script_main),
+    ]
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * p))]
+
+def run_scenario(read_op, write_op, ops, read_ratio, seed):
+    rng = random.Random(seed)
+    latencies = []
+    with ConnectCounter() as counter, contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter()
+        for _ in range(ops):
+            if write_op is None or (read_op is not None and rng.random() < read_ratio):
+                op = read_op
+            else:
+                op = write_op
+            op_started = time.perf_counter()
+            op(rng)
+            latencies.append(time.perf_counter() - op_started)
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "ops": ops,
+        "throughput": ops / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1e3,
+        "p95_ms": percentile(latencies, 0.95) * 1e3,
+        "p99_ms": percentile(latencies, 0.99) * 1e3,
+        "connections_per_op": counter.count / ops,
+    }
+
+def run(members=10000, periods=4, ops=2000, read_ratio=0.9, seed=42, only=None, use_content_store=False):
+    with tempfile.TemporaryDirectory() as tmp:
+        db_name = os.path.join(tmp, "MemberManagement.db")
+        started = time.perf_counter()
+        generate_db(db_name, members, periods, seed=seed)
+        generation_seconds = time.perf_counter() - started
+        # 데이터 생성에 쓴 쿼리는 계측 결과에서 제외
+        query_log.reset()
+
+        # 기간별 테이블 대신 통합 컨텐츠 레코드 저장소로 측정
+        if use_content_store:
+            content_store.migrate_period_tables(db_name)
+
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            results = {}
+            for name, read_op, write_op in build_scenarios(db_name, members, periods):
+                if only and not any(pattern in name for pattern in only):
+                    continue
+                results[name] = run_scenario(read_op, write_op, ops, read_ratio, seed)
+        finally:
+            os.chdir(cwd)
+            close_all_pools()
+
+    return {
+        "config": {"members": members, "periods": periods, "ops": ops, "read_ratio": read_ratio, "seed": seed,
+                   "content_store": use_content_store},
+        "environment": {"python": platform.python_version(), "sqlite": sqlite3.sqlite_version, "platform": platform.platform()},
+        "generation_seconds": generation_seconds,
+        "results": results,
+    }
+
+def print_report(report, baseline=None):
+    base_results = baseline["results"] if baseline else {}
+    print(f"{'scenario':<34} {'ops/s':>10} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'conn/op':>8}  vs baseline")
+    for name, result in report["results"].items():
+        line = (f"{name:<34} {result['throughput']:>10.0f} {result['p50_ms']:>8.3f} {result['p95_ms']:>8.3f} "
+                f"{result['p99_ms']:>8.3f} {result['connections_per_op']:>8.2f}")
+        base = base_results.get(name)
+        if base:
+            throughput_change = (result["throughput"] / base["throughput"] - 1) * 100 if base["throughput"] else 0.0
+            p99_change = (result["p99_ms"] / base["p99_ms"] - 1) * 100 if base["p99_ms"] else 0.0
+            line += f"  ops/s {throughput_change:+.1f}%, p99 {p99_change:+.1f}%"
+        print(line)
+
+def print_query_log(stats, limit=10):
+    statements = sorted(stats["statements"].items(), key=lambda item: item[1]["total_ms"], reverse=True)
+    print(f"\n{'total ms':>10} {'count':>8} {'mean ms':>8} {'max ms':>8}  statement")
+    for statement, result in statements[:limit]:
+        print(f"{result['total_ms']:>10.1f} {result['count']:>8} {result['mean_ms']:>8.3f} {result['max_ms']:>8.3f}  {statement[:80]}")
+
+# 개별 시나리오 : python benchmark_suite.py --scenario <이름>
+# 위 접근 경로 비교와 달리 한 가지 최적화의 전후를 따로 측정 (시나리오마다 임시 DB 를 새로 만듦)
+def create_member_db(db_name, rows):
+    conn = sqlite3.connect(db_name)
+    conn.execute("CREATE TABLE member (nick_name TEXT PRIMARY KEY, kakao_nick_name TEXT, join_date TEXT, grant INTEGER, last_login INTEGER, score INTEGER)")
+    conn.executemany("INSERT INTO member VALUES (?, ?, ?, ?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+def timed(func, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat
+
+# connection_pool : 호출마다 connect/close 하는 방식 vs 커넥션 풀
+def bench_connection_pool(tmp, operations=5000, threads=(1, 4, 8)):
+    db_name = os.path.join(tmp, "bench.db")
+    create_member_db(db_name, ((f"User_{i:04d}", f"Kakao_{i:04d}", "20240101", 2, 0, 10) for i in range(1000)))
+    pool = configure_pool(db_name, size=8)
+    sql = "SELECT kakao_nick_name, join_date, grant, last_login, score FROM member WHERE nick_name = ?"
+
+    def find_connect_per_call(nick_name):
+        conn = sqlite3.connect(db_name)
+        result = conn.execute(sql, (nick_name,)).fetchone()
+        conn.close()
+        return result
+
+    def find_pooled(nick_name):
+        with get_connection(db_name) as conn:
+            return conn.execute(sql, (nick_name,)).fetchone()
+
+    def run_threads(find, count):
+        def worker(offset):
+            for i in range(operations):
+                find(f"User_{(offset + i) % 1000:04d}")
+
+        workers = [threading.Thread(target=worker, args=(n * 37,)) for n in range(count)]
+        started = time.perf_counter()
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        return (time.perf_counter() - started) / (operations * count) * 1e6
+
+    print(f"{'threads':>7} | {'connect/call (us/op)':>20} | {'pooled (us/op)':>14} | speedup")
+    for count in threads:
+        baseline = run_threads(find_connect_per_call, count)
+        pooled = run_threads(find_pooled, count)
+        print(f"{count:>7} | {baseline:>20.1f} | {pooled:>14.1f} | {baseline / pooled:.1f}x")
+    print(f"pool stats: {pool.stats()}")
+
+# batch_write : 컨텐츠 레코드 한 행씩 삽입 vs 일괄 삽입
+def bench_batch_write(tmp, row_by_row_count=2000, batch_count=50000, chunk_size=1000):
+    db_name = os.path.join(tmp, "bench.db")
+    conn = sqlite3.connect(db_name)
+    for table_name in ("raid_20240925", "raid_20241002"):
+        conn.execute(f"CREATE TABLE {table_name} (nick_name TEXT, score INTEGER, participation_count INTEGER, day INTEGER)")
+        conn.execute(f"CREATE UNIQUE INDEX {table_name}_nick_name_day ON {table_name} (nick_name, day)")
+    conn.commit()
+    conn.close()
+    configure_pool(db_name)
+
+    def make_records(count):
+        return [(f"User_{i % 5000:04d}", i % 15, 1, i // 5000 + 1) for i in range(count)]
+
+    with get_connection(db_name) as conn:
+        started = time.perf_counter()
+        for nick_name, score, participation_count, day in make_records(row_by_row_count):
+            scripts.insert_content_record(conn, "raid", "20240925", nick_name, score, participation_count, day)
+        row_by_row = time.perf_counter() - started
+
+        started = time.perf_counter()
+        scripts.insert_content_records(conn, "raid", "20241002", make_records(batch_count), chunk_size)
+        batch = time.perf_counter() - started
+
+        started = time.perf_counter()
+        scripts.insert_content_records(conn, "raid", "20241002", make_records(batch_count), chunk_size, upsert=True)
+        upsert = time.perf_counter() - started
+
+    print(f"row by row : {row_by_row_count:>6} rows {row_by_row:7.3f}s ({row_by_row_count / row_by_row:>10.0f} rows/s)")
+    print(f"batch      : {batch_count:>6} rows {batch:7.3f}s ({batch_count / batch:>10.0f} rows/s)")
+    print(f"upsert     : {batch_count:>6} rows {upsert:7.3f}s ({batch_count / upsert:>10.0f} rows/s)")
+
+# async_api : 이벤트 루프에서 동기 호출 vs AsyncMemberManagement
+# 동시 명령 처리 중 이벤트 루프 지연(1ms 주기 타이머가 늦게 깨어난 정도)의 p50/p99 를 측정
+def bench_async_api(tmp, count=1000):
+    db_name = os.path.join(tmp, "bench.db")
+    create_member_db(db_name, ((f"User_{i:04d}", f"Kakao_{i:04d}", "20240101", 2, 0, 10) for i in range(1000)))
+
+    async def measure_loop_lag(stop, lags, interval=0.001):
+        while not stop.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(interval)
+            lags.append(time.perf_counter() - started - interval)
+
+    async def measure(command):
+        stop = asyncio.Event()
+        lags = []
+        ticker = asyncio.create_task(measure_loop_lag(stop, lags))
+        await asyncio.sleep(0.01)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(command(i) for i in range(count)))
+        elapsed = time.perf_counter() - started
+
+        stop.set()
+        await ticker
+        return elapsed, sorted(lags)
+
+    async def main_async():
+        # 10 번 중 1 번은 쓰기, 나머지는 읽기
+        async def blocking(i):
+            # 이벤트 루프 스레드에서 직접 sqlite 호출
+            with get_connection(db_name) as conn:
+                if i % 10 == 0:
+                    scripts.update_score(conn, f"User_{i % 1000:04d}", i % 15)
+                else:
+                    scripts.find_member(conn, f"User_{i % 100:04d}")
+
+        async with AsyncMemberManagement(db_name) as api:
+            async def non_blocking(i):
+                if i % 10 == 0:
+                    await api.update_score(f"User_{i % 1000:04d}", i % 15)
+                else:
+                    await api.find_member(f"User_{i % 100:04d}")
+
+            for name, command in (("blocking", blocking), ("async_api", non_blocking)):
+                elapsed, lags = await measure(command)
+                print(f"{name:>9}: {count} commands in {elapsed:.3f}s, loop lag p50={percentile(lags, 0.5) * 1e3:.2f}ms "
+                      f"p99={percentile(lags, 0.99) * 1e3:.2f}ms max={lags[-1] * 1e3:.2f}ms")
+            print(f"async_api stats: {api.stats()}")
+
+    asyncio.run(main_async())
+
+# domain_objects : 멤버 전체 조회 후 도메인 객체로 만들 때의 메모리 / 시간
+#   legacy : 이전 방식 (__dict__ 객체 + 인스턴스마다 MemberGateway 생성)
+#   eager  : __slots__ Member + row_factory
+#   lazy   : LazyMember (접근한 필드만 변환)
+class LegacyMember:
+    tracked_fields = ("kakao_nick_name", "join_date", "grant", "last_login", "score")
+
+    def __init__(self, nick_name, kakao_nick_name, join_date=None, grant=None, last_login=None, score=None, db_name="MemberManagement.db"):
+        self._dirty = set()
+
+        self.nick_name = nick_name
+        self.kakao_nick_name = kakao_nick_name
+        self.join_date = join_date if join_date else datetime.now()
+        self.grant = grant if grant else Grant.USER
+        self.last_login = last_login if last_login else 0
+        self.score = score if score else 0
+
+        self.member_gateway = row_data_gateway.MemberGateway(db_name, self.nick_name)
+        self._dirty.clear()
+
+    def __setattr__(self, name, value):
+        if name in self.tracked_fields and getattr(self, name, None) != value:
+            self._dirty.add(name)
+        object.__setattr__(self, name, value)
+
+def bench_domain_objects(tmp, count=100000):
+    db_name = os.path.join(tmp, "bench.db")
+    create_member_db(db_name, ((f"User_{i:06d}", f"Kakao_{i:06d}", "20240101", i % 3, i % 7, i % 16) for i in range(count)))
+    configure_pool(db_name)
+
+    def load_legacy(db):
+        with get_connection(db) as conn:
+            cursor = conn.execute("SELECT nick_name, kakao_nick_name, join_date, grant, last_login, score FROM member ORDER BY nick_name")
+            return [LegacyMember(*row, db_name=db) for row in cursor.fetchall()]
+
+    def load_lazy_scores(db):
+        members = row_data_gateway.Finder(db).find_members(lazy=True)
+        # 점수만 사용하는 경우
+        sum(member.score for member in members)
+        return members
+
+    def measure(load):
+        gc.collect()
+        started = time.perf_counter()
+        members = load(db_name)
+        elapsed = time.perf_counter() - started
+        del members
+        gc.collect()
+
+        # 결과 리스트가 차지하는 메모리 (조회가 끝난 뒤 남아 있는 양)
+        tracemalloc.start()
+        members = load(db_name)
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del members
+        return elapsed, retained, peak
+
+    cases = [
+        ("legacy", load_legacy),
+        ("eager", lambda db: row_data_gateway.Finder(db).find_members()),
+        ("lazy", lambda db: row_data_gateway.Finder(db).find_members(lazy=True)),
+        ("lazy+score", load_lazy_scores),
+    ]
+    results = {name: measure(load) for name, load in cases}
+
+    legacy_time, legacy_retained, _ = results["legacy"]
+    print(f"{count} members")
+    for name, (elapsed, retained, peak) in results.items():
+        print(f"{name:<11}: {elapsed:6.3f}s  retained {retained / 2**20:7.1f} MiB  peak {peak / 2**20:7.1f} MiB  "
+              f"(memory x{legacy_retained / retained:.1f}, speed x{legacy_time / elapsed:.1f} vs legacy)")
+
+# permissions : 권한 확인 / ADMIN·SUB_ADMIN 목록 조회
+#   db     : 매번 member 테이블 조회
+#   memory : permissions 의 권한 표 (bytearray + 권한별 비트마스크)
+def bench_permissions(tmp, count=100000, checks=20000):
+    rng = random.Random(0)
+    db_name = os.path.join(tmp, "bench.db")
+    # 운영진은 1% 정도
+    create_member_db(db_name, ((f"User_{i:06d}", f"Kakao_{i:06d}", "20240101", 0 if i % 200 == 0 else 1 if i % 200 == 1 else 2, 0, 0)
+                               for i in range(count)))
+    configure_pool(db_name)
+
+    def db_has_grant(nick_name, grant):
+        with get_connection(db_name) as conn:
+            row = conn.execute("SELECT grant FROM member WHERE nick_name = ?", (nick_name,)).fetchone()
+        return row is not None and row[0] <= grant.value
+
+    def db_members_with(*grants):
+        with get_connection(db_name) as conn:
+            cursor = conn.execute(f"SELECT nick_name FROM member WHERE grant IN ({', '.join('?' * len(grants))})",
+                                  [grant.value for grant in grants])
+            return [nick_name for (nick_name,) in cursor]
+
+    started = time.perf_counter()
+    permissions.load(db_name)
+    load_time = time.perf_counter() - started
+
+    names = [f"User_{rng.randrange(count):06d}" for _ in range(checks)]
+    checks_iter = iter(names * 2)
+    db_check = timed(lambda: db_has_grant(next(checks_iter), Grant.SUB_ADMIN), checks)
+    memory_check = timed(lambda: permissions.has_grant(db_name, next(checks_iter), Grant.SUB_ADMIN), checks)
+
+    db_list = timed(lambda: db_members_with(Grant.ADMIN, Grant.SUB_ADMIN), 20)
+    memory_list = timed(lambda: permissions.members_with(db_name, Grant.ADMIN, Grant.SUB_ADMIN), 20)
+    if sorted(db_members_with(Grant.ADMIN, Grant.SUB_ADMIN)) != sorted(permissions.members_with(db_name, Grant.ADMIN, Grant.SUB_ADMIN)):
+        print("Error: grant table differs from the member table.")
+
+    started = time.perf_counter()
+    for nick_name in names[:1000]:
+        permissions.change_grant(db_name, nick_name, Grant.SUB_ADMIN)
+    change_time = (time.perf_counter() - started) / 1000
+
+    print(f"{count} members, load {load_time * 1000:.1f} ms")
+    print(f"has_grant     : db {db_check * 1e6:8.1f} us  memory {memory_check * 1e6:6.2f} us  (x{db_check / memory_check:.0f})")
+    print(f"admin list    : db {db_list * 1e3:8.2f} ms  memory {memory_list * 1e3:6.2f} ms  (x{db_list / memory_list:.0f})")
+    print(f"change_grant  : {change_time * 1e6:.1f} us (DB + table)")
+
+# startup : 시작 시간
+#   cli    : 명령 하나를 처리하고 끝나는 프로세스 (인터프리터 시작 + import + bootstrap + 첫 조회)
+#   worker : 오래 실행하는 프로세스 (bootstrap(warm=True) 이후의 조회)
+# 자식 프로세스에서 실행 (단계별 시간을 JSON 으로 출력)
+CLI_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {here!r})
+from row_data_gateway import Finder
+import schema
+imported = time.perf_counter()
+schema.bootstrap({db_name!r})
+bootstrapped = time.perf_counter()
+Finder({db_name!r}).find_member("User_000001")
+queried = time.perf_counter()
+print(json.dumps({{"import": imported - started, "bootstrap": bootstrapped - imported, "first_query": queried - bootstrapped}}))
+"""
+
+def bench_startup(tmp, count=10000, runs=5):
+    db_name = os.path.join(tmp, "bench.db")
+    create_member_db(db_name, ((f"User_{i:06d}", f"Kakao_{i:06d}", "20240101", 2, 0, i % 16) for i in range(count)))
+
+    def run_cli():
+        script = CLI_SCRIPT.format(here=EXAM2_DIR, db_name=db_name)
+        started = time.perf_counter()
+        output = subprocess.run([sys.executable, "-c", script], check=True, capture_output=True, text=True).stdout
+        total = time.perf_counter() - started
+        phases = json.loads(output.strip().splitlines()[-1])
+        phases["total"] = total
+        return phases
+
+    # 첫 실행은 마이그레이션을 적용하므로 따로 표시
+    first = run_cli()
+    cli_runs = [run_cli() for _ in range(runs)]
+
+    started = time.perf_counter()
+    schema.bootstrap(db_name, warm=True)
+    warm_time = time.perf_counter() - started
+    finder = row_data_gateway.Finder(db_name)
+    worker_times = []
+    for i in range(runs * 20):
+        started = time.perf_counter()
+        finder.find_member(f"User_{i:06d}")
+        worker_times.append(time.perf_counter() - started)
+
+    def median(key):
+        return statistics.median(run[key] for run in cli_runs) * 1000
+
+    print(f"cli (first run, migrates): total {first['total'] * 1000:.1f} ms, bootstrap {first['bootstrap'] * 1000:.1f} ms")
+    print(f"cli (median of {runs})      : total {median('total'):.1f} ms = interpreter {median('total') - median('import') - median('bootstrap') - median('first_query'):.1f}"
+          f" + import {median('import'):.1f} + bootstrap {median('bootstrap'):.1f} + first query {median('first_query'):.2f}")
+    print(f"worker                    : bootstrap(warm=True) {warm_time * 1000:.1f} ms once, "
+          f"then find_member {statistics.median(worker_times) * 1e6:.0f} us (median)")
+
+NAMED_SCENARIOS = {
+    "connection_pool": bench_connection_pool,
+    "batch_write": bench_batch_write,
+    "async_api": bench_async_api,
+    "domain_objects": bench_domain_objects,
+    "permissions": bench_permissions,
+    "startup": bench_startup,
+}
+
+def run_named(names):
+    for name in names:
+        print(f"== {name}")
+        with tempfile.TemporaryDirectory() as tmp:
+            try:
+                NAMED_SCENARIOS[name](tmp)
+            finally:
+                close_all_pools()
+
+def main():
+    parser = argparse.ArgumentParser(description="exam1/exam2 data access benchmark")
+    parser.add_argument("--members", type=int, default=10000)
+    parser.add_argument("--periods", type=int, default=4)
+    parser.add_argument("--ops", type=int, default=2000)
+    parser.add_argument("--read-ratio", type=float, default=0.9)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", nargs="*", help="scenario name filters")
+    parser.add_argument("--content-store", action="store_true", help="migrate period tables into the unified content store first")
+    parser.add_argument("--query-log", action="store_true", help="instrument queries and print the costliest statements")
+    parser.add_argument("--output", help="save results as JSON")
+    parser.add_argument("--compare", help="baseline JSON to compare with")
+    parser.add_argument("--scenario", nargs="+", choices=[*NAMED_SCENARIOS, "all"],
+                        help="run named scenarios instead of the access path comparison")
+    args = parser.parse_args()
+
+    if args.scenario:
+        run_named(list(NAMED_SCENARIOS) if "all" in args.scenario else args.scenario)
+        return
+
+    if args.query_log:
+        query_log.enable()
+    report = run(args.members, args.periods, args.ops, args.read_ratio, args.seed, args.only, args.content_store)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["config"] != report["config"]:
+            print(f"Warning: baseline config differs: {baseline['config']}")
+
+    print(f"data generated in {report['generation_seconds']:.2f}s ({args.members} members, {args.periods} periods)")
+    print_report(report, baseline)
+
+    if args.query_log:
+        print_query_log(query_log.stats())
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"saved to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,498 @@
+import argparse
+import csv
+import json
+import sqlite3
+import struct
+import sys
+import time
+from array import array
+from contextlib import contextmanager
+from datetime import datetime
+from itertools import islice
+
+from connection_pool import get_connection
+from schema_cache import table_exists
+from write_events import publish_member, publish_content_record
+from statement_registry import content_record_sql, PERIOD_TABLE_PATTERN
+from batch_writer import DEFAULT_CHUNK_SIZE, chunked, insert_member_sql
+from permissions import Grant
+from write_queue import queued_write, get_write_queue
+import content_store
+import record_stream
+
+# 멤버 / 컨텐츠 레코드 대량 가져오기 / 내보내기
+# 스프레드시트에서 받은 명단, 레이드 결과를 한 행씩 create_member / insert_content_record 로 넣지 않고
+#   가져오기 : 파일을 chunk_size 행씩 읽어 열(column) 단위로 한 번에 검증한 뒤 executemany, 전체를 하나의 트랜잭션으로
+#             (쓰기 큐가 켜져 있으면 파일 전체를 writer 스레드의 작업 하나로 실행, 끝날 때까지 다른 쓰기는 대기)
+#   내보내기 : 키셋 스트리밍 조회(record_stream) 결과를 chunk_size 행씩 파일로
+# 파일 형식은 CSV (첫 행은 컬럼 이름) 와 열 단위 바이너리 형식(columnar) 두 가지, 가져오기는 형식을 자동으로 구분
+#
+#   python bulk_io.py import-members roster.csv --upsert
+#   python bulk_io.py import-records raid.csv --content raid --start-date 20240925
+#   python bulk_io.py export-members members.col --format columnar
+#   python bulk_io.py export-records raid.csv --content raid --from-date 20240901
+
+MEMBER_FIELDS = record_stream.MEMBER_COLUMNS
+CONTENT_RECORD_FIELDS = ("content_name", "start_date", "nick_name", "score", "participation_count", "day")
+
+# columnar 형식의 컬럼 타입
+MEMBER_TYPES = ("text", "text", "text", "int", "int", "int")
+CONTENT_RECORD_TYPES = ("text", "text", "text", "int", "int", "int")
+
+# 권한은 값(0, 1, 2) 또는 이름(ADMIN, SUB_ADMIN, USER) 으로 받음
+GRANT_VALUES = {**{grant.name: grant.value for grant in Grant}, **{str(grant.value): grant.value for grant in Grant}}
+
+# 대량 적재 중 사용할 페이지 캐시 (음수는 KiB 단위, 64 MiB)
+BULK_CACHE_SIZE = -65536
+
+# 오류 메시지는 앞쪽 일부만 보관
+MAX_REPORTED_ERRORS = 20
+
+_EMPTY = ("", None)
+
+class TransferStats:
+    def __init__(self, operation, table_name):
+        self.operation = operation
+        self.table_name = table_name
+        self.rows = 0
+        self.rejected = 0
+        self.seconds = 0.0
+        # [(행 번호, 사유)]
+        self.errors = []
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def reject(self, row_number, reason):
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((row_number, reason))
+
+    def __str__(self):
+        return (f"{self.operation} {self.table_name}: {self.rows} rows ({self.rejected} rejected) "
+                f"in {self.seconds:.2f}s, {self.rows_per_second:,.0f} rows/sec")
+
+# 대량 적재용 PRAGMA
+@contextmanager
+def bulk_load(conn, cache_size=BULK_CACHE_SIZE):
+    """블록 안의 쓰기를 하나의 트랜잭션으로 커밋하고, 그동안만 PRAGMA 를 적재용으로 바꿈
+    synchronous=OFF / 롤백 저널이면 journal_mode=MEMORY 이므로 적재 중 프로세스가 죽으면 DB 가 손상될 수 있음
+    (WAL 은 그대로 둠, 이미 쓰기가 빠르고 다른 커넥션이 있으면 바꿀 수 없음)"""
+    if get_write_queue(conn.db_name) is not None:
+        # 쓰기 큐가 켜져 있으면 적재는 writer 스레드의 커넥션에서 커밋되므로 이 커넥션의 PRAGMA 는 바꾸지 않음
+        yield conn
+        return
+
+    cursor = conn.cursor()
+    # journal_mode 는 트랜잭션 밖에서만 바꿀 수 있음
+    conn.commit()
+    # PRAGMA 는 결과 행을 돌려주므로 끝까지 읽어 문장을 닫아야 커밋할 수 있음
+    previous = {name: cursor.execute(f"PRAGMA {name}").fetchall()[0][0]
+                for name in ("journal_mode", "synchronous", "cache_size", "temp_store")}
+    pragmas = {"synchronous": "OFF", "cache_size": cache_size, "temp_store": "MEMORY"}
+    if str(previous["journal_mode"]).lower() != "wal":
+        pragmas["journal_mode"] = "MEMORY"
+    for name, value in pragmas.items():
+        cursor.execute(f"PRAGMA {name} = {value}").fetchall()
+
+    try:
+        yield conn
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        for name in pragmas:
+            cursor.execute(f"PRAGMA {name} = {previous[name]}").fetchall()
+
+# columnar 형식
+#   MAGIC, 헤더 길이(uint32) + 헤더 JSON {"table", "columns": [[이름, 타입]]}
+#   청크마다 행 수(uint32) 다음에 컬럼별로
+#     int  : 타입 코드(1바이트, 청크 값 범위에 맞는 가장 작은 정수 배열 b/h/i/q)
+#            + NULL 여부(1바이트, 있으면 행마다 1바이트 NULL 표시가 뒤따름) + 값 배열
+#     text : 길이 int32 배열 (NULL 은 -1) + UTF-8 바이트
+#   행 수 0 으로 끝남, 숫자는 모두 리틀 엔디언
+COLUMNAR_MAGIC = b"EXAMCOL1"
+
+# 정수 배열 타입 코드 (작은 것부터)
+_INT_TYPECODES = ("b", "h", "i", "q")
+
+def _int_typecode(low, high):
+    for typecode in _INT_TYPECODES:
+        bits = array(typecode).itemsize * 8 - 1
+        if -(1 << bits) <= low and high < (1 << bits):
+            return typecode
+    raise OverflowError(f"{low} ~ {high} does not fit in 64 bits.")
+
+def _little_endian(values):
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values
+
+class ColumnarWriter:
+    def __init__(self, file, table_name, fields, types):
+        self.file = file
+        self.fields = fields
+        self.types = types
+        header = json.dumps({"table": table_name, "columns": [list(column) for column in zip(fields, types)]}).encode("utf-8")
+        file.write(COLUMNAR_MAGIC)
+        file.write(struct.pack("<I", len(header)))
+        file.write(header)
+
+    def write(self, rows):
+        if not rows:
+            return
+        write = self.file.write
+        write(struct.pack("<I", len(rows)))
+        for values, column_type in zip(zip(*rows), self.types):
+            if column_type == "int":
+                has_null = None in values
+                if has_null:
+                    nulls = bytes(value is None for value in values)
+                    values = [0 if value is None else value for value in values]
+                typecode = _int_typecode(min(values), max(values))
+                write(typecode.encode("ascii") + bytes((has_null,)))
+                if has_null:
+                    write(nulls)
+                write(_little_endian(array(typecode, values)).tobytes())
+            else:
+                encoded = [None if value is None else str(value).encode("utf-8") for value in values]
+                write(_little_endian(array("i", (-1 if value is None else len(value) for value in encoded))).tobytes())
+                write(b"".join(value for value in encoded if value))
+
+    def close(self):
+        self.file.write(struct.pack("<I", 0))
+
+def _read_exact(file, size):
+    data = file.read(size)
+    if len(data) != size:
+        raise ValueError("columnar file is truncated.")
+    return data
+
+def read_columnar(file):
+    """(헤더, {컬럼 이름: 값 리스트}) 를 청크마다 반환 (MAGIC 은 이미 읽은 상태)"""
+    (header_size,) = struct.unpack("<I", _read_exact(file, 4))
+    header = json.loads(_read_exact(file, header_size))
+    while True:
+        (count,) = struct.unpack("<I", _read_exact(file, 4))
+        if count == 0:
+            return
+        columns = {}
+        for name, column_type in header["columns"]:
+            if column_type == "int":
+                typecode, has_null = _read_exact(file, 2)
+                typecode = chr(typecode)
+                nulls = _read_exact(file, count) if has_null else None
+                values = array(typecode)
+                values.frombytes(_read_exact(file, count * values.itemsize))
+                values = _little_endian(values).tolist()
+                if nulls:
+                    values = [None if null else value for null, value in zip(nulls, values)]
+            else:
+                lengths = _little_endian(array("i", _read_exact(file, count * 4)))
+                data = _read_exact(file, sum(length for length in lengths if length > 0))
+                values = []
+                offset = 0
+                for length in lengths:
+                    if length < 0:
+                        values.append(None)
+                        continue
+                    values.append(data[offset:offset + length].decode("utf-8"))
+                    offset += length
+            columns[name] = values
+        yield header, columns
+
+# 가져오기 : 파일 읽기
+def read_columns(path, chunk_size, required_fields):
+    """(첫 행 번호, {컬럼 이름: 값 리스트}, {잘못된 행 인덱스: 사유}) 를 청크마다 반환"""
+    with open(path, "rb") as file:
+        is_columnar = file.read(len(COLUMNAR_MAGIC)) == COLUMNAR_MAGIC
+        if is_columnar:
+            first_row = 1
+            for header, columns in read_columnar(file):
+                _check_fields(path, columns.keys(), required_fields)
+                yield first_row, columns, {}
+                first_row += len(next(iter(columns.values())))
+            return
+
+    # 스프레드시트에서 저장한 CSV 는 BOM 이 붙어 있을 수 있음
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        reader = csv.reader(file)
+        names = [name.strip() for name in next(reader, [])]
+        _check_fields(path, names, required_fields)
+        width = len(names)
+        empty_row = [None] * width
+
+        first_row = 1
+        while True:
+            chunk = list(islice(reader, chunk_size))
+            if not chunk:
+                return
+            bad = {}
+            for index, row in enumerate(chunk):
+                if len(row) != width:
+                    bad[index] = f"expected {width} columns, got {len(row)}"
+                    chunk[index] = empty_row
+            yield first_row, dict(zip(names, map(list, zip(*chunk)))), bad
+            first_row += len(chunk)
+
+def _check_fields(path, names, required_fields):
+    missing = [field for field in required_fields if field not in names]
+    if missing:
+        raise ValueError(f"'{path}' has no {', '.join(missing)} column.")
+
+# 가져오기 : 열 단위 검증
+# 청크 전체를 리스트 컴프리헨션 한 번으로 변환하고, 실패한 경우에만 행 단위로 다시 확인
+def _int_column(values, bad, field, default=None):
+    try:
+        return [default if value in _EMPTY else int(value) for value in values]
+    except (TypeError, ValueError):
+        pass
+
+    column = []
+    for index, value in enumerate(values):
+        try:
+            column.append(default if value in _EMPTY else int(value))
+        except (TypeError, ValueError):
+            bad.setdefault(index, f"{field} '{value}' is not an integer")
+            column.append(default)
+    return column
+
+def _text_column(values, bad, field, default=None, required=False):
+    column = [default if value in _EMPTY else str(value).strip() for value in values]
+    if required:
+        for index, value in enumerate(column):
+            if not value:
+                bad.setdefault(index, f"{field} is empty")
+    return column
+
+def _date_column(values, bad, field, default=None):
+    """"%Y%m%d" 문자열 컬럼 (같은 날짜가 많으므로 날짜마다 한 번만 확인)"""
+    column = _text_column(values, bad, field, default)
+    checked = {}
+    for index, value in enumerate(column):
+        valid = checked.get(value)
+        if valid is None:
+            try:
+                valid = checked[value] = value is not None and len(value) == 8 and bool(datetime.strptime(value, "%Y%m%d"))
+            except ValueError:
+                valid = checked[value] = False
+        if not valid:
+            bad.setdefault(index, f"{field} '{value}' is not a %Y%m%d date")
+    return column
+
+def _valid_rows(columns, bad):
+    rows = zip(*columns)
+    if not bad:
+        return list(rows)
+    return [row for index, row in enumerate(rows) if index not in bad]
+
+def validate_members(columns, bad, today=None):
+    """Member.validate() 와 같은 규칙을 열 단위로 적용한 (nick_name, kakao_nick_name, join_date, grant, last_login, score) 행 리스트
+    점수는 0 ~ 15 로, 미래 가입일은 오늘로, 음수 마지막 로그인은 0 으로 맞춤"""
+    today = today or datetime.now().strftime("%Y%m%d")
+    count = len(columns["nick_name"])
+    empty = [None] * count
+
+    nick_names = _text_column(columns["nick_name"], bad, "nick_name", required=True)
+    kakao_nick_names = _text_column(columns["kakao_nick_name"], bad, "kakao_nick_name", default="")
+    join_dates = _date_column(columns.get("join_date", empty), bad, "join_date", default=today)
+    grants = [GRANT_VALUES.get(str(value).strip().upper()) if value not in _EMPTY else Grant.USER.value
+              for value in columns.get("grant", empty)]
+    last_logins = _int_column(columns.get("last_login", empty), bad, "last_login", default=0)
+    scores = _int_column(columns.get("score", empty), bad, "score", default=0)
+
+    for index, grant in enumerate(grants):
+        if grant is None:
+            bad.setdefault(index, f"grant '{columns['grant'][index]}' is unknown")
+
+    join_dates = [join_date if join_date is None or join_date <= today else today for join_date in join_dates]
+    last_logins = [last_login if last_login > 0 else 0 for last_login in last_logins]
+    scores = [0 if score < 0 else 15 if score > 15 else score for score in scores]
+
+    return _valid_rows((nick_names, kakao_nick_names, join_dates, grants, last_logins, scores), bad)
+
+def validate_content_records(columns, bad, content_name=None, start_date=None):
+    """(content_name, start_date, nick_name, score, participation_count, day) 행 리스트
+    content_name / start_date 를 주면 파일의 값 대신 사용"""
+    count = len(columns["nick_name"])
+    empty = [None] * count
+
+    content_names = _text_column([content_name] * count if content_name else columns.get("content_name", empty),
+                                 bad, "content_name", required=True)
+    start_dates = _date_column([start_date] * count if start_date else columns.get("start_date", empty), bad, "start_date")
+    nick_names = _text_column(columns["nick_name"], bad, "nick_name", required=True)
+    scores = _int_column(columns.get("score", empty), bad, "score", default=0)
+    participation_counts = _int_column(columns.get("participation_count", empty), bad, "participation_count", default=0)
+    days = _int_column(columns["day"], bad, "day")
+
+    # 기간 테이블 이름이 될 수 있는 조합인지 (같은 기간이 많으므로 기간마다 한 번만 확인)
+    checked = {}
+    for index, period in enumerate(zip(content_names, start_dates)):
+        valid = checked.get(period)
+        if valid is None:
+            valid = checked[period] = bool(PERIOD_TABLE_PATTERN.match(f"{period[0]}_{period[1]}"))
+        if not valid:
+            bad.setdefault(index, f"'{period[0]}_{period[1]}' is not a content period")
+    for index, (day, score, participation_count) in enumerate(zip(days, scores, participation_counts)):
+        if day is None or day < 1:
+            bad.setdefault(index, f"day '{columns['day'][index]}' must be 1 or more")
+        elif score < 0 or participation_count < 0:
+            bad.setdefault(index, "score and participation_count must not be negative")
+
+    return _valid_rows((content_names, start_dates, nick_names, scores, participation_counts, days), bad)
+
+def _reject_rows(stats, first_row, bad):
+    for index in sorted(bad):
+        stats.reject(first_row + index, bad[index])
+
+# 가져오기
+# 파일 읽기 / 검증 / 적재 / 이벤트 발행을 하나의 쓰기 작업으로 실행
+# (쓰기 큐가 켜져 있으면 writer 스레드의 SAVEPOINT 하나, 아니면 bulk_load 트랜잭션 안에서, 실패하면 전체가 롤백됨)
+@queued_write
+def _load_members(conn, path, chunk_size, upsert, stats):
+    today = datetime.now().strftime("%Y%m%d")
+    sql = insert_member_sql(upsert)
+    for first_row, columns, bad in read_columns(path, chunk_size, ("nick_name", "kakao_nick_name")):
+        rows = validate_members(columns, bad, today)
+        _reject_rows(stats, first_row, bad)
+        conn.executemany(sql, rows)
+        stats.rows += len(rows)
+    # 적재와 같은 트랜잭션에서 발행
+    publish_member(conn.db_name, "bulk")
+
+@queued_write
+def _load_content_records(conn, path, content_name, start_date, chunk_size, upsert, required_fields, stats):
+    periods = set()
+    use_store = content_store.is_enabled(conn)
+    store_sql = content_store.insert_sql(upsert)
+    for first_row, columns, bad in read_columns(path, chunk_size, required_fields):
+        rows = validate_content_records(columns, bad, content_name, start_date)
+        _reject_rows(stats, first_row, bad)
+        if use_store:
+            conn.executemany(store_sql, rows)
+            stats.rows += len(rows)
+            periods.update((row[0], row[1]) for row in rows)
+            continue
+
+        by_period = {}
+        for row in rows:
+            by_period.setdefault((row[0], row[1]), []).append(row[2:])
+        for period, records in by_period.items():
+            table_name = content_store.period_table_name(*period)
+            if not table_exists(conn.db_name, table_name, conn):
+                for _ in records:
+                    stats.reject(None, f"'{table_name}' table does not exsist.")
+                continue
+            conn.executemany(content_record_sql(conn, "upsert" if upsert else "insert", table_name), records)
+            stats.rows += len(records)
+            periods.add(period)
+    for period in sorted(periods):
+        publish_content_record(conn.db_name, "bulk", *period)
+
+def import_members(db_name="MemberManagement.db", path="members.csv", chunk_size=DEFAULT_CHUNK_SIZE, upsert=False):
+    """멤버 파일을 member 테이블로 가져와 TransferStats 를 반환 (upsert 면 같은 nick_name 을 덮어씀)"""
+    if not table_exists(db_name, "member"):
+        print("Error: 'member' table does not exsist.")
+        return None
+
+    stats = TransferStats("import", "member")
+    started = time.perf_counter()
+    with get_connection(db_name) as conn:
+        with bulk_load(conn):
+            _load_members(conn, path, chunk_size, upsert, stats)
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+def import_content_records(db_name="MemberManagement.db", path="records.csv", content_name=None, start_date=None,
+                           chunk_size=DEFAULT_CHUNK_SIZE, upsert=False):
+    """컨텐츠 레코드 파일을 가져와 TransferStats 를 반환
+    통합 저장소가 있으면 content_record 로, 없으면 행마다 기간별 테이블({content_name}_{start_date})로 나눠 넣음
+    (기간별 테이블에 upsert 하려면 (nick_name, day) 에 UNIQUE 인덱스가 있어야 함)"""
+    required_fields = ["nick_name", "day"]
+    if not content_name:
+        required_fields.append("content_name")
+    if not start_date:
+        required_fields.append("start_date")
+
+    stats = TransferStats("import", "content_record")
+    started = time.perf_counter()
+    with get_connection(db_name) as conn:
+        with bulk_load(conn):
+            _load_content_records(conn, path, content_name, start_date, chunk_size, upsert, required_fields, stats)
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+# 내보내기
+def _export(path, file_format, table_name, fields, types, rows, chunk_size):
+    stats = TransferStats("export", table_name)
+    started = time.perf_counter()
+    if file_format == "columnar":
+        with open(path, "wb") as file:
+            writer = ColumnarWriter(file, table_name, fields, types)
+            for chunk in chunked(rows, chunk_size):
+                writer.write(chunk)
+                stats.rows += len(chunk)
+            writer.close()
+    elif file_format == "csv":
+        with open(path, "w", newline="", encoding="utf-8") as file:
+            writer = csv.writer(file)
+            writer.writerow(fields)
+            for chunk in chunked(rows, chunk_size):
+                writer.writerows(chunk)
+                stats.rows += len(chunk)
+    else:
+        raise ValueError(f"unknown file format '{file_format}'.")
+    stats.seconds = time.perf_counter() - started
+    return stats
+
+def export_members(db_name="MemberManagement.db", path="members.csv", file_format="csv", chunk_size=DEFAULT_CHUNK_SIZE,
+                   nick_name_prefix=None, min_score=None, max_score=None):
+    rows = record_stream.iter_members(db_name, nick_name_prefix, min_score, max_score, page_size=chunk_size)
+    return _export(path, file_format, "member", MEMBER_FIELDS, MEMBER_TYPES, rows, chunk_size)
+
+def export_content_records(db_name="MemberManagement.db", path="records.csv", file_format="csv", chunk_size=DEFAULT_CHUNK_SIZE,
+                           content_name=None, from_date=None, to_date=None, nick_name_prefix=None):
+    rows = record_stream.iter_content_records(db_name, content_name, from_date, to_date,
+                                              nick_name_prefix=nick_name_prefix, page_size=chunk_size)
+    return _export(path, file_format, "content_record", CONTENT_RECORD_FIELDS, CONTENT_RECORD_TYPES, rows, chunk_size)
+
+def main():
+    parser = argparse.ArgumentParser(description="bulk import/export of members and content records")
+    parser.add_argument("command", choices=("import-members", "import-records", "export-members", "export-records"))
+    parser.add_argument("path")
+    parser.add_argument("--db", default="MemberManagement.db")
+    parser.add_argument("--format", choices=("csv", "columnar"), default="csv", help="export file format (import detects it)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--upsert", action="store_true", help="overwrite existing rows on import")
+    parser.add_argument("--content", help="content name (e.g. raid)")
+    parser.add_argument("--start-date", help="period start date for import-records (%%Y%%m%%d)")
+    parser.add_argument("--from-date", help="first period start date for export-records (%%Y%%m%%d)")
+    parser.add_argument("--to-date", help="last period start date for export-records (%%Y%%m%%d)")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "import-members":
+            stats = import_members(args.db, args.path, args.chunk_size, args.upsert)
+        elif args.command == "import-records":
+            stats = import_content_records(args.db, args.path, args.content, args.start_date, args.chunk_size, args.upsert)
+        elif args.command == "export-members":
+            stats = export_members(args.db, args.path, args.format, args.chunk_size)
+        else:
+            stats = export_content_records(args.db, args.path, args.format, args.chunk_size, args.content, args.from_date, args.to_date)
+    except (OSError, ValueError, sqlite3.Error) as e:
+        # 가져오기는 하나의 트랜잭션이므로 실패하면 아무 행도 남지 않음
+        print(f"Error: {args.command} failed: {e}")
+        return
+
+    if stats is None:
+        return
+    print(stats)
+    for row_number, reason in stats.errors:
+        print(f"  row {row_number}: {reason}" if row_number is not None else f"  {reason}")
+    if stats.rejected > len(stats.errors):
+        print(f"  ... {stats.rejected - len(stats.errors)} more rejected rows")
+
+if __name__ == "__main__":
+    main()
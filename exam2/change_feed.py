@@ -0,0 +1,276 @@
+import json
+import sys
+import threading
+import time
+from collections import namedtuple
+
+from connection_pool import get_connection
+from schema_cache import table_exists
+from write_events import subscribe, add_commit_hook
+
+# 변경 피드 (CDC)
+# 쓰기 이벤트(write_events) 를 change_log 테이블에 순서대로 기록하고, 소비자는 커서(seq) 부터 이어서 읽음
+#   - change_log 가 있는 DB (schema 마이그레이션 5) 에서만 기록
+#   - 이벤트는 쓰기 트랜잭션이 커밋하기 직전 같은 트랜잭션에 한 번의 executemany 로 기록됨
+#     (쓰기 큐면 그룹 커밋 하나에 그룹 전체 이벤트, 롤백되면 이벤트도 사라짐)
+#   - op 가 "bulk" 인 이벤트는 어떤 행이 바뀌었는지 모르므로 소비자가 해당 테이블(기간) 을 다시 읽어야 함
+#   - 소비자 위치는 change_cursor 에 저장, 처리한 뒤 commit 하므로 적어도 한 번 전달 (다시 받을 수 있음)
+#   - compact() 는 모든 소비자가 읽은 오래된 이벤트를 지움 (max_events 를 넘으면 읽지 않은 이벤트도 지우고,
+#     그 이벤트를 놓친 소비자는 needs_rescan 이 켜짐)
+#
+#   consumer = ChangeConsumer("MemberManagement.db", "dashboard")
+#   for batch in consumer.batches():
+#       apply(batch)
+#       consumer.commit()
+#
+#   python change_feed.py tail [after_seq]
+#   python change_feed.py status
+#   python change_feed.py compact [retain_seconds]
+
+CHANGE_LOG = "change_log"
+CHANGE_CURSOR = "change_cursor"
+CHANGE_STATE = "change_log_state"
+
+# 읽은 이벤트 (key 는 write_events 와 같은 형태, content_record 는 튜플)
+Change = namedtuple("Change", ["seq", "table", "op", "key", "values", "created"])
+
+def create_tables(cursor):
+    # AUTOINCREMENT : 끝쪽 이벤트를 지워도 seq 를 다시 쓰지 않음 (소비자 커서가 가리키는 위치가 바뀌지 않도록)
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {CHANGE_LOG} (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            op TEXT NOT NULL,
+            key TEXT,
+            payload TEXT,
+            created REAL NOT NULL
+        )
+    """)
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {CHANGE_CURSOR} (
+            consumer TEXT PRIMARY KEY,
+            seq INTEGER NOT NULL,
+            updated REAL NOT NULL
+        )
+    """)
+    # 지금까지 지운 가장 큰 seq (이보다 앞을 가리키는 소비자는 이벤트를 놓친 것)
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {CHANGE_STATE} (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            compacted_seq INTEGER NOT NULL
+        )
+    """)
+    cursor.execute(f"INSERT OR IGNORE INTO {CHANGE_STATE} (id, compacted_seq) VALUES (1, 0)")
+
+def _encode(value):
+    return None if value is None else json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+def _decode_key(value):
+    if value is None:
+        return None
+    key = json.loads(value)
+    return tuple(key) if isinstance(key, list) else key
+
+def _to_change(row):
+    seq, table, op, key, payload, created = row
+    return Change(seq, table, op, _decode_key(key), None if payload is None else json.loads(payload), created)
+
+def _append(conn, rows):
+    conn.executemany(f"INSERT INTO {CHANGE_LOG} (table_name, op, key, payload, created) VALUES (?, ?, ?, ?, ?)", rows)
+
+# 쓰기 이벤트 기록
+class ChangeFeed:
+    def __init__(self):
+        self._paused = set()
+        self._new_events = threading.Condition()
+
+        # 통계
+        self.recorded = 0
+        self.skipped = 0
+
+    def before_commit(self, conn, events):
+        """커밋 훅 : 한 트랜잭션의 이벤트를 그 트랜잭션 안에서 한 번에 기록 (쓰기와 함께 커밋/롤백)
+        conn 이 None 이면 (트랜잭션 밖에서 발행) 새 트랜잭션으로 기록"""
+        db_name = events[0].db_name
+        if db_name in self._paused or not table_exists(db_name, CHANGE_LOG, conn):
+            self.skipped += len(events)
+            return
+
+        created = time.time()
+        rows = [(event.table, event.op, _encode(event.key), _encode(event.values), created) for event in events]
+        if conn is not None:
+            _append(conn, rows)
+        else:
+            with get_connection(db_name) as conn:
+                _append(conn, rows)
+        self.recorded += len(rows)
+
+    def on_write(self, event):
+        # 커밋된 이벤트만 전달되므로 여기서 기다리는 소비자를 깨움
+        with self._new_events:
+            self._new_events.notify_all()
+
+    def pause(self, db_name):
+        """db_name 의 이벤트 기록을 멈춤 (대량 작업 중 등)"""
+        self._paused.add(db_name)
+
+    def resume(self, db_name):
+        self._paused.discard(db_name)
+
+    def wait(self, timeout):
+        """같은 프로세스에서 새 이벤트가 기록되거나 timeout 초가 지날 때까지 대기"""
+        with self._new_events:
+            return self._new_events.wait(timeout)
+
+    def stats(self):
+        return {"recorded": self.recorded, "skipped": self.skipped, "paused": sorted(self._paused)}
+
+feed = ChangeFeed()
+add_commit_hook(feed.before_commit)
+subscribe(feed.on_write)
+
+def read_changes(db_name, after_seq=0, limit=500):
+    """after_seq 다음부터 최대 limit 개의 Change 를 seq 순서로"""
+    with get_connection(db_name) as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT seq, table_name, op, key, payload, created FROM {CHANGE_LOG} "
+                       "WHERE seq > ? ORDER BY seq LIMIT ?", (after_seq, limit))
+        return [_to_change(row) for row in cursor.fetchall()]
+
+def last_seq(db_name):
+    with get_connection(db_name) as conn:
+        row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (CHANGE_LOG,)).fetchone()
+        return row[0] if row else 0
+
+def compacted_seq(db_name):
+    with get_connection(db_name) as conn:
+        return conn.execute(f"SELECT compacted_seq FROM {CHANGE_STATE}").fetchone()[0]
+
+# 소비자 (이름별로 위치를 저장하고 이어서 읽음)
+class ChangeConsumer:
+    def __init__(self, db_name, name, batch_size=500, start="earliest"):
+        """start : 처음 등록하는 소비자의 시작 위치 ("earliest" 는 남아 있는 처음부터, "latest" 는 지금 이후부터)
+        "latest" 로 등록한 뒤 전체를 한 번 읽으면 그 사이의 변경은 피드로 다시 받음"""
+        self.db_name = db_name
+        self.name = name
+        self.batch_size = batch_size
+        self.needs_rescan = False
+
+        if not table_exists(db_name, CHANGE_LOG):
+            raise ValueError(f"'{CHANGE_LOG}' table does not exsist in '{db_name}' (run schema migrate).")
+
+        with get_connection(db_name) as conn:
+            row = conn.execute(f"SELECT seq FROM {CHANGE_CURSOR} WHERE consumer = ?", (name,)).fetchone()
+        if row is not None:
+            self.position = row[0]
+        else:
+            self.position = last_seq(db_name) if start == "latest" else 0
+            self.commit(self.position)
+        self._polled = self.position
+
+    def poll(self, limit=None):
+        """현재 위치 다음 이벤트 한 묶음 (commit 하기 전까지 위치는 그대로)"""
+        compacted = compacted_seq(self.db_name)
+        if self.position < compacted:
+            # 지워진 이벤트가 있으므로 전체를 다시 읽어야 함
+            print(f"Error: consumer '{self.name}' missed changes up to {compacted}, rescan required.")
+            self.needs_rescan = True
+            self.position = compacted
+
+        changes = read_changes(self.db_name, self.position, limit or self.batch_size)
+        self._polled = changes[-1].seq if changes else self.position
+        return changes
+
+    def commit(self, seq=None):
+        """seq(기본은 마지막으로 poll 한 위치) 까지 처리했다고 기록"""
+        seq = self._polled if seq is None else seq
+        with get_connection(self.db_name) as conn:
+            conn.execute(f"INSERT INTO {CHANGE_CURSOR} (consumer, seq, updated) VALUES (?, ?, ?) "
+                         "ON CONFLICT (consumer) DO UPDATE SET seq = excluded.seq, updated = excluded.updated",
+                         (self.name, seq, time.time()))
+        self.position = seq
+
+    def rescanned(self):
+        """전체를 다시 읽은 뒤 호출"""
+        self.needs_rescan = False
+
+    def batches(self, follow=False, poll_interval=1.0, stop=None):
+        """이벤트 묶음을 차례로 반환 (각 묶음을 처리한 뒤 commit 해야 다음 묶음으로 넘어감)
+        follow 면 stop(threading.Event) 이 켜질 때까지 새 이벤트를 기다림"""
+        while stop is None or not stop.is_set():
+            changes = self.poll()
+            if changes:
+                yield changes
+                if self._polled > self.position:
+                    # commit 하지 않았으면 같은 묶음을 다시 주지 않도록 여기서 멈춤
+                    return
+                continue
+            if not follow:
+                return
+            feed.wait(poll_interval)
+
+    def unregister(self):
+        """소비자 위치를 지움 (compact 가 더 이상 이 소비자를 기다리지 않음)"""
+        with get_connection(self.db_name) as conn:
+            conn.execute(f"DELETE FROM {CHANGE_CURSOR} WHERE consumer = ?", (self.name,))
+
+def compact(db_name="MemberManagement.db", retain_seconds=86400, max_events=None):
+    """모든 소비자가 읽었고 retain_seconds 보다 오래된 이벤트를 지움
+    max_events 를 주면 남은 이벤트가 그보다 많을 때 오래된 것부터 더 지움 (읽지 않은 소비자는 다시 읽어야 함)
+    지운 이벤트 수를 반환"""
+    with get_connection(db_name) as conn:
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute(f"SELECT MIN(seq) FROM {CHANGE_CURSOR}")
+        (floor,) = cursor.fetchone()
+        if floor is None:
+            # 소비자가 없으면 기간만 기준
+            cursor.execute(f"SELECT COALESCE(MAX(seq), 0) FROM {CHANGE_LOG}")
+            (floor,) = cursor.fetchone()
+
+        cursor.execute(f"DELETE FROM {CHANGE_LOG} WHERE seq <= ? AND created < ?", (floor, time.time() - retain_seconds))
+        deleted = cursor.rowcount
+
+        if max_events is not None:
+            cursor.execute(f"DELETE FROM {CHANGE_LOG} WHERE seq <= (SELECT MAX(seq) FROM {CHANGE_LOG}) - ?", (max_events,))
+            deleted += cursor.rowcount
+
+        if deleted:
+            # 남은 첫 이벤트 바로 앞까지 지워진 것으로 기록
+            cursor.execute(f"SELECT MIN(seq) FROM {CHANGE_LOG}")
+            (first,) = cursor.fetchone()
+            upto = first - 1 if first is not None else last_seq(db_name)
+            cursor.execute(f"UPDATE {CHANGE_STATE} SET compacted_seq = MAX(compacted_seq, ?) WHERE id = 1", (upto,))
+    return deleted
+
+def status(db_name="MemberManagement.db"):
+    with get_connection(db_name) as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT COUNT(*), MIN(seq), MAX(seq) FROM {CHANGE_LOG}")
+        count, first, last = cursor.fetchone()
+        cursor.execute(f"SELECT consumer, seq, updated FROM {CHANGE_CURSOR} ORDER BY consumer")
+        consumers = cursor.fetchall()
+    return {"events": count, "first_seq": first, "last_seq": last, "compacted_seq": compacted_seq(db_name),
+            "consumers": {consumer: seq for consumer, seq, _ in consumers}}
+
+def main():
+    db_name = "MemberManagement.db"
+    command = sys.argv[1] if len(sys.argv) > 1 else "status"
+    if not table_exists(db_name, CHANGE_LOG):
+        print(f"Error: '{CHANGE_LOG}' table does not exsist.")
+        return
+    if command == "tail":
+        after_seq = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+        for change in read_changes(db_name, after_seq, 100):
+            print(f"{change.seq}: {change.table} {change.op} {change.key} {change.values}")
+    elif command == "status":
+        for key, value in status(db_name).items():
+            print(f"{key}: {value}")
+    elif command == "compact":
+        retain_seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 86400
+        print(f"compacted {compact(db_name, retain_seconds)} events")
+    else:
+        print("usage: python change_feed.py [tail [after_seq]|status|compact [retain_seconds]]")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,422 @@
+import os
+import sqlite3
+import threading
+import time
+import warnings
+from urllib.parse import quote
+
+from query_log import InstrumentedCursor, query_log, skip_caller_file
+import write_events
+
+DEFAULT_DB_NAME = "MemberManagement.db"
+DEFAULT_POOL_SIZE = 5
+
+# 커넥션마다 유지할 prepared statement 수 (sqlite3 기본값 128)
+# 기간별 테이블 문장이 (작업, 테이블) 마다 따로 캐시되므로 넉넉하게 둠
+STATEMENT_CACHE_SIZE = 512
+
+# 새 커넥션을 열 때 호출할 함수 hook(db_name, raw) (커넥션별 PRAGMA 등, schema.bootstrap 에서 등록)
+_connect_hooks = []
+
+def add_connect_hook(hook):
+    if hook not in _connect_hooks:
+        _connect_hooks.append(hook)
+    return hook
+
+# DB 파일을 프로세스에서 처음 사용할 때 한 번 호출할 함수 hook(db_name) (스키마 확인 등, schema 에서 등록)
+_first_use_hooks = []
+# 훅을 실행한 DB 파일
+_started = set()
+# 훅을 실행 중인 DB 파일 (훅 안에서 get_connection 을 다시 호출하면 그대로 진행)
+_starting = set()
+_start_lock = threading.RLock()
+
+def add_first_use_hook(hook):
+    if hook not in _first_use_hooks:
+        _first_use_hooks.append(hook)
+    return hook
+
+def ensure_started(db_name):
+    """db_name 의 처음 사용 훅을 아직 실행하지 않았으면 실행 (다른 스레드는 끝날 때까지 대기, 실패하면 다음 사용 때 다시 시도)"""
+    if db_name in _started or not _first_use_hooks:
+        return
+    with _start_lock:
+        if db_name in _started or db_name in _starting:
+            return
+        _starting.add(db_name)
+        try:
+            for hook in list(_first_use_hooks):
+                hook(db_name)
+            _started.add(db_name)
+        finally:
+            _starting.discard(db_name)
+
+def read_only_uri(db_name):
+    """DB 파일을 읽기 전용으로 여는 sqlite URI"""
+    path = os.path.abspath(db_name).replace(os.sep, "/")
+    if not path.startswith("/"):
+        path = "/" + path
+    return f"file:{quote(path, safe='/:')}?mode=ro"
+
+# 풀에서 커넥션을 얻지 못한 경우 (sqlite3.Error 로 잡을 수 있도록 상속)
+class PoolTimeoutError(sqlite3.OperationalError):
+    pass
+
+# 풀에서 대여한 커넥션 (close() 를 호출하면 실제로 닫지 않고 풀로 반환)
+class PooledConnection:
+    def __init__(self, pool, raw):
+        self._pool = pool
+        self._raw = raw
+        self.db_name = pool.db_name
+
+        # 대여 정보 (누수 감지용)
+        self.owner = None
+        self.checked_out_at = None
+        self.checkout_stack = None
+        self.depth = 0
+        self.wait_time = 0.0
+
+        # 이 커넥션의 트랜잭션에서 발행된 쓰기 이벤트 (커밋 후 전달, 롤백하면 버림)
+        self.pending_events = []
+
+    def __getattr__(self, name):
+        # cursor, execute, commit, rollback 등은 실제 커넥션으로 위임
+        return getattr(self._raw, name)
+
+    @property
+    def raw(self):
+        return self._raw
+
+    def cursor(self, factory=None):
+        # 쿼리 계측이 켜져 있으면 계측 커서를 사용
+        if factory is None and query_log.enabled:
+            cursor = self._raw.cursor(InstrumentedCursor)
+            cursor.wait_time = self.wait_time
+            return cursor
+        return self._raw.cursor() if factory is None else self._raw.cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+    def commit(self):
+        """커밋 훅을 같은 트랜잭션에서 실행한 뒤 커밋하고, 모아 둔 이벤트를 리스너에 전달"""
+        events, self.pending_events = self.pending_events, []
+        try:
+            write_events.prepare(self, events)
+        except BaseException:
+            self._raw.rollback()
+            raise
+        try:
+            self._raw.commit()
+        except BaseException:
+            write_events.abandon(events)
+            raise
+        write_events.deliver(events)
+
+    def rollback(self):
+        self.pending_events = []
+        self._raw.rollback()
+
+    def close(self):
+        """커넥션을 풀로 반환"""
+        self._pool.release(self)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        # 가장 바깥쪽 체크아웃에서만 커밋/롤백 (중첩 사용 시 하나의 트랜잭션으로 묶임)
+        try:
+            if self.depth == 1:
+                if exc_type is None:
+                    self.commit()
+                else:
+                    self.rollback()
+        finally:
+            self.close()
+        return False
+
+# 스레드 안전 커넥션 풀
+class ConnectionPool:
+    def __init__(self, db_name=DEFAULT_DB_NAME, size=DEFAULT_POOL_SIZE, timeout=5.0, leak_timeout=60.0, track_stacks=False,
+                 read_only=False):
+        if size < 1:
+            raise ValueError("pool size must be at least 1")
+
+        self.db_name = db_name
+        self.size = size
+        # 읽기 전용 (mode=ro URI 로 열어 실수로 쓰면 sqlite3.OperationalError)
+        self.read_only = read_only
+        self.timeout = timeout
+        self.leak_timeout = leak_timeout
+        self.track_stacks = track_stacks
+
+        self._lock = threading.Condition()
+        self._idle = []
+        self._in_use = set()
+        self._created = 0
+        self._local = threading.local()
+        self._closed = False
+
+        # 통계
+        self.connections_opened = 0
+        self.checkouts = 0
+        self.waits = 0
+        self.leaks_detected = 0
+
+    def _connect(self):
+        if self.read_only:
+            raw = sqlite3.connect(read_only_uri(self.db_name), uri=True, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+        else:
+            raw = sqlite3.connect(self.db_name, check_same_thread=False, cached_statements=STATEMENT_CACHE_SIZE)
+        for hook in _connect_hooks:
+            hook(self.db_name, raw)
+        self.connections_opened += 1
+        return PooledConnection(self, raw)
+
+    def acquire(self, timeout=None):
+        """커넥션 대여 (같은 스레드에서 중첩 호출 시 같은 커넥션을 반환)"""
+        held = getattr(self._local, "held", None)
+        if held is not None:
+            held.depth += 1
+            return held
+
+        timeout = self.timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+
+        with self._lock:
+            if self._closed:
+                raise PoolTimeoutError(f"Connection pool for '{self.db_name}' is closed.")
+
+            while True:
+                conn = self._take_idle()
+                if conn is None and self._created < self.size:
+                    self._created += 1
+                    try:
+                        conn = self._connect()
+                    except sqlite3.Error:
+                        self._created -= 1
+                        raise
+                if conn is not None:
+                    break
+
+                # 반환되지 않은 커넥션 중 소유 스레드가 종료된 것은 회수
+                if self._reclaim_dead_owners():
+                    continue
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeoutError(
+                        f"Timed out after {timeout}s waiting for a connection to '{self.db_name}' "
+                        f"(size={self.size}, in use={len(self._in_use)})."
+                    )
+                self.waits += 1
+                self._lock.wait(remaining)
+
+            self._in_use.add(conn)
+            self.checkouts += 1
+
+        conn.owner = threading.current_thread()
+        conn.checked_out_at = time.monotonic()
+        conn.checkout_stack = _extract_stack() if self.track_stacks else None
+        conn.depth = 1
+        conn.wait_time = time.monotonic() - started
+        self._local.held = conn
+        self._local.last = conn
+        return conn
+
+    def warm(self, count=None):
+        """커넥션을 미리 count 개(기본은 풀 크기)까지 열어 둠, 새로 연 개수를 반환"""
+        count = self.size if count is None else min(count, self.size)
+        opened = 0
+        with self._lock:
+            while not self._closed and self._created < count:
+                self._created += 1
+                try:
+                    self._idle.append(self._connect())
+                except sqlite3.Error:
+                    self._created -= 1
+                    raise
+                opened += 1
+        return opened
+
+    def held(self):
+        """현재 스레드가 대여 중인(또는 고정한) 커넥션 (없으면 None)"""
+        return getattr(self._local, "held", None)
+
+    def pin(self, conn):
+        """현재 스레드의 get_connection() 이 항상 conn 을 돌려주도록 고정 (쓰기 큐 writer 스레드용)
+        고정된 커넥션은 with 블록이 끝나도 커밋/반환되지 않음"""
+        conn.depth = 1
+        self._local.held = conn
+
+    def unpin(self):
+        self._local.held = None
+
+    def _take_idle(self):
+        # 스레드 친화성: 이 스레드가 마지막으로 사용한 커넥션을 우선 재사용
+        if not self._idle:
+            return None
+        last = getattr(self._local, "last", None)
+        if last is not None and last in self._idle:
+            self._idle.remove(last)
+            return last
+        return self._idle.pop()
+
+    def release(self, conn):
+        """커넥션 반환"""
+        if conn.depth > 1:
+            conn.depth -= 1
+            return
+
+        # 커밋되지 않은 작업은 다음 사용자에게 넘기지 않음 (그 트랜잭션의 이벤트도 버림)
+        if conn.raw.in_transaction:
+            conn.rollback()
+        elif conn.pending_events:
+            # 커밋한 뒤 발행된 이벤트
+            conn.commit()
+
+        if getattr(self._local, "held", None) is conn:
+            self._local.held = None
+        self._return(conn)
+
+    def _return(self, conn):
+        with self._lock:
+            if conn not in self._in_use:
+                return
+            self._in_use.discard(conn)
+            conn.owner = None
+            conn.checked_out_at = None
+            conn.checkout_stack = None
+            conn.depth = 0
+
+            if self._closed:
+                conn.raw.close()
+                self._created -= 1
+            else:
+                self._idle.append(conn)
+            self._lock.notify()
+
+    def connection(self):
+        """with 문으로 사용하는 체크아웃 (정상 종료 시 커밋, 예외 시 롤백)"""
+        return self.acquire()
+
+    def _reclaim_dead_owners(self):
+        # _lock 을 잡은 상태에서 호출됨
+        dead = [conn for conn in self._in_use if conn.owner is not None and not conn.owner.is_alive()]
+        for conn in dead:
+            self._warn_leak(conn, "owner thread exited without returning it")
+            self._in_use.discard(conn)
+            if conn.raw.in_transaction:
+                conn.raw.rollback()
+            conn.pending_events = []
+            conn.owner = None
+            conn.checked_out_at = None
+            conn.depth = 0
+            self._idle.append(conn)
+        return bool(dead)
+
+    def check_leaks(self):
+        """leak_timeout 보다 오래 반환되지 않은 커넥션을 찾아 경고"""
+        now = time.monotonic()
+        with self._lock:
+            self._reclaim_dead_owners()
+            leaked = [conn for conn in self._in_use
+                      if conn.checked_out_at is not None and now - conn.checked_out_at > self.leak_timeout]
+        for conn in leaked:
+            self._warn_leak(conn, f"checked out for {now - conn.checked_out_at:.1f}s")
+        return leaked
+
+    def _warn_leak(self, conn, reason):
+        self.leaks_detected += 1
+        owner = conn.owner.name if conn.owner is not None else "unknown"
+        message = f"Possible connection leak on '{self.db_name}' ({owner}): {reason}."
+        if conn.checkout_stack:
+            # traceback 은 가져오는 데 시간이 걸리므로 필요할 때만 (시작 시간 단축)
+            import traceback
+            message += "\nChecked out at:\n" + "".join(traceback.format_list(conn.checkout_stack))
+        warnings.warn(message, ResourceWarning, stacklevel=3)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "db_name": self.db_name,
+                "size": self.size,
+                "created": self._created,
+                "idle": len(self._idle),
+                "in_use": len(self._in_use),
+                "connections_opened": self.connections_opened,
+                "checkouts": self.checkouts,
+                "waits": self.waits,
+                "leaks_detected": self.leaks_detected,
+            }
+
+    def close(self):
+        """풀을 닫음 (대여 중인 커넥션은 반환 시점에 닫힘)"""
+        with self._lock:
+            self._closed = True
+            for conn in self._idle:
+                conn.raw.close()
+            self._created -= len(self._idle)
+            self._idle.clear()
+            self._lock.notify_all()
+
+# 쿼리 로그의 호출 위치는 이 모듈 바깥의 함수로 기록
+skip_caller_file(__file__)
+
+def _extract_stack():
+    import traceback
+    return traceback.extract_stack()[:-2]
+
+# DB 파일별 풀 레지스트리
+_pools = {}
+_pools_lock = threading.Lock()
+
+def get_pool(db_name=DEFAULT_DB_NAME):
+    pool = _pools.get(db_name)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(db_name)
+            if pool is None:
+                pool = _pools[db_name] = ConnectionPool(db_name)
+    return pool
+
+def configure_pool(db_name=DEFAULT_DB_NAME, size=DEFAULT_POOL_SIZE, timeout=5.0, leak_timeout=60.0, track_stacks=False,
+                   read_only=False):
+    """DB 파일의 풀 설정을 변경 (기존 풀은 닫고 새로 생성)"""
+    with _pools_lock:
+        old = _pools.get(db_name)
+        pool = _pools[db_name] = ConnectionPool(db_name, size, timeout, leak_timeout, track_stacks, read_only)
+    if old is not None:
+        old.close()
+    return pool
+
+def close_pool(db_name):
+    """DB 파일의 풀을 닫고 레지스트리에서 제거 (대여 중인 커넥션은 반환 시점에 닫힘)"""
+    with _pools_lock:
+        pool = _pools.pop(db_name, None)
+    if pool is not None:
+        pool.close()
+
+def close_all_pools():
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
+
+def _held_connection(db_name):
+    pool = _pools.get(db_name)
+    return pool.held() if pool is not None else None
+
+# 쓰기 이벤트는 발행한 스레드가 대여 중인 커넥션의 커밋에 맞춰 전달
+write_events.set_connection_lookup(_held_connection)
+
+# DB 접속 함수 (풀에서 커넥션을 대여, close() 또는 with 블록 종료 시 반환)
+def get_connection(db_name=DEFAULT_DB_NAME):
+    ensure_started(db_name)
+    return get_pool(db_name).acquire()
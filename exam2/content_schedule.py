@@ -0,0 +1,184 @@
+import threading
+import time
+from bisect import bisect_right
+from collections import namedtuple
+from heapq import heappush, heappop
+from itertools import groupby
+from operator import itemgetter
+from datetime import date, datetime
+
+from connection_pool import get_connection
+from schema_cache import table_exists
+import content_store
+
+# 컨텐츠 일정 (content_schedule) 조회
+# 일정 전체를 컨텐츠별로 기간 경계에서 나눈 구간으로 만들어 두고, "날짜 D 에 진행 중인 컨텐츠 X 의 기간" 을 이분 탐색으로 찾음
+# 찾은 결과는 (content_name, 날짜) 별로 캐시하고, 일정이 바뀌면 다시 읽음
+#   - schema 마이그레이션의 트리거가 content_schedule 변경마다 content_schedule_version 을 올리므로
+#     revalidate_interval 초마다 버전 한 행만 확인 (버전 테이블이 없으면 그 주기마다 일정을 다시 읽음)
+#
+#   period = schedule.active_period("MemberManagement.db", "raid", "20240927")
+#   period.table_name  -> "raid_20240925"
+#   period.day("20240927") -> 3
+
+VERSION_TABLE = "content_schedule_version"
+
+class Period(namedtuple("Period", ["content_name", "start_date", "end_date"])):
+    """컨텐츠 기간 (날짜는 "%Y%m%d" 문자열, 양 끝 포함)"""
+    __slots__ = ()
+
+    @property
+    def table_name(self):
+        return content_store.period_table_name(self.content_name, self.start_date)
+
+    def contains(self, on_date):
+        return self.start_date <= date_key(on_date) <= self.end_date
+
+    def day(self, on_date):
+        """on_date 가 기간의 몇 번째 날인지 (시작일이 1)"""
+        return (_parse(date_key(on_date)) - _parse(self.start_date)).days + 1
+
+def _parse(value):
+    return datetime.strptime(value, "%Y%m%d").date()
+
+def date_key(on_date=None):
+    """date / datetime / "%Y%m%d" 문자열을 "%Y%m%d" 로 (None 이면 오늘)"""
+    if on_date is None:
+        on_date = date.today()
+    if isinstance(on_date, (date, datetime)):
+        return on_date.strftime("%Y%m%d")
+    return str(on_date)
+
+def _segments(periods):
+    """정렬한 periods 를 경계 목록과 구간마다 진행 중인 기간 (여러 개면 시작일이 가장 늦은 기간) 으로"""
+    events = sorted([((period.start_date, 0), index) for index, period in enumerate(periods)] +
+                    [((period.end_date, 1), index) for index, period in enumerate(periods)])
+    points, owners = [], []
+    active, ended = [], set()
+    for point, group in groupby(events, key=itemgetter(0)):
+        for _, index in group:
+            if point[1] == 0:
+                heappush(active, -index)
+            else:
+                ended.add(index)
+        while active and -active[0] in ended:
+            heappop(active)
+        points.append(point)
+        owners.append(periods[-active[0]] if active else None)
+    return points, owners
+
+# DB 하나의 일정 색인
+class ScheduleIndex:
+    def __init__(self, rows, version=None):
+        by_content = {}
+        for content_name, start_date, end_date in rows:
+            by_content.setdefault(content_name, []).append(Period(content_name, str(start_date), str(end_date)))
+
+        self._periods = {}
+        # 기간의 시작 / 종료 경계로 나눈 구간 [(경계, 0 은 시작일 1 은 종료일 다음)] 과 구간마다 진행 중인 기간
+        # (기간이 겹쳐도 조회는 경계 목록의 이분 탐색 한 번, O(log n))
+        self._points = {}
+        self._owners = {}
+        for content_name, periods in by_content.items():
+            periods.sort()
+            self._periods[content_name] = periods
+            self._points[content_name], self._owners[content_name] = _segments(periods)
+
+        self.version = version
+        self.checked_at = time.monotonic()
+        self._resolved = {}
+
+    def find(self, content_name, on_date):
+        """on_date 에 진행 중인 기간 (여러 개면 시작일이 가장 늦은 기간, 없으면 None)"""
+        key = (content_name, on_date)
+        if key in self._resolved:
+            return self._resolved[key]
+
+        period = None
+        points = self._points.get(content_name)
+        if points:
+            index = bisect_right(points, (on_date, 0)) - 1
+            if index >= 0:
+                period = self._owners[content_name][index]
+
+        self._resolved[key] = period
+        return period
+
+    def periods(self, content_name=None):
+        if content_name is not None:
+            return list(self._periods.get(content_name, ()))
+        return [period for name in sorted(self._periods) for period in self._periods[name]]
+
+class ScheduleService:
+    def __init__(self, revalidate_interval=1.0):
+        self.revalidate_interval = revalidate_interval
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+        # 통계
+        self.loads = 0
+        self.version_checks = 0
+
+    def _index(self, db_name):
+        index = self._indexes.get(db_name)
+        if index is not None and time.monotonic() - index.checked_at < self.revalidate_interval:
+            return index
+
+        with get_connection(db_name) as conn:
+            version = self._version(db_name, conn)
+            if index is not None and version is not None and version == index.version:
+                index.checked_at = time.monotonic()
+                return index
+
+            rows = []
+            if table_exists(db_name, "content_schedule", conn):
+                cursor = conn.cursor()
+                cursor.execute("SELECT content_name, start_date, end_date FROM content_schedule")
+                rows = cursor.fetchall()
+            else:
+                print("Error: 'content_schedule' table does not exsist.")
+
+        index = ScheduleIndex(rows, version)
+        with self._lock:
+            self._indexes[db_name] = index
+            self.loads += 1
+        return index
+
+    def _version(self, db_name, conn):
+        if not table_exists(db_name, VERSION_TABLE, conn):
+            return None
+        self.version_checks += 1
+        row = conn.execute(f"SELECT version FROM {VERSION_TABLE}").fetchone()
+        return row[0] if row else None
+
+    def active_period(self, db_name, content_name, on_date=None):
+        """on_date(기본 오늘) 에 진행 중인 content_name 의 Period (없으면 None)"""
+        return self._index(db_name).find(content_name, date_key(on_date))
+
+    def periods(self, db_name, content_name=None):
+        return self._index(db_name).periods(content_name)
+
+    def invalidate(self, db_name=None):
+        """색인을 버림 (다음 조회 때 다시 읽음)"""
+        with self._lock:
+            for key in [key for key in self._indexes if db_name is None or key == db_name]:
+                del self._indexes[key]
+
+    def stats(self):
+        return {"indexes": len(self._indexes), "loads": self.loads, "version_checks": self.version_checks}
+
+schedule = ScheduleService()
+
+def resolve_period(conn, content_name, on_date=None):
+    """커넥션으로 기간 찾기 (풀 커넥션이면 색인 사용, 아니면 content_schedule 을 직접 조회)"""
+    db_name = getattr(conn, "db_name", None)
+    if db_name is not None:
+        return schedule.active_period(db_name, content_name, on_date)
+
+    on_date = date_key(on_date)
+    cursor = conn.cursor()
+    cursor.execute("SELECT content_name, start_date, end_date FROM content_schedule "
+                   "WHERE content_name = ? AND start_date <= ? AND end_date >= ? ORDER BY start_date DESC LIMIT 1",
+                   (content_name, on_date, on_date))
+    row = cursor.fetchone()
+    return Period(row[0], str(row[1]), str(row[2])) if row else None
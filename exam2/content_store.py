@@ -0,0 +1,238 @@
+import sqlite3
+
+from connection_pool import get_connection
+from schema_cache import table_exists, invalidate_schema
+import batch_writer
+import member_summary
+from statement_registry import PERIOD_TABLE_PATTERN
+from batch_writer import DEFAULT_CHUNK_SIZE
+
+# 통합 컨텐츠 레코드 저장소
+# 기간별 테이블(f"{content_name}_{start_date}") 대신 하나의 테이블에
+# (content_name, start_date, nick_name, day) 복합 키로 저장
+CONTENT_RECORD_TABLE = "content_record"
+
+# 기간별 테이블 이름 규칙 (예: raid_20240925) 은 statement_registry 에서 정의
+PERIOD_TABLE_COLUMNS = {"nick_name", "score", "participation_count", "day"}
+
+def period_table_name(content_name, start_date):
+    return f"{content_name}_{start_date}"
+
+def split_period_table(table_name):
+    """기간별 테이블 이름을 (content_name, start_date) 로 분리"""
+    match = PERIOD_TABLE_PATTERN.match(table_name)
+    if not match:
+        raise ValueError(f"'{table_name}' is not a content period table name.")
+    return match.group("content_name"), match.group("start_date")
+
+def create_store(conn):
+    """통합 테이블과 인덱스 생성 (이미 있으면 그대로 둠)"""
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {CONTENT_RECORD_TABLE} (
+            content_name TEXT NOT NULL,
+            start_date TEXT NOT NULL,
+            nick_name TEXT NOT NULL,
+            day INTEGER NOT NULL,
+            score INTEGER,
+            participation_count INTEGER,
+            PRIMARY KEY (content_name, start_date, nick_name, day)
+        ) WITHOUT ROWID
+    """)
+    # 기간을 가로지르는 멤버별 조회용
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS {CONTENT_RECORD_TABLE}_nick_name ON {CONTENT_RECORD_TABLE} (nick_name, content_name, start_date)")
+    conn.commit()
+    invalidate_schema(getattr(conn, "db_name", None))
+
+def is_enabled(conn):
+    """통합 저장소가 있는 DB 인지 확인 (풀 커넥션이면 스키마 캐시 사용)"""
+    db_name = getattr(conn, "db_name", None)
+    if db_name is not None:
+        return table_exists(db_name, CONTENT_RECORD_TABLE, conn)
+
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?;", (CONTENT_RECORD_TABLE,))
+    return cursor.fetchone() is not None
+
+# 단건 처리 (기존 함수와 같은 인자 순서, 쓰기는 커밋하지 않음 - 호출한 쪽이 이벤트 발행 후 커밋)
+# 수정/삭제는 바뀐 행 수를 반환 (0 이면 이벤트를 발행하지 않음)
+def find_records(conn, content_name, start_date, nick_name):
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT score, participation_count, day FROM {CONTENT_RECORD_TABLE} "
+                   "WHERE content_name = ? AND start_date = ? AND nick_name = ? ORDER BY day",
+                   (content_name, start_date, nick_name))
+    return cursor.fetchall()
+
+def find_record(conn, content_name, start_date, nick_name, day):
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT score, participation_count, day FROM {CONTENT_RECORD_TABLE} "
+                   "WHERE content_name = ? AND start_date = ? AND nick_name = ? AND day = ?",
+                   (content_name, start_date, nick_name, day))
+    return cursor.fetchone()
+
+def insert_record(conn, content_name, start_date, nick_name, score, participation_count, day):
+    cursor = conn.cursor()
+    cursor.execute(f"INSERT INTO {CONTENT_RECORD_TABLE} (content_name, start_date, nick_name, day, score, participation_count) "
+                   "VALUES (?, ?, ?, ?, ?, ?)",
+                   (content_name, start_date, nick_name, day, score, participation_count))
+
+def update_record(conn, content_name, start_date, nick_name, score, participation_count, day=None):
+    """day 가 None 이면 해당 기간의 nick_name 레코드 전체를 수정"""
+    cursor = conn.cursor()
+    sql = (f"UPDATE {CONTENT_RECORD_TABLE} SET score = ?, participation_count = ? "
+           "WHERE content_name = ? AND start_date = ? AND nick_name = ?")
+    params = (score, participation_count, content_name, start_date, nick_name)
+    if day is not None:
+        sql += " AND day = ?"
+        params += (day,)
+    cursor.execute(sql, params)
+    return cursor.rowcount
+
+def delete_record(conn, content_name, start_date, nick_name, day):
+    cursor = conn.cursor()
+    cursor.execute(f"DELETE FROM {CONTENT_RECORD_TABLE} WHERE content_name = ? AND start_date = ? AND nick_name = ? AND day = ?",
+                   (content_name, start_date, nick_name, day))
+    return cursor.rowcount
+
+# 일괄 처리
+def insert_sql(upsert=False):
+    """(content_name, start_date, nick_name, score, participation_count, day) 행을 넣는 SQL"""
+    sql = (f"INSERT INTO {CONTENT_RECORD_TABLE} (content_name, start_date, nick_name, score, participation_count, day) "
+           "VALUES (?, ?, ?, ?, ?, ?)")
+    if upsert:
+        sql += (" ON CONFLICT(content_name, start_date, nick_name, day) DO UPDATE SET"
+                " score = excluded.score, participation_count = excluded.participation_count")
+    return sql
+
+def insert_records(conn, content_name, start_date, records, chunk_size=DEFAULT_CHUNK_SIZE, upsert=False):
+    """records: (nick_name, score, participation_count, day)"""
+    rows = ((content_name, start_date, *record) for record in records)
+    return batch_writer.execute_batch(conn, insert_sql(upsert), rows, chunk_size)
+
+def update_records(conn, content_name, start_date, records, chunk_size=DEFAULT_CHUNK_SIZE):
+    """records: (nick_name, score, participation_count, day)"""
+    rows = ((score, participation_count, content_name, start_date, nick_name, day)
+            for nick_name, score, participation_count, day in records)
+    return batch_writer.execute_batch(
+        conn,
+        f"UPDATE {CONTENT_RECORD_TABLE} SET score = ?, participation_count = ? "
+        "WHERE content_name = ? AND start_date = ? AND nick_name = ? AND day = ?",
+        rows, chunk_size)
+
+def delete_records(conn, content_name, start_date, keys, chunk_size=DEFAULT_CHUNK_SIZE):
+    """keys: (nick_name, day)"""
+    rows = ((content_name, start_date, nick_name, day) for nick_name, day in keys)
+    return batch_writer.execute_batch(
+        conn,
+        f"DELETE FROM {CONTENT_RECORD_TABLE} WHERE content_name = ? AND start_date = ? AND nick_name = ? AND day = ?",
+        rows, chunk_size)
+
+# 기간을 가로지르는 집계 (쿼리 한 번)
+def member_totals(conn, nick_name=None, content_name=None, from_date=None, to_date=None):
+    """멤버별 (nick_name, 총 점수, 총 참여 횟수, 참여 기간 수)"""
+    conditions = []
+    params = []
+    if nick_name is not None:
+        conditions.append("nick_name = ?")
+        params.append(nick_name)
+    if content_name is not None:
+        conditions.append("content_name = ?")
+        params.append(content_name)
+    if from_date is not None:
+        conditions.append("start_date >= ?")
+        params.append(from_date)
+    if to_date is not None:
+        conditions.append("start_date <= ?")
+        params.append(to_date)
+
+    where_clause = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT nick_name, SUM(score), SUM(participation_count), COUNT(DISTINCT content_name || '_' || start_date) "
+                   f"FROM {CONTENT_RECORD_TABLE} {where_clause}GROUP BY nick_name ORDER BY nick_name", params)
+    return cursor.fetchall()
+
+# 기간별 테이블 -> 통합 테이블 마이그레이션
+def find_period_tables(conn):
+    """기간별 컨텐츠 테이블 목록 [(table_name, content_name, start_date)]"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name")
+    tables = []
+    for (table_name,) in cursor.fetchall():
+        match = PERIOD_TABLE_PATTERN.match(table_name)
+        if not match:
+            continue
+        cursor.execute(f"PRAGMA table_info({table_name})")
+        if PERIOD_TABLE_COLUMNS <= {row[1] for row in cursor.fetchall()}:
+            tables.append((table_name, match.group("content_name"), match.group("start_date")))
+    return tables
+
+def _create_compat_view(cursor, table_name, content_name, start_date):
+    # 기존 f-string SQL 이 계속 동작하도록 같은 이름의 뷰와 INSTEAD OF 트리거를 만듦
+    # (content_name, start_date 는 이름 규칙으로 검증된 값)
+    where = f"content_name = '{content_name}' AND start_date = '{start_date}'"
+    cursor.execute(f"CREATE VIEW {table_name} AS SELECT nick_name, score, participation_count, day "
+                   f"FROM {CONTENT_RECORD_TABLE} WHERE {where}")
+    cursor.execute(f"""
+        CREATE TRIGGER {table_name}_insert INSTEAD OF INSERT ON {table_name}
+        BEGIN
+            INSERT INTO {CONTENT_RECORD_TABLE} (content_name, start_date, nick_name, day, score, participation_count)
+            VALUES ('{content_name}', '{start_date}', NEW.nick_name, NEW.day, NEW.score, NEW.participation_count);
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER {table_name}_update INSTEAD OF UPDATE ON {table_name}
+        BEGIN
+            UPDATE {CONTENT_RECORD_TABLE} SET nick_name = NEW.nick_name, day = NEW.day,
+                score = NEW.score, participation_count = NEW.participation_count
+            WHERE {where} AND nick_name = OLD.nick_name AND day = OLD.day;
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER {table_name}_delete INSTEAD OF DELETE ON {table_name}
+        BEGIN
+            DELETE FROM {CONTENT_RECORD_TABLE} WHERE {where} AND nick_name = OLD.nick_name AND day = OLD.day;
+        END
+    """)
+
+def migrate_period_tables(db_name="MemberManagement.db", keep_compat_views=True):
+    """기간별 테이블을 통합 테이블로 한 트랜잭션에서 옮김, {table_name: 옮긴 행 수} 를 반환
+    같은 (nick_name, day) 가 여러 번 있으면 마지막 행이 남음
+    keep_compat_views 이면 옮긴 테이블 자리에 같은 이름의 호환 뷰를 만듦"""
+    with get_connection(db_name) as conn:
+        create_store(conn)
+        cursor = conn.cursor()
+        migrated = {}
+        try:
+            for table_name, content_name, start_date in find_period_tables(conn):
+                cursor.execute(f"""
+                    INSERT INTO {CONTENT_RECORD_TABLE} (content_name, start_date, nick_name, day, score, participation_count)
+                    SELECT ?, ?, nick_name, day, score, participation_count FROM {table_name} WHERE true
+                    ON CONFLICT(content_name, start_date, nick_name, day) DO UPDATE SET
+                        score = excluded.score, participation_count = excluded.participation_count
+                """, (content_name, start_date))
+                migrated[table_name] = cursor.rowcount
+                cursor.execute(f"DROP TABLE {table_name}")
+                if keep_compat_views:
+                    _create_compat_view(cursor, table_name, content_name, start_date)
+
+            # 요약 테이블을 쓰고 있으면 통합 저장소 기준으로 다시 계산하고 트리거를 옮김
+            if migrated and member_summary.is_installed(conn):
+                invalidate_schema(db_name)
+                member_summary.rebuild_with(conn)
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        finally:
+            invalidate_schema(db_name)
+    return migrated
+
+def main():
+    db_name = "MemberManagement.db"
+    migrated = migrate_period_tables(db_name)
+    for table_name, count in migrated.items():
+        print(f"{table_name}: {count} rows migrated.")
+    print(f"{len(migrated)} period tables migrated into '{CONTENT_RECORD_TABLE}'.")
+
+if __name__ == "__main__":
+    main()
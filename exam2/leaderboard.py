@@ -0,0 +1,305 @@
+import random
+import threading
+from math import log
+
+from connection_pool import get_connection
+from write_events import subscribe, state as write_state
+import content_store
+
+# 스킵 리스트 끝을 나타내는 값 (어떤 키보다도 큼)
+class _End:
+    def __lt__(self, other):
+        return False
+
+    def __le__(self, other):
+        return other is self
+
+    def __gt__(self, other):
+        return other is not self
+
+    def __ge__(self, other):
+        return True
+
+_END = _End()
+
+class _Node:
+    __slots__ = ("key", "next", "width")
+
+    def __init__(self, key, next_nodes, widths):
+        self.key = key
+        self.next = next_nodes
+        self.width = widths
+
+# 순서 통계 리스트 (indexable skip list)
+# 삽입/삭제/순위/인덱스 접근이 모두 평균 O(log n)
+class OrderStatisticList:
+    def __init__(self, max_levels=24):
+        self.max_levels = max_levels
+        self._tail = _Node(_END, [], [])
+        self._head = _Node(None, [self._tail] * max_levels, [1] * max_levels)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def _random_level(self):
+        return min(self.max_levels, 1 - int(log(1.0 - random.random(), 2.0)))
+
+    def insert(self, key):
+        chain = [None] * self.max_levels
+        steps_at_level = [0] * self.max_levels
+        node = self._head
+        for level in reversed(range(self.max_levels)):
+            while node.next[level].key <= key:
+                steps_at_level[level] += node.width[level]
+                node = node.next[level]
+            chain[level] = node
+
+        depth = self._random_level()
+        new_node = _Node(key, [None] * depth, [None] * depth)
+        steps = 0
+        for level in range(depth):
+            prev_node = chain[level]
+            new_node.next[level] = prev_node.next[level]
+            prev_node.next[level] = new_node
+            new_node.width[level] = prev_node.width[level] - steps
+            prev_node.width[level] = steps + 1
+            steps += steps_at_level[level]
+        for level in range(depth, self.max_levels):
+            chain[level].width[level] += 1
+        self._size += 1
+
+    def remove(self, key):
+        chain = [None] * self.max_levels
+        node = self._head
+        for level in reversed(range(self.max_levels)):
+            while node.next[level].key < key:
+                node = node.next[level]
+            chain[level] = node
+
+        target = chain[0].next[0]
+        if target is self._tail or target.key != key:
+            raise KeyError(key)
+
+        for level in range(len(target.next)):
+            prev_node = chain[level]
+            prev_node.width[level] += target.width[level] - 1
+            prev_node.next[level] = target.next[level]
+        for level in range(len(target.next), self.max_levels):
+            chain[level].width[level] -= 1
+        self._size -= 1
+
+    def index(self, key):
+        """key 보다 작은 원소 수 (0 부터 시작하는 위치)"""
+        position = 0
+        node = self._head
+        for level in reversed(range(self.max_levels)):
+            while node.next[level].key < key:
+                position += node.width[level]
+                node = node.next[level]
+        return position
+
+    def __getitem__(self, index):
+        if not 0 <= index < self._size:
+            raise IndexError(index)
+        node = self._head
+        remaining = index + 1
+        for level in reversed(range(self.max_levels)):
+            while node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+        return node.key
+
+    def slice(self, start, stop):
+        """start 부터 stop 직전까지 (O(log n + k))"""
+        stop = min(stop, self._size)
+        if start >= stop:
+            return []
+        node = self._head
+        remaining = start + 1
+        for level in reversed(range(self.max_levels)):
+            while node.width[level] <= remaining:
+                remaining -= node.width[level]
+                node = node.next[level]
+
+        keys = []
+        for _ in range(stop - start):
+            keys.append(node.key)
+            node = node.next[0]
+        return keys
+
+# 점수 순위표 (점수 내림차순, 같은 점수는 nick_name 순)
+class Leaderboard:
+    def __init__(self):
+        self._scores = {}
+        self._order = OrderStatisticList()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._scores)
+
+    def __contains__(self, nick_name):
+        return nick_name in self._scores
+
+    def set_score(self, nick_name, score):
+        score = score or 0
+        with self._lock:
+            old_score = self._scores.get(nick_name)
+            if old_score == score and nick_name in self._scores:
+                return
+            if nick_name in self._scores:
+                self._order.remove((-old_score, nick_name))
+            self._scores[nick_name] = score
+            self._order.insert((-score, nick_name))
+
+    def add_score(self, nick_name, delta):
+        with self._lock:
+            self.set_score(nick_name, self._scores.get(nick_name, 0) + (delta or 0))
+
+    def remove(self, nick_name):
+        with self._lock:
+            score = self._scores.pop(nick_name, None)
+            if score is not None:
+                self._order.remove((-score, nick_name))
+
+    def score_of(self, nick_name):
+        return self._scores.get(nick_name)
+
+    def rank_of(self, nick_name):
+        """1 부터 시작하는 순위 (없으면 None)"""
+        with self._lock:
+            score = self._scores.get(nick_name)
+            if score is None:
+                return None
+            return self._order.index((-score, nick_name)) + 1
+
+    def _entries(self, start, stop):
+        return [(start + i + 1, nick_name, -negative_score)
+                for i, (negative_score, nick_name) in enumerate(self._order.slice(start, stop))]
+
+    def top(self, count=10, page=0):
+        """page 번째 페이지의 상위 count 명 [(순위, nick_name, 점수)]"""
+        with self._lock:
+            start = page * count
+            return self._entries(start, start + count)
+
+    def around(self, nick_name, radius=2):
+        """nick_name 앞뒤 radius 명 [(순위, nick_name, 점수)]"""
+        with self._lock:
+            rank = self.rank_of(nick_name)
+            if rank is None:
+                return []
+            start = max(0, rank - 1 - radius)
+            return self._entries(start, rank + radius)
+
+    def load(self, rows):
+        """(nick_name, score) 로 다시 채움"""
+        with self._lock:
+            self._scores = {}
+            self._order = OrderStatisticList()
+            for nick_name, score in rows:
+                self.set_score(nick_name, score)
+
+# 순위표를 만드는 동안 쓰기가 끼어들면 다시 읽는 횟수
+REBUILD_ATTEMPTS = 3
+
+# DB 별 순위표 관리 (처음 사용할 때 DB 에서 만들고, 이후에는 쓰기 이벤트로 갱신)
+#   멤버 순위표      : member.score
+#   컨텐츠 순위표    : 한 기간(content_name, start_date)의 멤버별 점수 합계
+class RankingService:
+    def __init__(self):
+        self._boards = {}
+        self._lock = threading.Lock()
+
+        # 통계
+        self.rebuilds = 0
+        self.unstable_rebuilds = 0
+        self.incremental_updates = 0
+
+    def member_board(self, db_name="MemberManagement.db"):
+        return self._board(("member", db_name), lambda conn: self._member_rows(conn))
+
+    def content_board(self, content_name, start_date, db_name="MemberManagement.db"):
+        return self._board(("content_record", db_name, content_name, start_date),
+                           lambda conn: self._content_rows(conn, content_name, start_date))
+
+    def _board(self, key, load_rows):
+        board = self._boards.get(key)
+        if board is not None:
+            return board
+
+        with self._lock:
+            board = self._boards.get(key)
+            if board is not None:
+                return board
+            # 읽는 동안 커밋된 쓰기는 순위표가 등록되기 전이라 on_write 가 놓치므로
+            # 먼저 등록한 뒤 읽기 전후의 쓰기 이벤트 상태를 비교해, 대기 중이거나 바뀌었으면 다시 읽음
+            for _ in range(REBUILD_ATTEMPTS):
+                before = write_state(key[1])
+                board = Leaderboard()
+                with get_connection(key[1]) as conn:
+                    board.load(load_rows(conn))
+                self._boards[key] = board
+                self.rebuilds += 1
+                if before[0] == 0 and write_state(key[1]) == before:
+                    return board
+                self._boards.pop(key, None)
+            # 쓰기가 계속 이어지면 이번 조회에만 사용 (다음 조회 때 다시 만듦)
+            self.unstable_rebuilds += 1
+            return board
+
+    def _member_rows(self, conn):
+        cursor = conn.cursor()
+        cursor.execute("SELECT nick_name, score FROM member")
+        return cursor
+
+    def _content_rows(self, conn, content_name, start_date):
+        cursor = conn.cursor()
+        if content_store.is_enabled(conn):
+            cursor.execute(f"SELECT nick_name, SUM(score) FROM {content_store.CONTENT_RECORD_TABLE} "
+                           "WHERE content_name = ? AND start_date = ? GROUP BY nick_name", (content_name, start_date))
+        else:
+            table_name = content_store.period_table_name(content_name, start_date)
+            cursor.execute(f"SELECT nick_name, SUM(score) FROM {table_name} GROUP BY nick_name")
+        return cursor
+
+    def invalidate(self, db_name=None):
+        """순위표를 버림 (다음 조회 때 DB 에서 다시 만듦)"""
+        with self._lock:
+            for key in [key for key in self._boards if db_name is None or key[1] == db_name]:
+                del self._boards[key]
+
+    def on_write(self, event):
+        if event.table == "member":
+            board = self._boards.get(("member", event.db_name))
+            if board is None:
+                return
+            if event.op == "bulk":
+                self._boards.pop(("member", event.db_name), None)
+            elif event.op == "delete":
+                board.remove(event.key)
+                self.incremental_updates += 1
+            elif event.values and "score" in event.values and (event.op == "insert" or event.key in board):
+                # 수정은 순위표에 있는 멤버만 반영 (없는 멤버가 새로 나타나지 않도록)
+                board.set_score(event.key, event.values["score"])
+                self.incremental_updates += 1
+            return
+
+        content_name, start_date, nick_name, _ = event.key
+        key = ("content_record", event.db_name, content_name, start_date)
+        board = self._boards.get(key)
+        if board is None:
+            return
+        if event.op == "insert":
+            board.add_score(nick_name, event.values["score"])
+            self.incremental_updates += 1
+        else:
+            # 수정/삭제는 이전 점수를 모르므로 다음 조회 때 다시 만듦
+            self._boards.pop(key, None)
+
+    def stats(self):
+        return {"boards": len(self._boards), "rebuilds": self.rebuilds, "unstable_rebuilds": self.unstable_rebuilds,
+                "incremental_updates": self.incremental_updates}
+
+rankings = RankingService()
+subscribe(rankings.on_write)
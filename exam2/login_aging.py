@@ -0,0 +1,217 @@
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, date, timedelta
+
+from connection_pool import get_connection
+from schema_cache import table_exists
+from write_events import publish_member
+from write_queue import queued_write
+
+# last_login (마지막 로그인 후 지난 일 수) 일일 갱신
+#   - 하루에 한 번 UPDATE 한 문장으로 전체 멤버의 last_login 을 올림 (멤버마다 UPDATE + 커밋하지 않음)
+#   - 실행한 날짜를 login_aging 테이블 (schema 마이그레이션으로 생성) 에 같은 트랜잭션으로 기록하므로
+#     같은 날 다시 실행하면 아무것도 하지 않고, 중간에 죽으면 전부 되돌려져 다시 실행해도 한 번만 반영됨
+#   - 며칠 빠졌으면 빠진 일 수만큼 한 번에 올림
+#   - 로그인은 LoginBatch 에 모아 두었다가 한 트랜잭션으로 last_login = 0 (갱신 직전에도 비움)
+#
+#   python login_aging.py run       # 오늘 분 갱신 (이미 했으면 건너뜀)
+#   python login_aging.py status    # 최근 실행 기록
+
+AGING_TABLE = "login_aging"
+
+# 실행 기록 테이블 (schema 마이그레이션 6)
+def create_table(cursor):
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {AGING_TABLE} (
+            run_date TEXT PRIMARY KEY,
+            days INTEGER NOT NULL,
+            members INTEGER NOT NULL,
+            seconds REAL NOT NULL
+        )
+    """)
+
+def last_run_date(conn):
+    """마지막으로 갱신한 날짜 (date, 없으면 None)"""
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT MAX(run_date) FROM {AGING_TABLE}")
+    (run_date,) = cursor.fetchone()
+    return datetime.strptime(run_date, "%Y%m%d").date() if run_date else None
+
+@queued_write
+def age_members(conn, today=None):
+    """오늘(today) 까지 밀린 일 수만큼 last_login 을 올리고 (올린 일 수, 멤버 수) 를 반환
+    이미 오늘 분을 반영했으면 (0, 0)
+    처음 실행하면 하루 분만 올림"""
+    today = today or date.today()
+    cursor = conn.cursor()
+    try:
+        # 다른 쓰기가 사이에 끼지 않도록 시작부터 쓰기 잠금
+        if not conn.in_transaction:
+            cursor.execute("BEGIN IMMEDIATE")
+        started = time.perf_counter()
+
+        last_run = last_run_date(conn)
+        days = 1 if last_run is None else (today - last_run).days
+        if days <= 0:
+            conn.rollback()
+            return 0, 0
+
+        cursor.execute("UPDATE member SET last_login = last_login + ? WHERE last_login IS NOT NULL", (days,))
+        members = cursor.rowcount
+        seconds = time.perf_counter() - started
+        cursor.execute(f"INSERT INTO {AGING_TABLE} (run_date, days, members, seconds) VALUES (?, ?, ?, ?)",
+                       (today.strftime("%Y%m%d"), days, members, seconds))
+        publish_member(getattr(conn, "db_name", None), "bulk")
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+    return days, members
+
+# 로그인 이벤트 모음
+# record() 는 메모리에만 기록하고, max_batch 개가 모이거나 flush_interval 초가 지나면 한 트랜잭션으로 반영
+class LoginBatch:
+    def __init__(self, db_name="MemberManagement.db", max_batch=500, flush_interval=1.0):
+        self.db_name = db_name
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+        # 통계
+        self.logins = 0
+        self.flushes = 0
+        self.flushed_members = 0
+
+    def record(self, nick_name):
+        with self._lock:
+            self._pending.add(nick_name)
+            self.logins += 1
+            due = len(self._pending) >= self.max_batch or time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        """모아 둔 로그인을 반영하고 반영한 멤버 수를 반환"""
+        with self._lock:
+            nick_names = sorted(self._pending)
+            self._pending.clear()
+            self._last_flush = time.monotonic()
+        if not nick_names:
+            return 0
+
+        with get_connection(self.db_name) as conn:
+            _reset_last_login(conn, nick_names)
+        self.flushes += 1
+        self.flushed_members += len(nick_names)
+        return len(nick_names)
+
+    def stats(self):
+        return {"pending": len(self._pending), "logins": self.logins, "flushes": self.flushes, "flushed_members": self.flushed_members}
+
+@queued_write
+def _reset_last_login(conn, nick_names):
+    cursor = conn.cursor()
+    try:
+        cursor.executemany("UPDATE member SET last_login = 0 WHERE nick_name = ?", ((nick_name,) for nick_name in nick_names))
+        if cursor.rowcount < len(nick_names):
+            # 없는 멤버의 로그인은 이벤트를 발행하지 않음
+            nick_names = [nick_name for nick_name in nick_names
+                          if conn.execute("SELECT 1 FROM member WHERE nick_name = ?", (nick_name,)).fetchone()]
+        db_name = getattr(conn, "db_name", None)
+        for nick_name in nick_names:
+            publish_member(db_name, "update", nick_name, {"last_login": 0})
+        conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+
+def run(db_name="MemberManagement.db", today=None, logins=None):
+    """하루 분 갱신 (logins 가 있으면 먼저 반영), (올린 일 수, 멤버 수, 걸린 시간) 를 반환"""
+    if not table_exists(db_name, "member"):
+        print("Error: 'member' table does not exsist.")
+        return None
+    if not table_exists(db_name, AGING_TABLE):
+        print(f"Error: '{AGING_TABLE}' table does not exsist (run schema migrate).")
+        return None
+
+    if logins is not None:
+        logins.flush()
+
+    started = time.perf_counter()
+    with get_connection(db_name) as conn:
+        days, members = age_members(conn, today)
+    elapsed = time.perf_counter() - started
+
+    run_date = (today or date.today()).strftime("%Y%m%d")
+    if days:
+        print(f"login aging {run_date}: +{days} day(s) for {members} members in {elapsed * 1000:.1f} ms")
+    else:
+        print(f"login aging {run_date}: already done ({elapsed * 1000:.1f} ms)")
+    return days, members, elapsed
+
+# 매일 run_at 시각에 실행하는 스케줄러 (시작할 때도 한 번 실행해 밀린 날을 채움)
+class AgingScheduler:
+    def __init__(self, db_name="MemberManagement.db", run_at="00:00", logins=None):
+        self.db_name = db_name
+        self.run_at = datetime.strptime(run_at, "%H:%M").time()
+        self.logins = logins
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def seconds_until_next_run(self, now=None):
+        now = now or datetime.now()
+        next_run = datetime.combine(now.date(), self.run_at)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        return (next_run - now).total_seconds()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name=f"login-aging-{self.db_name}", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                run(self.db_name, logins=self.logins)
+            except sqlite3.Error as e:
+                # 다음 실행 때 밀린 일 수까지 한 번에 반영됨
+                print(f"Error: login aging for '{self.db_name}' failed: {e}")
+            self._stopped.wait(self.seconds_until_next_run())
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+def status(db_name="MemberManagement.db", limit=10):
+    """최근 실행 기록 [(run_date, days, members, seconds)]"""
+    with get_connection(db_name) as conn:
+        if not table_exists(db_name, AGING_TABLE, conn):
+            return []
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT run_date, days, members, seconds FROM {AGING_TABLE} ORDER BY run_date DESC LIMIT ?", (limit,))
+        return cursor.fetchall()
+
+def main():
+    # 처음 사용할 때 스키마(login_aging 테이블 포함) 를 확인하도록 등록 (schema 가 이 모듈을 import 하므로 여기서)
+    import schema
+    db_name = "MemberManagement.db"
+    command = sys.argv[1] if len(sys.argv) > 1 else "run"
+    if command == "run":
+        run(db_name)
+    elif command == "status":
+        for run_date, days, members, seconds in status(db_name):
+            print(f"{run_date}: +{days} day(s), {members} members, {seconds * 1000:.1f} ms")
+    else:
+        print("usage: python login_aging.py [run|status]")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+import threading
+import time
+from collections import OrderedDict
+
+from write_events import subscribe
+
+# 멤버 조회 결과 캐시 (LRU + TTL, read-through)
+# 키는 (db_name, nick_name), 값은 find_member 결과 행
+# 쓰기 경로(생성/수정/삭제)의 쓰기 이벤트를 구독해 캐시를 최신으로 유지
+class MemberCache:
+    def __init__(self, max_size=10000, ttl=30.0):
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self._rows = OrderedDict()
+        self._lock = threading.Lock()
+        # 읽는 중인 키 -> (loader 수, 읽는 동안 무효화된 횟수)
+        # 읽기 전후의 횟수가 다르면 읽은 값이 이미 지난 값일 수 있으므로 캐시에 넣지 않음
+        self._loading = {}
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, db_name, nick_name, loader):
+        """캐시에 있으면 반환, 없으면 loader() 결과를 캐시에 넣고 반환"""
+        key = (db_name, nick_name)
+        now = time.monotonic()
+
+        with self._lock:
+            cached = self._rows.get(key)
+            if cached is not None:
+                row, expires_at = cached
+                if expires_at > now:
+                    self._rows.move_to_end(key)
+                    self.hits += 1
+                    return row
+                del self._rows[key]
+                self.expirations += 1
+            self.misses += 1
+            loaders, version = self._loading.get(key, (0, 0))
+            self._loading[key] = (loaders + 1, version)
+
+        try:
+            row = loader()
+        finally:
+            with self._lock:
+                loaders, current = self._loading.pop(key)
+                if loaders > 1:
+                    self._loading[key] = (loaders - 1, current)
+
+        # 없는 멤버는 캐시하지 않음
+        if row is not None and current == version:
+            self.put(db_name, nick_name, row)
+        return row
+
+    def put(self, db_name, nick_name, row):
+        key = (db_name, nick_name)
+        with self._lock:
+            self._rows[key] = (row, time.monotonic() + self.ttl)
+            self._rows.move_to_end(key)
+            while len(self._rows) > self.max_size:
+                self._rows.popitem(last=False)
+                self.evictions += 1
+
+    def _invalidate_loading(self, key):
+        loaders, version = self._loading[key]
+        self._loading[key] = (loaders, version + 1)
+
+    def invalidate(self, db_name, nick_name):
+        key = (db_name, nick_name)
+        with self._lock:
+            if key in self._loading:
+                self._invalidate_loading(key)
+            if self._rows.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self, db_name=None):
+        """전체 또는 특정 DB 의 캐시를 비움 (일괄 처리 후 호출)"""
+        with self._lock:
+            for key in [key for key in self._loading if db_name is None or key[0] == db_name]:
+                self._invalidate_loading(key)
+            if db_name is None:
+                self.invalidations += len(self._rows)
+                self._rows.clear()
+                return
+            for key in [key for key in self._rows if key[0] == db_name]:
+                del self._rows[key]
+                self.invalidations += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._rows),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+# 게이트웨이, Finder, 함수 기반 스크립트가 공유하는 캐시
+member_cache = MemberCache()
+
+# 멤버 쓰기 이벤트가 발행되면 캐시 무효화
+@subscribe
+def _invalidate_on_write(event):
+    if event.table != "member":
+        return
+    if event.key is None:
+        member_cache.clear(event.db_name)
+    else:
+        member_cache.invalidate(event.db_name, event.key)
@@ -0,0 +1,146 @@
+import sqlite3
+from datetime import datetime
+
+from connection_pool import get_connection
+from write_events import publish_member
+from write_queue import queued_write
+
+# 멤버 정책 엔진
+# Member.validate() 와 main() 의 강퇴 조건을 선언형 규칙으로 만들고,
+# 멤버 한 명씩 처리하는 대신 규칙마다 UPDATE/DELETE 한 문장으로 전체 멤버에 적용
+
+# 규칙 기본 클래스
+#   where  : 대상 멤버 조건 (SQL)
+#   params : 조건 파라미터
+#   action : "update" 면 set_clause 로 수정, "delete" 면 삭제
+class Rule:
+    action = "update"
+    set_clause = None
+
+    def where(self):
+        raise NotImplementedError
+
+    def params(self):
+        return ()
+
+    def set_params(self):
+        return ()
+
+    @property
+    def name(self):
+        return type(self).__name__
+
+# 점수를 [minimum, maximum] 범위로 보정
+class ClampScore(Rule):
+    def __init__(self, minimum=0, maximum=15):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.set_clause = f"score = MIN(MAX(score, {int(minimum)}), {int(maximum)})"
+
+    def where(self):
+        return "score < ? OR score > ?"
+
+    def params(self):
+        return (self.minimum, self.maximum)
+
+# 음수 last_login 을 0 으로 보정
+class ClampLastLogin(Rule):
+    set_clause = "last_login = 0"
+
+    def where(self):
+        return "last_login < 0"
+
+# 미래 가입일을 오늘로 보정 (join_date 는 "%Y%m%d" 문자열)
+class FixFutureJoinDate(Rule):
+    set_clause = "join_date = ?"
+
+    def __init__(self, today=None):
+        # today 가 없으면 적용 시점의 날짜를 사용
+        self.today = today
+
+    def _today(self):
+        return (self.today or datetime.now()).strftime("%Y%m%d")
+
+    def where(self):
+        return "join_date > ?"
+
+    def params(self):
+        return (self._today(),)
+
+    def set_params(self):
+        return (self._today(),)
+
+# last_login 이 days 일 이상인 멤버 강퇴
+class KickInactive(Rule):
+    action = "delete"
+
+    def __init__(self, days=5):
+        self.days = days
+
+    def where(self):
+        return "last_login >= ?"
+
+    def params(self):
+        return (self.days,)
+
+# 점수가 threshold 이하인 멤버 강퇴
+class KickLowScore(Rule):
+    action = "delete"
+
+    def __init__(self, threshold=0):
+        self.threshold = threshold
+
+    def where(self):
+        return "score <= ?"
+
+    def params(self):
+        return (self.threshold,)
+
+# 기본 정책 (Member.validate() + main() 의 강퇴 조건)
+DEFAULT_RULES = (ClampScore(0, 15), ClampLastLogin(), FixFutureJoinDate(), KickLowScore(0), KickInactive(5))
+
+@queued_write
+def apply_rules(conn, rules=DEFAULT_RULES, dry_run=False):
+    """규칙을 순서대로 한 트랜잭션에서 적용, {규칙 이름: [대상 nick_name]} 를 반환
+    dry_run 이면 같은 결과를 보고하되 변경은 되돌림"""
+    cursor = conn.cursor()
+    report = {}
+    try:
+        if not conn.in_transaction:
+            cursor.execute("BEGIN IMMEDIATE")
+
+        for rule in rules:
+            where_clause = rule.where()
+            cursor.execute(f"SELECT nick_name FROM member WHERE {where_clause} ORDER BY nick_name", rule.params())
+            report[rule.name] = [row[0] for row in cursor.fetchall()]
+
+            if not report[rule.name]:
+                continue
+            if rule.action == "delete":
+                cursor.execute(f"DELETE FROM member WHERE {where_clause}", rule.params())
+            else:
+                cursor.execute(f"UPDATE member SET {rule.set_clause} WHERE {where_clause}", rule.set_params() + rule.params())
+
+        # dry_run 도 실제로 적용해 본 뒤 되돌림 (앞 규칙의 결과가 뒤 규칙의 대상에 반영되도록)
+        if dry_run:
+            conn.rollback()
+        else:
+            if any(report.values()):
+                publish_member(getattr(conn, "db_name", None), "bulk")
+            conn.commit()
+    except sqlite3.Error:
+        conn.rollback()
+        raise
+    return report
+
+def run_policy(db_name="MemberManagement.db", rules=DEFAULT_RULES, dry_run=False):
+    with get_connection(db_name) as conn:
+        return apply_rules(conn, rules, dry_run)
+
+def main():
+    report = run_policy(dry_run=True)
+    for rule_name, nick_names in report.items():
+        print(f"{rule_name}: {len(nick_names)} members {nick_names[:10]}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+import sqlite3
+import sys
+
+from connection_pool import get_connection
+from schema_cache import table_exists, invalidate_schema
+import content_store
+
+# 멤버 통계 요약 테이블 (materialized view)
+#   member_period_summary  : (nick_name, content_name, start_date) 별 합계
+#   member_content_summary : (nick_name, content_name) 별 합계
+#   member_summary         : nick_name 별 합계
+# 컨텐츠 레코드 테이블(기간별 테이블 또는 통합 저장소)의 트리거가 같은 트랜잭션 안에서 차이만 반영하므로
+# 게이트웨이, 함수 기반 스크립트, 일괄 처리, 호환 뷰 등 어느 쓰기 경로로 바뀌어도 요약이 맞게 유지됨
+# 대시보드 조회는 요약 테이블 한 행 조회로 끝남
+#
+#   python member_summary.py rebuild        # 전체 재계산 (트리거도 다시 설치)
+#   python member_summary.py install        # 트리거가 없는 새 기간 테이블만 설치 + 반영
+#   python member_summary.py check          # 원본과 비교
+#   python member_summary.py show User_0001
+
+PERIOD_SUMMARY_TABLE = "member_period_summary"
+CONTENT_SUMMARY_TABLE = "member_content_summary"
+SUMMARY_TABLE = "member_summary"
+
+# 기간 시작일 + (마지막 참여 day - 1) 일 = 마지막 활동일 ("%Y%m%d")
+LAST_ACTIVE = ("strftime('%Y%m%d', substr(start_date, 1, 4) || '-' || substr(start_date, 5, 2) || '-' || substr(start_date, 7, 2), "
+               "'+' || (last_day - 1) || ' days')")
+
+def create_tables(conn):
+    cursor = conn.cursor()
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {PERIOD_SUMMARY_TABLE} (
+            nick_name TEXT NOT NULL,
+            content_name TEXT NOT NULL,
+            start_date TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            participation_count INTEGER NOT NULL,
+            records INTEGER NOT NULL,
+            last_day INTEGER,
+            PRIMARY KEY (nick_name, content_name, start_date)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {CONTENT_SUMMARY_TABLE} (
+            nick_name TEXT NOT NULL,
+            content_name TEXT NOT NULL,
+            score INTEGER NOT NULL,
+            participation_count INTEGER NOT NULL,
+            records INTEGER NOT NULL,
+            periods INTEGER NOT NULL,
+            last_active TEXT,
+            PRIMARY KEY (nick_name, content_name)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {SUMMARY_TABLE} (
+            nick_name TEXT PRIMARY KEY,
+            score INTEGER NOT NULL,
+            participation_count INTEGER NOT NULL,
+            records INTEGER NOT NULL,
+            periods INTEGER NOT NULL,
+            last_active TEXT
+        )
+    """)
+
+def is_installed(conn):
+    db_name = getattr(conn, "db_name", None)
+    if db_name is not None:
+        return table_exists(db_name, SUMMARY_TABLE, conn)
+
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?;", (SUMMARY_TABLE,))
+    return cursor.fetchone() is not None
+
+# 원본 테이블 [(source, content_name, start_date)]
+# 통합 저장소면 content_record 하나 (content_name, start_date 는 행마다 다르므로 None)
+def find_sources(conn):
+    if content_store.is_enabled(conn):
+        return [(content_store.CONTENT_RECORD_TABLE, None, None)]
+    return content_store.find_period_tables(conn)
+
+# 기간별 집계 SELECT (member_period_summary 컬럼 순서)
+PERIOD_AGGREGATES = "SUM(COALESCE(score, 0)), SUM(COALESCE(participation_count, 0)), COUNT(*), MAX(day)"
+
+def _period_rows_sql(source, content_name, start_date):
+    if content_name is None:
+        return (f"SELECT nick_name, content_name, start_date, {PERIOD_AGGREGATES} FROM {source} "
+                "GROUP BY content_name, start_date, nick_name")
+    # content_name, start_date 는 이름 규칙으로 검증된 값
+    return f"SELECT nick_name, '{content_name}', '{start_date}', {PERIOD_AGGREGATES} FROM {source} GROUP BY nick_name"
+
+def _content_rows_sql(where=""):
+    return (f"SELECT nick_name, content_name, SUM(score), SUM(participation_count), SUM(records), COUNT(*), MAX({LAST_ACTIVE}) "
+            f"FROM {PERIOD_SUMMARY_TABLE} {where}GROUP BY nick_name, content_name")
+
+def _member_rows_sql(where=""):
+    return (f"SELECT nick_name, SUM(score), SUM(participation_count), SUM(records), COUNT(*), MAX({LAST_ACTIVE}) "
+            f"FROM {PERIOD_SUMMARY_TABLE} {where}GROUP BY nick_name")
+
+# 원본 테이블 트리거 : 행 하나의 변경을 member_period_summary 에 더하거나 뺌
+def _source_trigger_sql(source, content_name, start_date):
+    if content_name is None:
+        new_period = "NEW.content_name, NEW.start_date"
+        old_match = "content_name = OLD.content_name AND start_date = OLD.start_date"
+        source_match = "content_name = OLD.content_name AND start_date = OLD.start_date AND "
+    else:
+        new_period = f"'{content_name}', '{start_date}'"
+        old_match = f"content_name = '{content_name}' AND start_date = '{start_date}'"
+        source_match = ""
+
+    add_new = f"""
+        INSERT INTO {PERIOD_SUMMARY_TABLE} (nick_name, content_name, start_date, score, participation_count, records, last_day)
+        VALUES (NEW.nick_name, {new_period}, COALESCE(NEW.score, 0), COALESCE(NEW.participation_count, 0), 1, NEW.day)
+        ON CONFLICT(nick_name, content_name, start_date) DO UPDATE SET
+            score = score + excluded.score,
+            participation_count = participation_count + excluded.participation_count,
+            records = records + 1,
+            last_day = MAX(COALESCE(last_day, excluded.last_day), COALESCE(excluded.last_day, last_day));
+    """
+    remove_old = f"""
+        UPDATE {PERIOD_SUMMARY_TABLE} SET
+            score = score - COALESCE(OLD.score, 0),
+            participation_count = participation_count - COALESCE(OLD.participation_count, 0),
+            records = records - 1,
+            last_day = (SELECT MAX(day) FROM {source} WHERE {source_match}nick_name = OLD.nick_name)
+        WHERE nick_name = OLD.nick_name AND {old_match};
+        DELETE FROM {PERIOD_SUMMARY_TABLE} WHERE nick_name = OLD.nick_name AND {old_match} AND records <= 0;
+    """
+    return [
+        f"CREATE TRIGGER {source}_summary_insert AFTER INSERT ON {source} BEGIN {add_new} END",
+        f"CREATE TRIGGER {source}_summary_delete AFTER DELETE ON {source} BEGIN {remove_old} END",
+        # 수정은 이전 행을 빼고 새 행을 더함
+        f"CREATE TRIGGER {source}_summary_update AFTER UPDATE ON {source} BEGIN {remove_old} {add_new} END",
+    ]
+
+def _install_source(cursor, source, content_name, start_date):
+    for op in ("insert", "update", "delete"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS {source}_summary_{op}")
+    for sql in _source_trigger_sql(source, content_name, start_date):
+        cursor.execute(sql)
+    if content_name is not None:
+        # 삭제 시 마지막 참여 day 를 다시 구할 때 사용
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {source}_nick_name ON {source} (nick_name, day)")
+
+# member_period_summary 트리거 : 바뀐 멤버의 컨텐츠별 / 전체 합계를 그 멤버의 기간 행들로 다시 계산
+def _rollup_trigger_sql():
+    statements = []
+    for op, row in (("insert", "NEW"), ("update", "NEW"), ("delete", "OLD")):
+        member = f"WHERE nick_name = {row}.nick_name "
+        member_content = f"WHERE nick_name = {row}.nick_name AND content_name = {row}.content_name "
+        statements.append(f"""
+            CREATE TRIGGER {PERIOD_SUMMARY_TABLE}_{op} AFTER {op.upper()} ON {PERIOD_SUMMARY_TABLE} BEGIN
+                DELETE FROM {CONTENT_SUMMARY_TABLE} {member_content};
+                INSERT INTO {CONTENT_SUMMARY_TABLE} {_content_rows_sql(member_content)};
+                DELETE FROM {SUMMARY_TABLE} {member};
+                INSERT INTO {SUMMARY_TABLE} {_member_rows_sql(member)};
+            END
+        """)
+    return statements
+
+def _drop_rollup_triggers(cursor):
+    for op in ("insert", "update", "delete"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS {PERIOD_SUMMARY_TABLE}_{op}")
+
+def rebuild_with(conn):
+    """요약 테이블을 원본에서 전체 재계산하고 트리거를 다시 설치 (커밋은 호출한 쪽에서)"""
+    create_tables(conn)
+    cursor = conn.cursor()
+
+    # 재계산 중에는 상위 합계 트리거를 끄고 한 번에 채움
+    _drop_rollup_triggers(cursor)
+    cursor.execute(f"DELETE FROM {SUMMARY_TABLE}")
+    cursor.execute(f"DELETE FROM {CONTENT_SUMMARY_TABLE}")
+    cursor.execute(f"DELETE FROM {PERIOD_SUMMARY_TABLE}")
+
+    sources = find_sources(conn)
+    for source, content_name, start_date in sources:
+        _install_source(cursor, source, content_name, start_date)
+        cursor.execute(f"INSERT INTO {PERIOD_SUMMARY_TABLE} {_period_rows_sql(source, content_name, start_date)}")
+
+    cursor.execute(f"INSERT INTO {CONTENT_SUMMARY_TABLE} {_content_rows_sql()}")
+    cursor.execute(f"INSERT INTO {SUMMARY_TABLE} {_member_rows_sql()}")
+    for sql in _rollup_trigger_sql():
+        cursor.execute(sql)
+    return len(sources)
+
+def rebuild(db_name="MemberManagement.db"):
+    """전체 재계산, 요약에 반영한 원본 테이블 수를 반환"""
+    with get_connection(db_name) as conn:
+        try:
+            count = rebuild_with(conn)
+        finally:
+            invalidate_schema(db_name)
+    return count
+
+def _installed_sources(cursor):
+    cursor.execute("SELECT tbl_name FROM sqlite_master WHERE type = 'trigger' AND name = tbl_name || '_summary_insert'")
+    return {row[0] for row in cursor.fetchall()}
+
+def install(db_name="MemberManagement.db"):
+    """요약이 없으면 전체 재계산, 있으면 트리거가 없는 원본 테이블(새 기간)만 설치하고 반영
+    새로 반영한 원본 테이블 목록을 반환"""
+    with get_connection(db_name) as conn:
+        try:
+            if not is_installed(conn):
+                rebuild_with(conn)
+                return [source for source, _, _ in find_sources(conn)]
+
+            cursor = conn.cursor()
+            installed = _installed_sources(cursor)
+            added = []
+            for source, content_name, start_date in find_sources(conn):
+                if source in installed:
+                    continue
+                if content_name is None:
+                    # 통합 저장소로 바뀐 경우는 전체 재계산
+                    rebuild_with(conn)
+                    return [source]
+                cursor.execute(f"DELETE FROM {PERIOD_SUMMARY_TABLE} WHERE content_name = ? AND start_date = ?", (content_name, start_date))
+                _install_source(cursor, source, content_name, start_date)
+                cursor.execute(f"INSERT INTO {PERIOD_SUMMARY_TABLE} {_period_rows_sql(source, content_name, start_date)}")
+                added.append(source)
+            return added
+        finally:
+            invalidate_schema(db_name)
+
+def check(db_name="MemberManagement.db", limit=20):
+    """원본에서 다시 계산한 값과 요약 테이블을 비교
+    {"missing_triggers": [...], "mismatches": {테이블: [다른 행 (최대 limit 개)]}} (모두 비어 있으면 일치)"""
+    with get_connection(db_name) as conn:
+        if not is_installed(conn):
+            print(f"Error: '{SUMMARY_TABLE}' table does not exsist.")
+            return None
+
+        cursor = conn.cursor()
+        sources = find_sources(conn)
+        installed = _installed_sources(cursor)
+
+        cursor.execute(f"CREATE TEMP TABLE expected_period_summary AS SELECT * FROM {PERIOD_SUMMARY_TABLE} WHERE 0")
+        try:
+            for source, content_name, start_date in sources:
+                cursor.execute(f"INSERT INTO expected_period_summary {_period_rows_sql(source, content_name, start_date)}")
+
+            expected_period = "SELECT * FROM expected_period_summary"
+            expected_content = _content_rows_sql().replace(f"FROM {PERIOD_SUMMARY_TABLE}", "FROM expected_period_summary")
+            expected_member = _member_rows_sql().replace(f"FROM {PERIOD_SUMMARY_TABLE}", "FROM expected_period_summary")
+
+            mismatches = {}
+            for table_name, expected in ((PERIOD_SUMMARY_TABLE, expected_period),
+                                         (CONTENT_SUMMARY_TABLE, expected_content),
+                                         (SUMMARY_TABLE, expected_member)):
+                # 양쪽 차집합 (기대값에만 있는 행은 "expected", 요약에만 있는 행은 "actual")
+                cursor.execute(f"SELECT 'expected', * FROM ({expected} EXCEPT SELECT * FROM {table_name}) "
+                               f"UNION ALL SELECT 'actual', * FROM (SELECT * FROM {table_name} EXCEPT {expected}) LIMIT ?", (limit,))
+                rows = cursor.fetchall()
+                if rows:
+                    mismatches[table_name] = rows
+        finally:
+            cursor.execute("DROP TABLE temp.expected_period_summary")
+
+    return {
+        "missing_triggers": [source for source, _, _ in sources if source not in installed],
+        "mismatches": mismatches,
+    }
+
+# 대시보드 조회 (한 행)
+def member_stats(db_name, nick_name):
+    """{"score", "participation_count", "records", "periods", "last_active"} 또는 None"""
+    with get_connection(db_name) as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT score, participation_count, records, periods, last_active FROM {SUMMARY_TABLE} WHERE nick_name = ?",
+                       (nick_name,))
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    return dict(zip(("score", "participation_count", "records", "periods", "last_active"), row))
+
+def member_content_stats(db_name, nick_name, content_name):
+    with get_connection(db_name) as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT score, participation_count, records, periods, last_active FROM {CONTENT_SUMMARY_TABLE} "
+                       "WHERE nick_name = ? AND content_name = ?", (nick_name, content_name))
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    return dict(zip(("score", "participation_count", "records", "periods", "last_active"), row))
+
+def member_period_stats(db_name, nick_name, content_name, start_date):
+    with get_connection(db_name) as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT score, participation_count, records, last_day FROM {PERIOD_SUMMARY_TABLE} "
+                       "WHERE nick_name = ? AND content_name = ? AND start_date = ?", (nick_name, content_name, start_date))
+        row = cursor.fetchone()
+    if row is None:
+        return None
+    return dict(zip(("score", "participation_count", "records", "last_day"), row))
+
+def main():
+    db_name = "MemberManagement.db"
+    command = sys.argv[1] if len(sys.argv) > 1 else "check"
+
+    try:
+        if command == "rebuild":
+            print(f"Summary rebuilt from {rebuild(db_name)} content tables.")
+        elif command == "install":
+            print(f"Summary installed for: {install(db_name)}")
+        elif command == "check":
+            result = check(db_name)
+            if result is not None:
+                if not result["missing_triggers"] and not result["mismatches"]:
+                    print("Summary is consistent.")
+                for source in result["missing_triggers"]:
+                    print(f"Missing summary triggers on '{source}' (run install).")
+                for table_name, rows in result["mismatches"].items():
+                    print(f"{table_name}: {len(rows)} mismatched rows {rows}")
+        elif command == "show":
+            print(member_stats(db_name, sys.argv[2]))
+        else:
+            print(f"Error: unknown command '{command}'.")
+    except sqlite3.Error as e:
+        print(f"Error: {e}")
+
+if __name__ == "__main__":
+    main()
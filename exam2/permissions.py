@@ -0,0 +1,239 @@
+import threading
+from enum import Enum
+
+from connection_pool import get_connection
+from write_events import subscribe, publish_member
+from write_queue import queued_write
+
+# 권한 (모든 모듈이 이 정의 하나를 사용, 값이 작을수록 높은 권한)
+class Grant(Enum):
+    ADMIN = 0
+    SUB_ADMIN = 1
+    USER = 2
+
+GRANT_BY_VALUE = {grant.value: grant for grant in Grant}
+
+def grant_value(grant):
+    """Grant 또는 DB 값(int) 을 DB 값으로"""
+    return grant.value if isinstance(grant, Enum) else grant
+
+# 빈 슬롯 표시
+_NO_GRANT = 255
+
+# 멤버별 권한 표 (DB 하나)
+#   nick_name 마다 슬롯 번호를 주고, 슬롯별 권한 값을 bytearray 에 1바이트씩 저장
+#   권한별로 해당 슬롯 비트를 켠 비트마스크를 함께 유지해 "ADMIN 전체" 같은 조회를 DB 없이 처리
+class GrantTable:
+    def __init__(self):
+        self._slots = {}
+        self._names = []
+        self._grants = bytearray()
+        self._masks = [0] * len(Grant)
+        self._free = []
+        # members() 결과 (권한 조합별, 표가 바뀌면 비움)
+        self._members = {}
+
+    def __len__(self):
+        return len(self._slots)
+
+    def load(self, rows):
+        """rows: (nick_name, grant) 의 iterable
+        슬롯을 모두 채운 뒤 마스크를 한 번에 만듦 (set 을 반복하면 큰 정수 마스크를 행마다 다시 만들어 O(n^2))"""
+        for nick_name, grant in rows:
+            grant = grant_value(grant)
+            if grant not in GRANT_BY_VALUE:
+                self.remove(nick_name)
+                continue
+            slot = self._slots.get(nick_name)
+            if slot is None:
+                self._allocate(nick_name, grant)
+            else:
+                self._grants[slot] = grant
+        self._rebuild_masks()
+        self._members.clear()
+
+    def _allocate(self, nick_name, grant):
+        if self._free:
+            slot = self._free.pop()
+            self._names[slot] = nick_name
+            self._grants[slot] = grant
+        else:
+            slot = len(self._names)
+            self._names.append(nick_name)
+            self._grants.append(grant)
+        self._slots[nick_name] = slot
+        return slot
+
+    def _rebuild_masks(self):
+        # 권한별 비트맵을 바이트 단위로 채운 뒤 정수로 한 번에 변환 (O(n))
+        bitmaps = [bytearray((len(self._grants) + 7) // 8) for _ in Grant]
+        for slot, grant in enumerate(self._grants):
+            if grant != _NO_GRANT:
+                bitmaps[grant][slot >> 3] |= 1 << (slot & 7)
+        self._masks = [int.from_bytes(bitmap, "little") for bitmap in bitmaps]
+
+    def get(self, nick_name):
+        """권한 값 (없는 멤버면 None)"""
+        slot = self._slots.get(nick_name)
+        return None if slot is None else self._grants[slot]
+
+    def set(self, nick_name, grant):
+        grant = grant_value(grant)
+        if grant not in GRANT_BY_VALUE:
+            # 알 수 없는 값은 권한 없음으로 취급
+            self.remove(nick_name)
+            return
+
+        slot = self._slots.get(nick_name)
+        if slot is None:
+            slot = self._allocate(nick_name, grant)
+        else:
+            old = self._grants[slot]
+            if old == grant:
+                return
+            self._masks[old] &= ~(1 << slot)
+            self._grants[slot] = grant
+        self._masks[grant] |= 1 << slot
+        self._members.clear()
+
+    def remove(self, nick_name):
+        slot = self._slots.pop(nick_name, None)
+        if slot is None:
+            return
+        self._members.clear()
+        self._masks[self._grants[slot]] &= ~(1 << slot)
+        self._grants[slot] = _NO_GRANT
+        self._names[slot] = None
+        self._free.append(slot)
+
+    def members(self, grants):
+        """grants 중 하나를 가진 nick_name 리스트 (슬롯 순서)"""
+        key = frozenset(grant_value(grant) for grant in grants)
+        members = self._members.get(key)
+        if members is None:
+            mask = 0
+            for value in key:
+                mask |= self._masks[value]
+            # 켜진 비트 위치를 문자열 검색으로 찾음 (낮은 비트부터)
+            bits = bin(mask)[:1:-1]
+            names = self._names
+            members = []
+            slot = bits.find("1")
+            while slot >= 0:
+                members.append(names[slot])
+                slot = bits.find("1", slot + 1)
+            self._members[key] = members
+        return list(members)
+
+    def count(self, grant):
+        return self._masks[grant_value(grant)].bit_count()
+
+@queued_write
+def _update_grant(conn, nick_name, grant):
+    cursor = conn.cursor()
+    cursor.execute("UPDATE member SET grant = ? WHERE nick_name = ?", (grant, nick_name))
+    updated = cursor.rowcount
+    if updated:
+        publish_member(getattr(conn, "db_name", None), "update", nick_name, {"grant": grant})
+    conn.commit()
+    return updated
+
+# 권한 조회 / 변경
+# DB 별 GrantTable 을 처음 사용할 때(또는 load 로 시작할 때) 한 번에 읽어 두고
+# 쓰기 이벤트를 따라 갱신하므로 권한 확인은 DB 를 거치지 않음
+class PermissionService:
+    def __init__(self):
+        self._tables = {}
+        self._lock = threading.Lock()
+
+        # 통계
+        self.loads = 0
+        self.write_throughs = 0
+        self.incremental_updates = 0
+
+    def load(self, db_name="MemberManagement.db"):
+        """member 테이블의 권한을 한 번에 읽어 표를 새로 만듦 (시작 시 호출)"""
+        table = GrantTable()
+        with get_connection(db_name) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT nick_name, grant FROM member")
+            table.load(cursor)
+        with self._lock:
+            self._tables[db_name] = table
+            self.loads += 1
+        return table
+
+    def _table(self, db_name):
+        table = self._tables.get(db_name)
+        if table is None:
+            table = self.load(db_name)
+        return table
+
+    def grant_of(self, db_name, nick_name):
+        """멤버의 Grant (없는 멤버면 None)"""
+        return GRANT_BY_VALUE.get(self._table(db_name).get(nick_name))
+
+    def has_grant(self, db_name, nick_name, grant):
+        """grant 이상의 권한이 있는지 (ADMIN 은 SUB_ADMIN 권한도 가짐)"""
+        value = self._table(db_name).get(nick_name)
+        return value is not None and value <= grant_value(grant)
+
+    def members_with(self, db_name, *grants):
+        """grants 중 하나를 가진 nick_name 리스트 (예: members_with(db, Grant.ADMIN, Grant.SUB_ADMIN))"""
+        return self._table(db_name).members(grants)
+
+    def count(self, db_name, grant):
+        return self._table(db_name).count(grant)
+
+    def change_grant(self, db_name, nick_name, grant):
+        """DB 와 권한 표를 함께 변경 (없는 멤버면 False)"""
+        value = grant_value(grant)
+        if value not in GRANT_BY_VALUE:
+            raise ValueError(f"unknown grant '{grant}'.")
+
+        with get_connection(db_name) as conn:
+            updated = _update_grant(conn, nick_name, value)
+        if not updated:
+            print(f"Error: member '{nick_name}' does not exsist.")
+            return False
+
+        table = self._tables.get(db_name)
+        if table is not None:
+            with self._lock:
+                table.set(nick_name, value)
+            self.write_throughs += 1
+        return True
+
+    def invalidate(self, db_name=None):
+        """권한 표를 버림 (다음 조회 때 DB 에서 다시 읽음)"""
+        with self._lock:
+            for key in [key for key in self._tables if db_name is None or key == db_name]:
+                del self._tables[key]
+
+    def on_write(self, event):
+        # 다른 쓰기 경로(게이트웨이, 함수 기반 스크립트, Unit of Work, 정책 실행)의 변경도 반영
+        if event.table != "member":
+            return
+        table = self._tables.get(event.db_name)
+        if table is None:
+            return
+        with self._lock:
+            if event.op == "bulk":
+                self._tables.pop(event.db_name, None)
+            elif event.op == "delete":
+                table.remove(event.key)
+                self.incremental_updates += 1
+            elif event.values and "grant" in event.values:
+                table.set(event.key, event.values["grant"])
+                self.incremental_updates += 1
+
+    def stats(self):
+        return {
+            "tables": {db_name: len(table) for db_name, table in self._tables.items()},
+            "loads": self.loads,
+            "write_throughs": self.write_throughs,
+            "incremental_updates": self.incremental_updates,
+        }
+
+permissions = PermissionService()
+subscribe(permissions.on_write)
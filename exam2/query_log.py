@@ -0,0 +1,354 @@
+import re
+import sqlite3
+import sys
+import threading
+import time
+from collections import deque
+
+# 쿼리 계측 + 느린 쿼리 로그
+#
+#   import query_log
+#   query_log.enable(slow_threshold=0.05)
+#   ...
+#   query_log.slow_queries()      # 최근 느린 쿼리 (링 버퍼)
+#   query_log.stats()             # 문장별 통계 + 지연 시간 히스토그램
+#   query_log.prometheus_text()   # Prometheus text 형식
+#
+# 풀 커넥션(PooledConnection)과 활성화 이후 sqlite3.connect() 로 연 커넥션(exam1 등)의
+# cursor.execute / executemany 를 측정
+# 비활성 상태에서는 일반 sqlite3 커서를 그대로 사용하므로 추가 비용이 플래그 확인 하나뿐
+
+# 지연 시간 히스토그램 구간 (초)
+BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# 실행 계획을 볼 수 있는 문장
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "REPLACE")
+
+# 호출 위치를 찾을 때 건너뛰는 파일 (계측/커넥션 래퍼)
+_SKIP_FILES = {__file__}
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+def statement_shape(sql):
+    """리터럴과 공백을 정규화한 문장 모양 (통계 키)"""
+    shape = _STRING_LITERAL.sub("?", sql)
+    shape = _NUMBER_LITERAL.sub("?", shape)
+    shape = _WHITESPACE.sub(" ", shape).strip()
+    return _PLACEHOLDER_LIST.sub("?, ...", shape)
+
+def skip_caller_file(path):
+    """이 파일 안의 함수는 호출 위치로 보지 않음 (커넥션 래퍼 모듈에서 등록)"""
+    _SKIP_FILES.add(path)
+
+def _caller():
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_code.co_filename in _SKIP_FILES:
+        frame = frame.f_back
+    if frame is None:
+        return None
+    return f"{frame.f_globals.get('__name__', '?')}.{frame.f_code.co_qualname}"
+
+# 쿼리 한 번의 기록
+class QueryRecord:
+    __slots__ = ("started_at", "statement", "sql", "params", "duration", "rows", "wait_time", "caller", "error", "plan")
+
+    def __init__(self, statement, sql, params, duration, rows, wait_time, caller, error):
+        self.started_at = time.time()
+        self.statement = statement
+        self.sql = sql
+        self.params = params
+        self.duration = duration
+        self.rows = rows
+        self.wait_time = wait_time
+        self.caller = caller
+        self.error = error
+        self.plan = None
+
+    def as_dict(self):
+        return {
+            "started_at": self.started_at,
+            "statement": self.statement,
+            "sql": self.sql,
+            "params": self.params,
+            "duration_ms": self.duration * 1e3,
+            "rows": self.rows,
+            "wait_ms": self.wait_time * 1e3,
+            "caller": self.caller,
+            "error": self.error,
+            "plan": self.plan,
+        }
+
+# 문장 모양별 통계
+class StatementStats:
+    __slots__ = ("count", "errors", "rows", "total", "max", "buckets", "callers")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.rows = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.callers = set()
+
+    def observe(self, duration, caller, failed):
+        self.count += 1
+        self.total += duration
+        if duration > self.max:
+            self.max = duration
+        for i, bound in enumerate(BUCKETS):
+            if duration <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+        if failed:
+            self.errors += 1
+        if caller is not None:
+            self.callers.add(caller)
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "rows": self.rows,
+            "total_ms": self.total * 1e3,
+            "mean_ms": self.total / self.count * 1e3 if self.count else 0.0,
+            "max_ms": self.max * 1e3,
+            "buckets": dict(zip([str(bound) for bound in BUCKETS] + ["+Inf"], self.buckets)),
+            "callers": sorted(self.callers),
+        }
+
+class QueryLog:
+    def __init__(self):
+        self.enabled = False
+        self.slow_threshold = 0.1
+        self.redact_params = True
+        self.explain_slow = True
+
+        self._slow = deque(maxlen=100)
+        self._statements = {}
+        self._lock = threading.Lock()
+
+        # 통계
+        self.queries = 0
+        self.slow_count = 0
+
+    def configure(self, slow_threshold=0.1, capacity=100, redact_params=True, explain_slow=True):
+        with self._lock:
+            self.slow_threshold = slow_threshold
+            self.redact_params = redact_params
+            self.explain_slow = explain_slow
+            if capacity != self._slow.maxlen:
+                self._slow = deque(self._slow, maxlen=capacity)
+
+    def observe(self, cursor, sql, params, duration, rows, error, explain):
+        caller = _caller()
+        statement = statement_shape(sql)
+        failed = error is not None
+        record = None
+
+        if duration >= self.slow_threshold or failed:
+            record = QueryRecord(statement, sql, None if self.redact_params else params,
+                                 duration, rows, cursor.wait_time, caller,
+                                 f"{type(error).__name__}: {error}" if failed else None)
+            if explain and not failed and self.explain_slow and duration >= self.slow_threshold:
+                record.plan = _explain(cursor.connection, sql, params)
+
+        with self._lock:
+            self.queries += 1
+            stats = self._statements.get(statement)
+            if stats is None:
+                stats = self._statements[statement] = StatementStats()
+            stats.observe(duration, caller, failed)
+            if rows > 0:
+                stats.rows += rows
+            if record is not None and duration >= self.slow_threshold:
+                self.slow_count += 1
+                self._slow.append(record)
+        return stats, record
+
+    def add_rows(self, observed, rows):
+        stats, record = observed
+        with self._lock:
+            stats.rows += rows
+            if record is not None:
+                record.rows += rows
+
+    def slow_queries(self):
+        with self._lock:
+            return [record.as_dict() for record in self._slow]
+
+    def stats(self):
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "queries": self.queries,
+                "slow_queries": self.slow_count,
+                "slow_threshold_ms": self.slow_threshold * 1e3,
+                "statements": {statement: stats.as_dict() for statement, stats in self._statements.items()},
+            }
+
+    def prometheus_text(self):
+        lines = [
+            "# HELP sqlite_query_duration_seconds SQLite statement latency.",
+            "# TYPE sqlite_query_duration_seconds histogram",
+        ]
+        with self._lock:
+            statements = sorted(self._statements.items())
+            for statement, stats in statements:
+                label = f'statement="{_escape_label(statement)}"'
+                cumulative = 0
+                for bound, count in zip(BUCKETS, stats.buckets):
+                    cumulative += count
+                    lines.append(f'sqlite_query_duration_seconds_bucket{{{label},le="{bound}"}} {cumulative}')
+                lines.append(f'sqlite_query_duration_seconds_bucket{{{label},le="+Inf"}} {stats.count}')
+                lines.append(f"sqlite_query_duration_seconds_sum{{{label}}} {stats.total}")
+                lines.append(f"sqlite_query_duration_seconds_count{{{label}}} {stats.count}")
+
+            lines.append("# HELP sqlite_query_errors_total SQLite statements that raised.")
+            lines.append("# TYPE sqlite_query_errors_total counter")
+            for statement, stats in statements:
+                lines.append(f'sqlite_query_errors_total{{statement="{_escape_label(statement)}"}} {stats.errors}')
+
+            lines.append("# HELP sqlite_query_rows_total Rows returned or changed.")
+            lines.append("# TYPE sqlite_query_rows_total counter")
+            for statement, stats in statements:
+                lines.append(f'sqlite_query_rows_total{{statement="{_escape_label(statement)}"}} {stats.rows}')
+
+            lines.append("# HELP sqlite_slow_queries_total Statements slower than the threshold.")
+            lines.append("# TYPE sqlite_slow_queries_total counter")
+            lines.append(f"sqlite_slow_queries_total {self.slow_count}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._slow.clear()
+            self._statements.clear()
+            self.queries = 0
+            self.slow_count = 0
+
+def _escape_label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _explain(raw, sql, params):
+    if not sql.lstrip().upper().startswith(_EXPLAINABLE):
+        return None
+    try:
+        # 계측하지 않는 일반 커서로 실행
+        cursor = sqlite3.Cursor(raw)
+        cursor.execute("EXPLAIN QUERY PLAN " + sql, params)
+        return [row[3] for row in cursor.fetchall()]
+    except sqlite3.Error as e:
+        return [f"unavailable: {e}"]
+
+query_log = QueryLog()
+
+# 계측 커서 (execute 시간, 반환/변경 행 수, 커넥션 대기 시간, 호출 위치를 기록)
+class InstrumentedCursor(sqlite3.Cursor):
+    wait_time = 0.0
+    _observed = None
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            super().execute(sql, parameters)
+        except Exception as e:
+            query_log.observe(self, sql, parameters, time.perf_counter() - started, 0, e, False)
+            raise
+        duration = time.perf_counter() - started
+        self._observed = query_log.observe(self, sql, parameters, duration, max(self.rowcount, 0), None, True)
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            super().executemany(sql, seq_of_parameters)
+        except Exception as e:
+            query_log.observe(self, sql, None, time.perf_counter() - started, 0, e, False)
+            raise
+        duration = time.perf_counter() - started
+        self._observed = query_log.observe(self, sql, None, duration, max(self.rowcount, 0), None, False)
+        return self
+
+    # SELECT 의 반환 행 수는 가져온 만큼 더함
+    def _fetched(self, rows):
+        if self._observed is not None and rows:
+            query_log.add_rows(self._observed, rows)
+
+    def fetchone(self):
+        row = super().fetchone()
+        if row is not None:
+            self._fetched(1)
+        return row
+
+    def fetchmany(self, size=None):
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(len(rows))
+        return rows
+
+    def fetchall(self):
+        rows = super().fetchall()
+        self._fetched(len(rows))
+        return rows
+
+    def __next__(self):
+        row = super().__next__()
+        self._fetched(1)
+        return row
+
+# 활성화 중 sqlite3.connect() 로 연 커넥션 (exam1 처럼 풀을 쓰지 않는 코드용)
+class InstrumentedConnection(sqlite3.Connection):
+    def cursor(self, factory=None):
+        if factory is None:
+            factory = InstrumentedCursor if query_log.enabled else sqlite3.Cursor
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+_original_connect = None
+
+def _instrumented_connect(*args, **kwargs):
+    kwargs.setdefault("factory", InstrumentedConnection)
+    return _original_connect(*args, **kwargs)
+
+def enable(slow_threshold=0.1, capacity=100, redact_params=True, explain_slow=True):
+    """계측 시작
+    slow_threshold 초 이상 걸린 문장은 느린 쿼리 로그(최근 capacity 개)에 남기고 실행 계획을 기록
+    redact_params 가 False 면 파라미터도 기록"""
+    global _original_connect
+    query_log.configure(slow_threshold, capacity, redact_params, explain_slow)
+    query_log.enabled = True
+    if _original_connect is None:
+        _original_connect = sqlite3.connect
+        sqlite3.connect = _instrumented_connect
+
+def disable():
+    global _original_connect
+    query_log.enabled = False
+    if _original_connect is not None:
+        if sqlite3.connect is _instrumented_connect:
+            sqlite3.connect = _original_connect
+        _original_connect = None
+
+def is_enabled():
+    return query_log.enabled
+
+def slow_queries():
+    return query_log.slow_queries()
+
+def stats():
+    return query_log.stats()
+
+def prometheus_text():
+    return query_log.prometheus_text()
+
+def reset():
+    query_log.reset()
@@ -0,0 +1,233 @@
+import os
+import sqlite3
+import threading
+import time
+
+from connection_pool import close_pool, configure_pool, read_only_uri
+from schema_cache import invalidate_schema
+
+# 분석용 읽기 전용 복제본
+# sqlite 온라인 백업 API 로 주 DB 를 주기적으로 복사해 두고, 오래 걸리는 읽기(전체 조회, 스트리밍, 시즌 집계)를
+# 복제본으로 보내 주 DB 의 쓰기(update_score, create_member 등)를 막지 않도록 함
+#   - 복제본이 max_staleness 초보다 오래되었으면 주 DB 로 읽음 (그리고 즉시 갱신을 요청)
+#   - 쓰기는 항상 주 DB 로
+#   - 갱신할 때마다 새 파일(세대)에 복사한 뒤 교체하므로 읽는 중인 커넥션은 이전 세대를 계속 읽음
+#   - 세대 파일은 mode=ro 커넥션 풀로 열어 복제본에 쓰지 못하게 함
+#
+#   enable_replica("MemberManagement.db", max_staleness=30.0)
+#   with get_connection(read_db_name("MemberManagement.db")) as conn: ...
+
+class ReadReplica:
+    def __init__(self, db_name="MemberManagement.db", max_staleness=30.0, refresh_interval=None,
+                 replica_dir=None, pages_per_step=1024, step_sleep=0.001):
+        self.db_name = db_name
+        self.max_staleness = max_staleness
+        # 기본 갱신 주기는 허용 지연의 절반 (갱신 중에도 예산 안에 머물도록)
+        self.refresh_interval = max_staleness / 2 if refresh_interval is None else refresh_interval
+        self.pages_per_step = pages_per_step
+        self.step_sleep = step_sleep
+
+        base = os.path.abspath(db_name)
+        self._prefix = os.path.join(replica_dir or os.path.dirname(base), os.path.basename(base) + ".replica")
+
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._path = None
+        self._previous_path = None
+        self._snapshot_at = None
+        self._generation = 0
+        self._retired = []
+
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread = None
+
+        # 통계
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.last_refresh_seconds = 0.0
+        self.total_refresh_seconds = 0.0
+        self.pages_copied = 0
+        self.replica_reads = 0
+        self.primary_reads = 0
+
+    # 갱신
+    def refresh(self):
+        """주 DB 를 새 세대 파일로 복사하고 교체, 복사한 시점(주 DB 기준)을 반환"""
+        with self._refresh_lock:
+            started = time.monotonic()
+            self._generation += 1
+            path = f"{self._prefix}.{self._generation}"
+            snapshot_at = self._copy(path)
+            # 세대 파일은 읽기 전용 커넥션으로만 읽음
+            configure_pool(path, read_only=True)
+            elapsed = time.monotonic() - started
+
+            with self._lock:
+                # 직전 세대는 route() 로 이미 받아 간 읽기가 있을 수 있으므로 한 번 더 남겨 두고, 그 이전 세대를 정리
+                old_path = self._previous_path
+                self._previous_path = self._path
+                self._path = path
+                self._snapshot_at = snapshot_at
+                self.refreshes += 1
+                self.last_refresh_seconds = elapsed
+                self.total_refresh_seconds += elapsed
+
+            if old_path is not None:
+                self._retire(old_path)
+            return snapshot_at
+
+    def _copy(self, path):
+        for suffix in ("", "-journal", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+
+        source = sqlite3.connect(read_only_uri(self.db_name), uri=True)
+        target = sqlite3.connect(path)
+        try:
+            (journal_mode,) = source.execute("PRAGMA journal_mode").fetchone()
+            if journal_mode.lower() == "wal":
+                # WAL : 읽기 트랜잭션의 스냅샷을 한 번에 복사 (쓰기를 막지 않고, 복사 중 변경으로 재시작되지도 않음)
+                source.execute("BEGIN")
+                source.execute("SELECT count(*) FROM sqlite_master").fetchone()
+                snapshot_at = time.monotonic()
+                source.backup(target, progress=self._count_pages)
+                source.execute("COMMIT")
+            else:
+                # 롤백 저널 : 조금씩 나눠 복사하고 사이사이 잠금을 풀어 쓰기가 진행되도록 함
+                # (복사 중 주 DB 가 바뀌면 백업 API 가 처음부터 다시 복사하므로 시작 시각을 기준으로 함)
+                snapshot_at = time.monotonic()
+                source.backup(target, pages=self.pages_per_step, progress=self._count_pages, sleep=self.step_sleep)
+            # 복사본은 주 DB 의 WAL 설정을 그대로 받으므로 롤백 저널로 바꿈
+            # (WAL 이면 읽기 전용 커넥션이 -wal / -shm 파일을 만들어 세대 파일을 지워도 남음)
+            target.execute("PRAGMA journal_mode = DELETE").fetchall()
+        finally:
+            target.close()
+            source.close()
+        return snapshot_at
+
+    def _count_pages(self, status, remaining, total):
+        if remaining == 0:
+            self.pages_copied += total
+
+    def _retire(self, path):
+        # 이전 세대의 풀을 닫고 파일 삭제 (읽는 중인 커넥션은 반환 시점에 닫히고, 삭제된 파일도 계속 읽을 수 있음)
+        # 세대마다 경로가 다르므로 스키마 캐시 항목도 함께 지움 (남겨 두면 갱신할 때마다 쌓임)
+        close_pool(path)
+        invalidate_schema(path)
+        self._retired.append(path)
+        for retired in list(self._retired):
+            try:
+                if os.path.exists(retired):
+                    os.remove(retired)
+                self._retired.remove(retired)
+            except OSError:
+                # 열려 있어 지울 수 없는 경우(Windows) 다음 갱신 때 다시 시도
+                pass
+
+    # 라우팅
+    def lag(self):
+        """복제본이 주 DB 보다 뒤처진 시간(초), 아직 복사하지 않았으면 None"""
+        snapshot_at = self._snapshot_at
+        if snapshot_at is None:
+            return None
+        return time.monotonic() - snapshot_at
+
+    def route(self, max_staleness=None):
+        """읽기에 사용할 DB 이름 (허용 지연 안이면 복제본, 아니면 주 DB)"""
+        budget = self.max_staleness if max_staleness is None else max_staleness
+        with self._lock:
+            path = self._path
+            fresh = path is not None and time.monotonic() - self._snapshot_at <= budget
+            if fresh:
+                self.replica_reads += 1
+            else:
+                self.primary_reads += 1
+        if not fresh:
+            # 오래된 복제본은 스케줄러가 바로 갱신하도록 깨움
+            self._wakeup.set()
+            return self.db_name
+        return path
+
+    # 갱신 스케줄러
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name=f"read-replica-{self.db_name}", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self.refresh()
+            except sqlite3.Error as e:
+                self.refresh_failures += 1
+                print(f"Error: replica refresh for '{self.db_name}' failed: {e}")
+            self._wakeup.wait(self.refresh_interval)
+            self._wakeup.clear()
+
+    def close(self):
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            paths = (self._previous_path, self._path)
+            self._path = self._previous_path = None
+            self._snapshot_at = None
+        for path in paths:
+            if path is not None:
+                self._retire(path)
+
+    def stats(self):
+        with self._lock:
+            reads = self.replica_reads + self.primary_reads
+            return {
+                "db_name": self.db_name,
+                "replica": self._path,
+                "generation": self._generation,
+                "lag_seconds": self.lag(),
+                "max_staleness": self.max_staleness,
+                "refresh_interval": self.refresh_interval,
+                "refreshes": self.refreshes,
+                "refresh_failures": self.refresh_failures,
+                "last_refresh_seconds": self.last_refresh_seconds,
+                "avg_refresh_seconds": self.total_refresh_seconds / self.refreshes if self.refreshes else 0.0,
+                "pages_copied": self.pages_copied,
+                "replica_reads": self.replica_reads,
+                "primary_reads": self.primary_reads,
+                "replica_read_ratio": self.replica_reads / reads if reads else 0.0,
+            }
+
+# DB 파일별 복제본 레지스트리
+_replicas = {}
+_replicas_lock = threading.Lock()
+
+def enable_replica(db_name="MemberManagement.db", max_staleness=30.0, refresh_interval=None, replica_dir=None):
+    """복제본을 만들고(첫 복사까지 완료) 백그라운드 갱신 시작"""
+    with _replicas_lock:
+        replica = _replicas.get(db_name)
+        if replica is None:
+            replica = ReadReplica(db_name, max_staleness, refresh_interval, replica_dir)
+            replica.refresh()
+            replica.start()
+            _replicas[db_name] = replica
+    return replica
+
+def disable_replica(db_name="MemberManagement.db"):
+    with _replicas_lock:
+        replica = _replicas.pop(db_name, None)
+    if replica is not None:
+        replica.close()
+
+def get_replica(db_name="MemberManagement.db"):
+    return _replicas.get(db_name)
+
+def read_db_name(db_name="MemberManagement.db", max_staleness=None):
+    """읽기 전용 조회가 사용할 DB 이름 (복제본이 없거나 오래되었으면 db_name 그대로)"""
+    replica = _replicas.get(db_name)
+    if replica is None:
+        return db_name
+    return replica.route(max_staleness)
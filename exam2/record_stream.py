@@ -0,0 +1,123 @@
+from connection_pool import get_connection
+from schema_cache import table_exists
+from read_replica import read_db_name
+import content_store
+
+# 멤버 / 컨텐츠 레코드 스트리밍 조회
+# 전체 결과를 한 번에 들고 있지 않도록 키셋 페이지(page_size 행) 단위로 읽어 한 행씩 내보냄
+# 페이지마다 커넥션을 빌렸다가 바로 반환하므로, 소비하는 쪽이 오래 걸려도 커넥션을 붙잡지 않음
+# 읽기 복제본(read_replica)이 켜져 있으면 복제본에서 읽음
+#
+#   for nick_name, score, ... in iter_members(db_name, min_score=10):
+#       ...
+
+DEFAULT_PAGE_SIZE = 1000
+
+MEMBER_COLUMNS = ("nick_name", "kakao_nick_name", "join_date", "grant", "last_login", "score")
+
+def iter_cursor(cursor, page_size=DEFAULT_PAGE_SIZE):
+    """이미 실행한 커서를 fetchmany 페이지 단위로 읽음"""
+    while True:
+        rows = cursor.fetchmany(page_size)
+        if not rows:
+            return
+        yield from rows
+
+def _prefix_range(prefix):
+    # prefix 로 시작하는 문자열 범위 [prefix, upper) (인덱스를 탈 수 있도록 LIKE 대신 사용)
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+def _filters(nick_name=None, nick_name_prefix=None, min_score=None, max_score=None):
+    conditions = []
+    params = []
+    if nick_name is not None:
+        conditions.append("nick_name = ?")
+        params.append(nick_name)
+    if nick_name_prefix:
+        lower, upper = _prefix_range(nick_name_prefix)
+        conditions.append("nick_name >= ? AND nick_name < ?")
+        params.extend((lower, upper))
+    if min_score is not None:
+        conditions.append("score >= ?")
+        params.append(min_score)
+    if max_score is not None:
+        conditions.append("score <= ?")
+        params.append(max_score)
+    return conditions, params
+
+def _keyset_pages(db_name, columns, table_name, conditions, params, key_columns, page_size):
+    """key_columns 순서로 정렬해 page_size 행씩 읽음 (행 끝에 키 컬럼이 붙어 있음)"""
+    key_count = len(key_columns)
+    order_by = ", ".join(key_columns)
+    last_key = None
+    while True:
+        page_conditions = list(conditions)
+        page_params = list(params)
+        if last_key is not None:
+            page_conditions.append(f"({order_by}) > ({', '.join('?' * key_count)})")
+            page_params.extend(last_key)
+        where_clause = f" WHERE {' AND '.join(page_conditions)}" if page_conditions else ""
+
+        # 페이지마다 읽기 대상을 다시 고름 (복제본이 있으면 복제본, 키셋이므로 세대가 바뀌어도 이어서 읽음)
+        with get_connection(read_db_name(db_name)) as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT {', '.join(columns)}, {order_by} FROM {table_name}{where_clause} "
+                           f"ORDER BY {order_by} LIMIT ?", page_params + [page_size])
+            rows = cursor.fetchall()
+
+        if not rows:
+            return
+        yield rows
+        if len(rows) < page_size:
+            return
+        last_key = rows[-1][-key_count:]
+
+def iter_members(db_name="MemberManagement.db", nick_name_prefix=None, min_score=None, max_score=None, page_size=DEFAULT_PAGE_SIZE):
+    """(nick_name, kakao_nick_name, join_date, grant, last_login, score) 를 nick_name 순으로 하나씩"""
+    if not table_exists(db_name, "member"):
+        print("Error: 'member' table does not exsist.")
+        return
+
+    conditions, params = _filters(nick_name_prefix=nick_name_prefix, min_score=min_score, max_score=max_score)
+    for rows in _keyset_pages(db_name, MEMBER_COLUMNS, "member", conditions, params, ("nick_name",), page_size):
+        for row in rows:
+            yield row[:-1]
+
+def iter_content_records(db_name="MemberManagement.db", content_name=None, from_date=None, to_date=None,
+                         nick_name=None, nick_name_prefix=None, min_score=None, max_score=None, page_size=DEFAULT_PAGE_SIZE):
+    """(content_name, start_date, nick_name, score, participation_count, day) 를 하나씩
+    from_date / to_date 는 기간 시작일(start_date) 범위 ("%Y%m%d", 양 끝 포함)"""
+    conditions, params = _filters(nick_name, nick_name_prefix, min_score, max_score)
+
+    with get_connection(read_db_name(db_name)) as conn:
+        use_store = content_store.is_enabled(conn)
+        period_tables = [] if use_store else content_store.find_period_tables(conn)
+
+    # 통합 저장소 : 기본 키 순서로 한 번에
+    if use_store:
+        if content_name is not None:
+            conditions.append("content_name = ?")
+            params.append(content_name)
+        if from_date is not None:
+            conditions.append("start_date >= ?")
+            params.append(from_date)
+        if to_date is not None:
+            conditions.append("start_date <= ?")
+            params.append(to_date)
+        columns = ("content_name", "start_date", "nick_name", "score", "participation_count", "day")
+        key_columns = ("content_name", "start_date", "nick_name", "day")
+        for rows in _keyset_pages(db_name, columns, content_store.CONTENT_RECORD_TABLE, conditions, params, key_columns, page_size):
+            for row in rows:
+                yield row[:6]
+        return
+
+    # 기간별 테이블 : 조건에 맞는 테이블을 차례로, 테이블 안에서는 rowid 순서로
+    columns = ("nick_name", "score", "participation_count", "day")
+    for table_name, table_content_name, start_date in period_tables:
+        if content_name is not None and table_content_name != content_name:
+            continue
+        if (from_date is not None and start_date < from_date) or (to_date is not None and start_date > to_date):
+            continue
+        for rows in _keyset_pages(db_name, columns, table_name, conditions, params, ("rowid",), page_size):
+            for row in rows:
+                yield (table_content_name, start_date) + row[:4]
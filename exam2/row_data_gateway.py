@@ -1,40 +1,51 @@
-import sqlite3
-from enum import Enum
 from datetime import datetime, timedelta
 
-class Grant(Enum):
-    ADMIN = 0
-    SUB_ADMIN = 1
-    USER = 2
-
-# DB 접속 함수
-def get_connection(db_name="MemberManagement.db"):
-    return sqlite3.connect(db_name)
+from connection_pool import get_connection
+from schema_cache import table_exists
+from unit_of_work import UnitOfWork
+from member_cache import member_cache
+from write_events import publish_member, publish_content_record
+import batch_writer
+import content_store
+from write_queue import queued_write
+from member_policy import run_policy, KickLowScore, KickInactive
+from batch_writer import DEFAULT_CHUNK_SIZE
+from statement_registry import content_record_sql
+import record_stream
+from read_replica import read_db_name
+from permissions import Grant, GRANT_BY_VALUE, grant_value, permissions
+from content_schedule import schedule
+# 변경 피드가 쓰기 이벤트를 기록하도록 등록
+import change_feed
+# 처음 사용할 때 스키마를 확인하도록 등록
+import schema
 
 # 테이블 존재 여부 확인 데코레이터
 def ensure_table_exists(table_name):
     def decorator(func):
         def wrapper(instance, *args, **kwargs):
-            conn = get_connection(instance.db_name)
-            cursor = conn.cursor()
-
-            # 테이블이 존재하는지 확인하는 쿼리 실행
-            cursor.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{table_name}';")
-            table_exists = cursor.fetchone()
-
-            if not table_exists:
+            # 테이블이 존재하는지 확인 (스키마 캐시 조회)
+            if not table_exists(instance.db_name, table_name):
                 # 테이블이 존재하지 않으면 오류 메시지 출력 후 종료
                 print(f"Error: '{table_name}' table does not exsist.")
-                conn.close()
                 return
 
-            conn.close()
             # 테이블이 존재하면 원래 함수 실행
             return func(instance, *args, **kwargs)
 
         return wrapper
     return decorator
 
+# 멤버 한 행 조회 (캐시에 없을 때만 DB 조회)
+def select_member(db_name, nick_name):
+    def load():
+        with get_connection(db_name) as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT kakao_nick_name, join_date, grant, last_login, score FROM member WHERE nick_name = ?", (nick_name,))
+            return cursor.fetchone()
+
+    return member_cache.get(db_name, nick_name, load)
+
 class Finder:
     def __init__(self, db_name):
         self.db_name = db_name
@@ -42,22 +53,62 @@ class Finder:
     @ensure_table_exists("member")
     def find_member(self, nick_name):
         """nick_name을 기준으로 멤버를 찾음"""
-        conn = get_connection(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute("SELECT kakao_nick_name, join_date, grant, last_login, score FROM member WHERE nick_name = ?", (nick_name,))
-        result = cursor.fetchone()
-        conn.close()
-        return result
+        return select_member(self.db_name, nick_name)
+
+    @ensure_table_exists("member")
+    def find_members(self, lazy=False):
+        """전체 멤버를 Member 객체 리스트로 조회 (lazy 면 접근한 필드만 변환하는 LazyMember)"""
+        # 전체 조회는 읽기 복제본이 있으면 복제본에서 (단건 조회 find_member 는 캐시와 맞추기 위해 주 DB)
+        # 만든 Member 는 주 DB 에 속함 (수정하면 주 DB 에 씀)
+        with get_connection(read_db_name(self.db_name)) as conn:
+            cursor = conn.cursor()
+            if lazy:
+                cursor.row_factory = lazy_member_row_factory(self.db_name)
+                cursor.execute("SELECT nick_name FROM member ORDER BY nick_name")
+            else:
+                cursor.row_factory = member_row_factory(self.db_name)
+                cursor.execute(f"SELECT {MEMBER_COLUMNS} FROM member ORDER BY nick_name")
+            return cursor.fetchall()
+
+    def find_members_with_grant(self, *grants):
+        """grants 중 하나를 가진 nick_name 리스트 (메모리 권한 표에서 조회)"""
+        return permissions.members_with(self.db_name, *grants)
+
+    def iter_members(self, nick_name_prefix=None, min_score=None, max_score=None, page_size=record_stream.DEFAULT_PAGE_SIZE):
+        """멤버 행을 페이지 단위로 읽어 하나씩 반환 (전체를 메모리에 올리지 않음)"""
+        return record_stream.iter_members(self.db_name, nick_name_prefix, min_score, max_score, page_size)
+
+    def iter_content_records(self, content_name=None, from_date=None, to_date=None, nick_name=None,
+                             nick_name_prefix=None, min_score=None, max_score=None, page_size=record_stream.DEFAULT_PAGE_SIZE):
+        """(content_name, start_date, nick_name, score, participation_count, day) 를 페이지 단위로 읽어 하나씩 반환"""
+        return record_stream.iter_content_records(self.db_name, content_name, from_date, to_date, nick_name,
+                                                  nick_name_prefix, min_score, max_score, page_size)
 
     def find_content_record(self, content_name, start_date, nick_name):
         """nick_name을 기준으로 컨텐츠 레코드를 찾음"""
         table_name = f"{content_name}_{start_date}"
-        conn = get_connection(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute(f"SELECT score, participation_count, day FROM {table_name} WHERE nick_name = ?", (nick_name,))
-        result = cursor.fetchone()
-        conn.close()
-        return result
+        db_name = read_db_name(self.db_name)
+        with get_connection(db_name) as conn:
+            # 통합 저장소가 있으면 인덱스로 바로 조회
+            if content_store.is_enabled(conn):
+                records = content_store.find_records(conn, content_name, start_date, nick_name)
+                return records[0] if records else None
+
+            if not table_exists(db_name, table_name, conn):
+                print(f"Error: '{table_name}' table does not exsist.")
+                return None
+
+            cursor = conn.cursor()
+            cursor.execute(content_record_sql(conn, "find", table_name), (nick_name,))
+            return cursor.fetchone()
+
+    def find_content_record_on(self, content_name, on_date, nick_name):
+        """on_date 에 진행 중인 content_name 기간에서 nick_name 의 컨텐츠 레코드를 찾음"""
+        period = schedule.active_period(self.db_name, content_name, on_date)
+        if period is None:
+            print(f"Error: no '{content_name}' period on {on_date}.")
+            return None
+        return self.find_content_record(content_name, period.start_date, nick_name)
 
 
 # RowDataGateway 기본 클래스
@@ -73,50 +124,90 @@ class MemberGateway(RowDataGateway):
         # Key
         self.nick_name = nick_name
 
+    @ensure_table_exists("member")
+    @queued_write
+    def create(self, kakao_nick_name, join_date, grant, last_login, score):
+        """멤버 생성"""
+        grant = grant_value(grant)
+        if isinstance(join_date, datetime):
+            join_date = join_date.strftime("%Y%m%d")
+
+        with get_connection(self.db_name) as conn:
+            cursor = conn.cursor()
+            cursor.execute("INSERT INTO member (nick_name, kakao_nick_name, join_date, grant, last_login, score) VALUES (?, ?, ?, ?, ?, ?)",
+                           (self.nick_name, kakao_nick_name, join_date, grant, last_login, score))
+            publish_member(self.db_name, "insert", self.nick_name,
+                           {"kakao_nick_name": kakao_nick_name, "join_date": join_date, "grant": grant, "last_login": last_login, "score": score})
+
     @ensure_table_exists("member")
     def find(self):
         """nick_name을 기준으로 멤버를 찾음"""
-        conn = get_connection(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute("SELECT kakao_nick_name, join_date, grant, last_login, score FROM member WHERE nick_name = ?", (self.nick_name,))
-        result = cursor.fetchone()
-        conn.close()
-        return result
+        return select_member(self.db_name, self.nick_name)
 
     @ensure_table_exists("member")
+    @queued_write
     def update_grant(self, grant):
-        """grant 업데이트"""
-        conn = get_connection(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute("UPDATE member SET grant = ? WHERE nick_name = ?", (grant, self.nick_name))
-        conn.commit()
+        """grant 업데이트 (권한 표는 쓰기 이벤트로 갱신됨)"""
+        grant = grant_value(grant)
+        with get_connection(self.db_name) as conn:
+            cursor = conn.cursor()
+            cursor.execute("UPDATE member SET grant = ? WHERE nick_name = ?", (grant, self.nick_name))
+            if cursor.rowcount:
+                publish_member(self.db_name, "update", self.nick_name, {"grant": grant})
 
     @ensure_table_exists("member")
+    @queued_write
     def update_last_login(self, last_login):
         """last_login 업데이트"""
-        conn = get_connection(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute("UPDATE member SET last_login = ? WHERE nick_name = ?", (last_login, self.nick_name))
-        conn.commit()
-        conn.close()
+        with get_connection(self.db_name) as conn:
+            cursor = conn.cursor()
+            cursor.execute("UPDATE member SET last_login = ? WHERE nick_name = ?", (last_login, self.nick_name))
+            if cursor.rowcount:
+                publish_member(self.db_name, "update", self.nick_name, {"last_login": last_login})
 
     @ensure_table_exists("member")
+    @queued_write
     def update_score(self, score):
         """점수 업데이트"""
-        conn = get_connection(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute("UPDATE member SET score = ? WHERE nick_name = ?", (score, self.nick_name))
-        conn.commit()
-        conn.close()
+        with get_connection(self.db_name) as conn:
+            cursor = conn.cursor()
+            cursor.execute("UPDATE member SET score = ? WHERE nick_name = ?", (score, self.nick_name))
+            if cursor.rowcount:
+                publish_member(self.db_name, "update", self.nick_name, {"score": score})
 
     @ensure_table_exists("member")
+    @queued_write
     def delete(self):
         """멤버 삭제 (강퇴)"""
-        conn = get_connection(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute("DELETE FROM member WHERE nick_name = ?", (self.nick_name,))
-        conn.commit()
-        conn.close()
+        with get_connection(self.db_name) as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM member WHERE nick_name = ?", (self.nick_name,))
+            if cursor.rowcount:
+                publish_member(self.db_name, "delete", self.nick_name)
+
+    # 일괄 처리 (전체를 하나의 트랜잭션으로 처리)
+    @classmethod
+    def create_many(cls, db_name, members, chunk_size=DEFAULT_CHUNK_SIZE, upsert=False):
+        """members: (nick_name, kakao_nick_name, join_date, grant, last_login, score) 의 iterable"""
+        with get_connection(db_name) as conn:
+            publish_member(db_name, "bulk")
+            count = batch_writer.insert_members(conn, members, chunk_size, upsert)
+        return count
+
+    @classmethod
+    def update_many(cls, db_name, members, chunk_size=DEFAULT_CHUNK_SIZE):
+        """members: (nick_name, grant, last_login, score) 의 iterable"""
+        with get_connection(db_name) as conn:
+            publish_member(db_name, "bulk")
+            count = batch_writer.update_members(conn, members, chunk_size)
+        return count
+
+    @classmethod
+    def delete_many(cls, db_name, nick_names, chunk_size=DEFAULT_CHUNK_SIZE):
+        with get_connection(db_name) as conn:
+            publish_member(db_name, "bulk")
+            count = batch_writer.delete_members(conn, nick_names, chunk_size)
+        return count
 
 # ContentRecordGateway: 행 데이터 게이트웨이
 class ContentRecordGateway(RowDataGateway):
@@ -124,48 +215,177 @@ class ContentRecordGateway(RowDataGateway):
         super().__init__(db_name)
         self.table_name = table_name
 
+        # 통합 저장소(content_store)에서 사용할 컨텐츠/기간
+        match = content_store.PERIOD_TABLE_PATTERN.match(table_name)
+        self.content_name, self.start_date = match.group("content_name", "start_date") if match else (None, None)
+
         # Key
         self.nick_name = nick_name
         self.day = day
 
+    @classmethod
+    def for_date(cls, db_name, content_name, on_date, nick_name, day=None):
+        """on_date 에 진행 중인 content_name 기간의 게이트웨이 (day 가 없으면 on_date 가 기간의 몇 번째 날인지)
+        진행 중인 기간이 없으면 None"""
+        period = schedule.active_period(db_name, content_name, on_date)
+        if period is None:
+            print(f"Error: no '{content_name}' period on {on_date}.")
+            return None
+        return cls(db_name, period.table_name, nick_name, period.day(on_date) if day is None else day)
+
+    def _use_store(self, conn):
+        return self.content_name is not None and content_store.is_enabled(conn)
+
+    def find(self):
+        """개별 레코드 조회"""
+        with get_connection(self.db_name) as conn:
+            if self._use_store(conn):
+                return content_store.find_record(conn, self.content_name, self.start_date, self.nick_name, self.day)
+
+            cursor = conn.cursor()
+            cursor.execute(content_record_sql(conn, "find_day", self.table_name), (self.nick_name, self.day))
+            return cursor.fetchone()
+
+    @queued_write
     def insert(self, score, participation_count, day):
         """개별 레코드 삽입"""
-        conn = get_connection(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute(f"INSERT INTO {self.table_name} (nick_name, score, participation_count, day) VALUES (?, ?, ?, ?)",
-                       (self.nick_name, score, participation_count, day))
-        conn.commit()
-        conn.close()
-
+        with get_connection(self.db_name) as conn:
+            if self._use_store(conn):
+                content_store.insert_record(conn, self.content_name, self.start_date, self.nick_name, score, participation_count, day)
+            else:
+                cursor = conn.cursor()
+                cursor.execute(content_record_sql(conn, "insert", self.table_name),
+                               (self.nick_name, score, participation_count, day))
+            publish_content_record(self.db_name, "insert", self.content_name, self.start_date, self.nick_name, day,
+                                   {"score": score, "participation_count": participation_count})
+
+    @queued_write
     def update(self, score, participation_count):
-        """개별 레코드 업데이트"""
-        conn = get_connection(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute(f"UPDATE {self.table_name} SET score = ?, participation_count = ? WHERE nick_name = ?",
-                       (score, participation_count, self.nick_name))
-        conn.commit()
-        conn.close()
-
+        """개별 레코드 업데이트 (해당 기간의 nick_name 레코드 전체)"""
+        with get_connection(self.db_name) as conn:
+            if self._use_store(conn):
+                updated = content_store.update_record(conn, self.content_name, self.start_date, self.nick_name, score, participation_count)
+            else:
+                cursor = conn.cursor()
+                cursor.execute(content_record_sql(conn, "update", self.table_name),
+                               (score, participation_count, self.nick_name))
+                updated = cursor.rowcount
+            if updated:
+                publish_content_record(self.db_name, "update", self.content_name, self.start_date, self.nick_name, None,
+                                       {"score": score, "participation_count": participation_count})
+
+    @queued_write
     def delete(self):
         """개별 레코드 삭제"""
-        conn = get_connection(self.db_name)
-        cursor = conn.cursor()
-        cursor.execute(f"DELETE FROM {self.table_name} WHERE nick_name = ?, day = ?", (self.nick_name, self.day))
-        conn.commit()
-        conn.close()
+        with get_connection(self.db_name) as conn:
+            if self._use_store(conn):
+                deleted = content_store.delete_record(conn, self.content_name, self.start_date, self.nick_name, self.day)
+            else:
+                cursor = conn.cursor()
+                cursor.execute(content_record_sql(conn, "delete_day", self.table_name), (self.nick_name, self.day))
+                deleted = cursor.rowcount
+            if deleted:
+                publish_content_record(self.db_name, "delete", self.content_name, self.start_date, self.nick_name, self.day)
+
+    # 일괄 처리 (전체를 하나의 트랜잭션으로 처리)
+    @classmethod
+    def insert_many(cls, db_name, table_name, records, chunk_size=DEFAULT_CHUNK_SIZE, upsert=False):
+        """records: (nick_name, score, participation_count, day) 의 iterable"""
+        content_name, start_date = content_store.split_period_table(table_name)
+        with get_connection(db_name) as conn:
+            publish_content_record(db_name, "bulk", content_name, start_date)
+            if content_store.is_enabled(conn):
+                count = content_store.insert_records(conn, content_name, start_date, records, chunk_size, upsert)
+            else:
+                count = batch_writer.insert_content_records(conn, table_name, records, chunk_size, upsert)
+        return count
+
+    @classmethod
+    def update_many(cls, db_name, table_name, records, chunk_size=DEFAULT_CHUNK_SIZE):
+        """records: (nick_name, score, participation_count, day) 의 iterable"""
+        content_name, start_date = content_store.split_period_table(table_name)
+        with get_connection(db_name) as conn:
+            publish_content_record(db_name, "bulk", content_name, start_date)
+            if content_store.is_enabled(conn):
+                count = content_store.update_records(conn, content_name, start_date, records, chunk_size)
+            else:
+                count = batch_writer.update_content_records(conn, table_name, records, chunk_size)
+        return count
+
+    @classmethod
+    def delete_many(cls, db_name, table_name, keys, chunk_size=DEFAULT_CHUNK_SIZE):
+        """keys: (nick_name, day) 의 iterable"""
+        content_name, start_date = content_store.split_period_table(table_name)
+        with get_connection(db_name) as conn:
+            publish_content_record(db_name, "bulk", content_name, start_date)
+            if content_store.is_enabled(conn):
+                count = content_store.delete_records(conn, content_name, start_date, keys, chunk_size)
+            else:
+                count = batch_writer.delete_content_records(conn, table_name, keys, chunk_size)
+        return count
 
 # 도메인 객체
 class Member:
-    def __init__(self, nick_name, kakao_nick_name, join_date=None, grant=None, last_login=None, score=None):
+    # 필드는 __slots__ 로 두어 인스턴스마다 __dict__ 를 만들지 않음 (대량 조회 시 메모리 절약)
+    __slots__ = ("nick_name", "kakao_nick_name", "join_date", "grant", "last_login", "score", "db_name", "_dirty")
+
+    # Unit of Work 에서 사용하는 매핑 정보
+    table_name = "member"
+    key_fields = ("nick_name",)
+    tracked_fields = ("kakao_nick_name", "join_date", "grant", "last_login", "score")
+
+    def __init__(self, nick_name, kakao_nick_name, join_date=None, grant=None, last_login=None, score=None, db_name="MemberManagement.db"):
+        object.__setattr__(self, "_dirty", None)
+        object.__setattr__(self, "db_name", db_name)
+
         self.nick_name = nick_name
         self.kakao_nick_name = kakao_nick_name
         self.join_date = join_date if join_date else datetime.now()
-        self.grant = grant if grant else Grant.USER
+        # ADMIN 의 값이 0 이므로 None 일 때만 기본값
+        self.grant = Grant.USER if grant is None else grant
         self.last_login = last_login if last_login else 0
         self.score = score if score else 0
 
-        self.member_gateway = MemberGateway("MemberManagement.db", self.nick_name)
         # self.fetch()
+        self.mark_clean()
+
+    @property
+    def member_gateway(self):
+        # 게이트웨이는 쓰기/조회 시점에만 만듦 (인스턴스마다 들고 있지 않음)
+        return MemberGateway(self.db_name, self.nick_name)
+
+    def __setattr__(self, name, value):
+        # 추적 대상 필드가 바뀌면 변경(dirty) 기록
+        if name in self.tracked_fields and getattr(self, name, None) != value:
+            if self._dirty is None:
+                object.__setattr__(self, "_dirty", set())
+            self._dirty.add(name)
+        object.__setattr__(self, name, value)
+
+    def as_dict(self):
+        return {field: getattr(self, field, None) for field in ("nick_name",) + self.tracked_fields}
+
+    def dirty_values(self):
+        """변경된 필드의 DB 저장 값"""
+        values = {}
+        if not self._dirty:
+            return values
+        for field in self.tracked_fields:
+            if field not in self._dirty:
+                continue
+            value = getattr(self, field)
+            if isinstance(value, Grant):
+                value = value.value
+            elif isinstance(value, datetime):
+                value = value.strftime("%Y%m%d")
+            values[field] = value
+        return values
+
+    def key_values(self):
+        return (self.nick_name,)
+
+    def mark_clean(self):
+        object.__setattr__(self, "_dirty", None)
 
     def insert(self):
         self.member_gateway.create(self.kakao_nick_name, self.join_date, self.grant, self.last_login, self.score)
@@ -173,19 +393,26 @@ class Member:
     def fetch(self):
         result = self.member_gateway.find()
         if result:
-            self.kakao_nick_name, self.join_date, self.grant, self.last_login, self.score = result
-            print(f"Fetched data for {self.nick_name}: {self.__dict__}")
+            self.kakao_nick_name, self.join_date, grant, self.last_login, self.score = result
+            self.grant = GRANT_BY_VALUE.get(grant, grant)
+            self.mark_clean()
+            print(f"Fetched data for {self.nick_name}: {self.as_dict()}")
         else:
             print(f"User {self.nick_name} not found.")
 
-    def update(self):
+    def update(self, unit_of_work=None):
 
         # 유효성 검사
         self.validate()
 
-        self.member_gateway.update_grant(self.grant.value)
-        self.member_gateway.update_last_login(self.last_login)
-        self.member_gateway.update_score(self.score)
+        # 변경된 필드만 UPDATE 한 번으로 반영
+        # unit_of_work 를 넘기면 등록만 하고, 여러 멤버를 그 commit() 에서 한꺼번에 반영
+        if unit_of_work is not None:
+            unit_of_work.register_dirty(self)
+            return
+
+        with UnitOfWork(self.db_name) as uow:
+            uow.register_dirty(self)
 
     # 유효성 검사 (비즈니스 로직 추가)
     def validate(self):
@@ -197,7 +424,11 @@ class Member:
 
         current_date = datetime.now()
 
-        if datetime.strptime(self.join_date, "%Y%m%d") > current_date :
+        join_date = self.join_date
+        if isinstance(join_date, str):
+            join_date = datetime.strptime(join_date, "%Y%m%d")
+
+        if join_date > current_date :
             self.join_date = current_date
 
         if self.last_login < 0:
@@ -206,15 +437,142 @@ class Member:
     def delete(self):
         self.member_gateway.delete()
 
+# 필요한 필드만 읽는 멤버
+# 조회 시에는 nick_name 만 가져오고, 다른 필드는 처음 접근할 때 같은 조회 결과 전체의 해당 컬럼을 한 번에 읽음
+class LazyMember(Member):
+    __slots__ = ("_columns",)
+
+    def __getattr__(self, name):
+        # 아직 채워지지 않은 슬롯만 여기로 옴
+        if name not in Member.tracked_fields:
+            raise AttributeError(name)
+        value = self._columns.value(name, self.nick_name)
+        object.__setattr__(self, name, value)
+        return value
+
+# LazyMember 들이 공유하는 컬럼 로더 (컬럼마다 쿼리 한 번)
+class MemberColumns:
+    def __init__(self, db_name):
+        self.db_name = db_name
+        self._columns = {}
+
+    def value(self, field, nick_name):
+        column = self._columns.get(field)
+        if column is None:
+            column = self._columns[field] = self._load(field)
+        return column.get(nick_name)
+
+    def _load(self, field):
+        with get_connection(read_db_name(self.db_name)) as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT nick_name, {field} FROM member")
+            if field == "grant":
+                return {nick_name: GRANT_BY_VALUE.get(value, value) for nick_name, value in cursor}
+            return dict(cursor.fetchall())
+
+MEMBER_COLUMNS = "nick_name, kakao_nick_name, join_date, grant, last_login, score"
+
+def member_row_factory(db_name="MemberManagement.db"):
+    """커서에서 바로 Member 를 만드는 row_factory (행 순서는 MEMBER_COLUMNS)
+    __init__ 과 변경 추적을 거치지 않고 슬롯에 직접 채움"""
+    new = object.__new__
+    set_field = object.__setattr__
+    grants = GRANT_BY_VALUE
+    # 가입일은 같은 값이 많으므로 같은 문자열 객체를 공유
+    join_dates = {}
+
+    def factory(cursor, row):
+        member = new(Member)
+        set_field(member, "_dirty", None)
+        set_field(member, "db_name", db_name)
+        set_field(member, "nick_name", row[0])
+        set_field(member, "kakao_nick_name", row[1])
+        set_field(member, "join_date", join_dates.setdefault(row[2], row[2]))
+        set_field(member, "grant", grants.get(row[3], row[3]))
+        set_field(member, "last_login", row[4])
+        set_field(member, "score", row[5])
+        return member
+    return factory
+
+def lazy_member_row_factory(db_name="MemberManagement.db"):
+    """nick_name 한 컬럼으로 LazyMember 를 만드는 row_factory"""
+    new = object.__new__
+    set_field = object.__setattr__
+    columns = MemberColumns(db_name)
+
+    def factory(cursor, row):
+        member = new(LazyMember)
+        set_field(member, "_dirty", None)
+        set_field(member, "db_name", db_name)
+        set_field(member, "nick_name", row[0])
+        set_field(member, "_columns", columns)
+        return member
+    return factory
+
+# Identity Map
+# 세션 안에서 같은 nick_name 은 항상 같은 Member 인스턴스를 반환 (조회는 멤버 캐시를 거침)
+class Session:
+    def __init__(self, db_name="MemberManagement.db"):
+        self.db_name = db_name
+        self._members = {}
+
+    def get_member(self, nick_name):
+        member = self._members.get(nick_name)
+        if member is not None:
+            return member
+
+        result = Finder(self.db_name).find_member(nick_name)
+        if not result:
+            return None
+
+        kakao_nick_name, join_date, grant, last_login, score = result
+        # DB 에는 값(0, 1, 2) 으로 저장되어 있으므로 Grant 로 변환
+        member = Member(nick_name, kakao_nick_name, join_date, GRANT_BY_VALUE.get(grant, grant), last_login, score, db_name=self.db_name)
+        self._members[nick_name] = member
+        return member
+
+    def add(self, member):
+        """세션에서 만든 멤버를 등록 (이미 있으면 기존 인스턴스를 반환)"""
+        return self._members.setdefault(member.nick_name, member)
+
+    def evict(self, nick_name):
+        self._members.pop(nick_name, None)
+
+    def clear(self):
+        self._members.clear()
+
+    def __contains__(self, nick_name):
+        return nick_name in self._members
+
 # 도메인 객체
 class ContentRecord:
-    def __init__(self, nick_name, day, score=0, participation_count=0):
+    __slots__ = ("nick_name", "score", "participation_count", "day", "db_name", "table_name")
+
+    def __init__(self, nick_name, day, score=0, participation_count=0, db_name="MemberManagement.db", table_name="raid_20240925"):
         self.nick_name = nick_name
         self.score = score
         self.participation_count = participation_count
         self.day = day
 
-        self.content_record_gateway = ContentRecordGateway("MemberManagement.db", "raid", "20240925", self.nick_name)
+        self.db_name = db_name
+        self.table_name = table_name
+
+    @classmethod
+    def for_date(cls, nick_name, content_name, on_date, score=0, participation_count=0, db_name="MemberManagement.db"):
+        """on_date 에 진행 중인 content_name 기간의 레코드 (day 는 on_date 가 기간의 몇 번째 날인지, 기간이 없으면 None)"""
+        period = schedule.active_period(db_name, content_name, on_date)
+        if period is None:
+            print(f"Error: no '{content_name}' period on {on_date}.")
+            return None
+        return cls(nick_name, period.day(on_date), score, participation_count, db_name, period.table_name)
+
+    @property
+    def content_record_gateway(self):
+        # 게이트웨이는 쓰기/조회 시점에만 만듦
+        return ContentRecordGateway(self.db_name, self.table_name, self.nick_name, self.day)
+
+    def as_dict(self):
+        return {"nick_name": self.nick_name, "score": self.score, "participation_count": self.participation_count, "day": self.day}
 
     def insert(self):
         self.content_record_gateway.insert(self.score, self.participation_count, self.day)
@@ -223,7 +581,7 @@ class ContentRecord:
         result = self.content_record_gateway.find()
         if result:
             self.score, self.participation_count, self.day = result
-            print(f"Fetched data for {self.nick_name}: {self.__dict__}")
+            print(f"Fetched data for {self.nick_name}: {self.as_dict()}")
         else:
             print(f"User {self.nick_name} not found.")
 
@@ -266,21 +624,17 @@ def main():
     member.delete()
     #endregion
 
-    #region 2 : 특정 조건에 따른 멤버 삭제
-    if member.score <= 0:
-        member.delete()
-
-    if member.last_login >= 5:
-        member.delete()
+    #region 2 : 특정 조건에 따른 멤버 삭제 (전체 멤버에 한 번에 적용)
+    report = run_policy("MemberManagement.db", [KickLowScore(0), KickInactive(5)])
+    print(f"Kicked members: {report}")
     #endregion
 
     #region 3 : Content Record CRUD
     # 0. 컨텐츠 레코드 찾기
-    content_record_datas = finder.find_content_record("raid", "20240925", "User_0001")
+    content_record_datas = finder.iter_content_records("raid", "20240925", "20240925", nick_name="User_0001")
 
-    for content_record_data in content_record_datas:
-        score, participation_count, day = content_record_data
-        content_record = ContentRecord("User_0001", day, score, participation_count)
+    for _, _, nick_name, score, participation_count, day in content_record_datas:
+        content_record = ContentRecord(nick_name, day, score, participation_count)
         content_record.fetch()
     #endregion
 
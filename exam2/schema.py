@@ -0,0 +1,240 @@
+import sqlite3
+import sys
+import threading
+import time
+
+from connection_pool import get_connection, get_pool, add_connect_hook, add_first_use_hook, ensure_started
+from schema_cache import schema_cache, table_exists, invalidate_schema
+from content_schedule import schedule
+import change_feed
+import content_store
+import member_summary
+import login_aging
+
+# 스키마 생성 / 마이그레이션
+# 버전은 PRAGMA user_version 에 기록하고, 아직 적용하지 않은 마이그레이션만 버전 순서대로 적용
+# 마이그레이션마다 하나의 트랜잭션(BEGIN IMMEDIATE)으로 적용하고 같은 트랜잭션에서 버전을 올리므로
+# 여러 워커가 동시에 시작하거나 중간에 죽어도 한 번씩만 적용됨 (CREATE ... IF NOT EXISTS 로 다시 실행해도 안전)
+#
+#   bootstrap("MemberManagement.db")              # 짧게 실행하는 CLI : 스키마만 확인, 나머지는 처음 사용할 때
+#   bootstrap("MemberManagement.db", warm=True)   # 오래 실행하는 워커 : 커넥션 / 스키마 캐시를 미리 준비
+# 이 모듈을 import 하면 DB 마다 처음 get_connection() 할 때 bootstrap 이 한 번 실행됨 (읽기 전용 풀은 제외)
+#
+#   python schema.py migrate
+#   python schema.py status
+
+# 마이그레이션 [(버전, 설명, 함수(cursor))]
+def _create_base_tables(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS member (
+            nick_name TEXT PRIMARY KEY,
+            kakao_nick_name TEXT,
+            join_date TEXT,
+            grant INTEGER,
+            last_login INTEGER,
+            score INTEGER
+        )
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS content_schedule (
+            content_name TEXT NOT NULL,
+            start_date TEXT NOT NULL,
+            end_date TEXT NOT NULL
+        )
+    """)
+
+def _create_member_indexes(cursor):
+    # 점수 범위 조회 (강퇴 정책, 점수 필터 스트리밍)
+    cursor.execute("CREATE INDEX IF NOT EXISTS member_score ON member (score)")
+    # 기존 DB 에 같은 기간이 여러 번 있을 수 있으므로 UNIQUE 는 아님
+    cursor.execute("CREATE INDEX IF NOT EXISTS content_schedule_period ON content_schedule (content_name, start_date)")
+
+def _create_period_table_indexes(cursor):
+    # 이미 있는 기간별 테이블에 nick_name 조회용 인덱스 (기존 데이터에 중복이 있을 수 있으므로 UNIQUE 는 아님)
+    for table_name, _, _ in content_store.find_period_tables(cursor.connection):
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {table_name}_nick_name ON {table_name} (nick_name, day)")
+
+def _create_schedule_version(cursor):
+    # content_schedule 이 바뀔 때마다 버전을 올림 (content_schedule 색인이 버전 한 행만 보고 다시 읽을지 결정)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS content_schedule_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL
+        )
+    """)
+    cursor.execute("INSERT OR IGNORE INTO content_schedule_version (id, version) VALUES (1, 0)")
+    for event in ("INSERT", "UPDATE", "DELETE"):
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS content_schedule_version_{event.lower()}
+            AFTER {event} ON content_schedule
+            BEGIN
+                UPDATE content_schedule_version SET version = version + 1 WHERE id = 1;
+            END
+        """)
+
+MIGRATIONS = [
+    (1, "member / content_schedule tables", _create_base_tables),
+    (2, "member score and content_schedule period indexes", _create_member_indexes),
+    (3, "nick_name indexes on existing content period tables", _create_period_table_indexes),
+    (4, "content_schedule version counter", _create_schedule_version),
+    (5, "change feed log / consumer cursor tables", change_feed.create_tables),
+    (6, "login aging run log table", login_aging.create_table),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+# DB 파일에 저장되는 PRAGMA (bootstrap 마다 확인)
+DATABASE_PRAGMAS = {"journal_mode": "WAL"}
+
+# 커넥션마다 적용하는 PRAGMA (bootstrap 한 DB 의 새 커넥션에 적용)
+#   WAL 에서는 synchronous=NORMAL 이어도 커밋한 데이터가 깨지지 않음 (전원이 나가면 마지막 커밋만 잃을 수 있음)
+CONNECTION_PRAGMAS = {"synchronous": "NORMAL", "busy_timeout": 5000, "temp_store": "MEMORY"}
+
+def schema_version(conn):
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+def migrate(db_name="MemberManagement.db"):
+    """적용하지 않은 마이그레이션을 적용하고 [(버전, 설명)] 를 반환"""
+    applied = []
+    with get_connection(db_name) as conn:
+        cursor = conn.cursor()
+        # 이미 최신이면 PRAGMA 한 번으로 끝남
+        if schema_version(conn) >= SCHEMA_VERSION:
+            return applied
+
+        for version, description, apply in MIGRATIONS:
+            try:
+                cursor.execute("BEGIN IMMEDIATE")
+                # 잠금을 얻은 뒤 다시 확인 (다른 워커가 먼저 적용했을 수 있음)
+                if schema_version(conn) >= version:
+                    conn.rollback()
+                    continue
+                apply(cursor)
+                cursor.execute(f"PRAGMA user_version = {int(version)}")
+                conn.commit()
+            except sqlite3.Error:
+                conn.rollback()
+                raise
+            finally:
+                invalidate_schema(db_name)
+            applied.append((version, description))
+    return applied
+
+def _apply_connection_pragmas(db_name, raw):
+    if db_name in _bootstrapped:
+        for name, value in CONNECTION_PRAGMAS.items():
+            raw.execute(f"PRAGMA {name} = {value}")
+
+# bootstrap 한 DB 파일 (프로세스마다 한 번만)
+_bootstrapped = set()
+_bootstrap_lock = threading.Lock()
+# DB 파일 -> 처음 확인할 때 단계별 걸린 시간
+_bootstrap_timings = {}
+
+def bootstrap(db_name="MemberManagement.db", warm=False):
+    """스키마를 최신으로 맞추고 PRAGMA 를 설정 (프로세스에서 처음 호출할 때만 DB 를 확인)
+    warm 이면 풀 커넥션과 스키마 캐시를 미리 채움 (아니면 처음 사용할 때 채워짐)
+    {단계: 걸린 시간(초)} 를 반환 (DB 확인 단계는 처음 확인할 때 걸린 시간)"""
+    # 이미 확인한 DB 면 잠금 없이 넘어감
+    if db_name not in _bootstrapped:
+        # 처음 사용 훅과 같은 순서로 잠금을 잡도록 훅을 먼저 실행 (훅이 아래를 실행)
+        ensure_started(db_name)
+        with _bootstrap_lock:
+            if db_name not in _bootstrapped:
+                timings = _bootstrap_timings[db_name] = {}
+                started = time.perf_counter()
+                with get_connection(db_name) as conn:
+                    conn.commit()
+                    for name, value in DATABASE_PRAGMAS.items():
+                        conn.execute(f"PRAGMA {name} = {value}").fetchall()
+                    # 이 커넥션은 훅 등록 전에 열렸으므로 직접 적용
+                    for name, value in CONNECTION_PRAGMAS.items():
+                        conn.execute(f"PRAGMA {name} = {value}")
+                timings["pragmas"] = time.perf_counter() - started
+
+                started = time.perf_counter()
+                migrate(db_name)
+                timings["migrate"] = time.perf_counter() - started
+
+                _bootstrapped.add(db_name)
+                add_connect_hook(_apply_connection_pragmas)
+
+    timings = dict(_bootstrap_timings.get(db_name, {}))
+    if warm:
+        started = time.perf_counter()
+        get_pool(db_name).warm()
+        schema_cache.tables(db_name)
+        timings["warm"] = time.perf_counter() - started
+    return timings
+
+# 처음 사용할 때 bootstrap (읽기 전용 복제본은 마이그레이션할 수 없으므로 건너뜀)
+@add_first_use_hook
+def _bootstrap_on_first_use(db_name):
+    if not get_pool(db_name).read_only:
+        bootstrap(db_name)
+
+# 기간별 컨텐츠 테이블
+def create_content_table(db_name, content_name, start_date, end_date=None):
+    """컨텐츠 기간을 만듦 (통합 저장소면 테이블 없이 일정만, 아니면 f"{content_name}_{start_date}" 테이블)
+    end_date 를 주면 content_schedule 에도 등록, 기간별 테이블 이름을 반환"""
+    table_name = content_store.period_table_name(content_name, start_date)
+    if not content_store.PERIOD_TABLE_PATTERN.match(table_name):
+        raise ValueError(f"'{table_name}' is not a content period table name.")
+
+    with get_connection(db_name) as conn:
+        cursor = conn.cursor()
+        try:
+            if not content_store.is_enabled(conn):
+                cursor.execute(f"""
+                    CREATE TABLE IF NOT EXISTS {table_name} (
+                        nick_name TEXT NOT NULL,
+                        score INTEGER,
+                        participation_count INTEGER,
+                        day INTEGER NOT NULL
+                    )
+                """)
+                # 새 테이블은 (nick_name, day) 가 하나뿐이므로 UNIQUE (일괄 처리 upsert 에 필요)
+                cursor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {table_name}_nick_name ON {table_name} (nick_name, day)")
+            if end_date is not None:
+                cursor.execute("UPDATE content_schedule SET end_date = ? WHERE content_name = ? AND start_date = ?",
+                               (end_date, content_name, start_date))
+                if cursor.rowcount == 0:
+                    cursor.execute("INSERT INTO content_schedule (content_name, start_date, end_date) VALUES (?, ?, ?)",
+                                   (content_name, start_date, end_date))
+            conn.commit()
+        except sqlite3.Error:
+            conn.rollback()
+            raise
+        finally:
+            invalidate_schema(db_name)
+            schedule.invalidate(db_name)
+
+        # 요약 테이블을 쓰고 있으면 새 테이블에도 트리거 설치
+        if member_summary.is_installed(conn):
+            member_summary.install(db_name)
+    return table_name
+
+def status(db_name="MemberManagement.db"):
+    with get_connection(db_name) as conn:
+        version = schema_version(conn)
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+    pending = [(number, description) for number, description, _ in MIGRATIONS if number > version]
+    return {"version": version, "latest": SCHEMA_VERSION, "pending": pending, "journal_mode": journal_mode,
+            "member": table_exists(db_name, "member"), "content_schedule": table_exists(db_name, "content_schedule")}
+
+def main():
+    db_name = "MemberManagement.db"
+    command = sys.argv[1] if len(sys.argv) > 1 else "migrate"
+    if command == "migrate":
+        applied = migrate(db_name)
+        for version, description in applied:
+            print(f"applied {version}: {description}")
+        print(f"schema version {SCHEMA_VERSION} ({len(applied)} migrations applied)")
+    elif command == "status":
+        for key, value in status(db_name).items():
+            print(f"{key}: {value}")
+    else:
+        print("usage: python schema.py [migrate|status]")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+import threading
+import time
+
+from connection_pool import get_connection
+
+# 스키마 메타데이터 캐시
+# DB 파일별로 테이블 목록을 한 번만 읽어 두고, PRAGMA schema_version 이 바뀌었을 때만 다시 읽음
+class SchemaCache:
+    def __init__(self, revalidate_interval=5.0):
+        # 존재하는 테이블도 이 주기(초)가 지나면 schema_version 을 다시 확인 (DROP TABLE 대응)
+        self.revalidate_interval = revalidate_interval
+
+        self._entries = {}
+        self._lock = threading.Lock()
+
+        # 통계
+        self.hits = 0
+        self.loads = 0
+        self.version_checks = 0
+
+    def table_exists(self, db_name, table_name, conn=None):
+        """테이블 존재 여부 (캐시가 유효하면 쿼리 없이 dict 조회로 끝남)"""
+        entry = self._entries.get(db_name)
+        if entry is not None and table_name in entry["tables"] \
+                and time.monotonic() - entry["checked_at"] < self.revalidate_interval:
+            self.hits += 1
+            return True
+
+        entry = self._revalidate(db_name, conn)
+        return table_name in entry["tables"]
+
+    def tables(self, db_name, conn=None):
+        """DB의 테이블 이름 목록"""
+        entry = self._entries.get(db_name)
+        if entry is None or time.monotonic() - entry["checked_at"] >= self.revalidate_interval:
+            entry = self._revalidate(db_name, conn)
+        return set(entry["tables"])
+
+    def invalidate(self, db_name=None):
+        """캐시 무효화 (db_name 이 없으면 전체)"""
+        with self._lock:
+            if db_name is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(db_name, None)
+
+    def _revalidate(self, db_name, conn):
+        # 커넥션을 먼저 얻은 뒤 락을 잡음 (풀 대기 중 락을 쥐고 있지 않도록)
+        if conn is None:
+            with get_connection(db_name) as pooled:
+                return self._revalidate_with(db_name, pooled)
+        return self._revalidate_with(db_name, conn)
+
+    def _revalidate_with(self, db_name, conn):
+        with self._lock:
+            return self._load(db_name, conn, self._entries.get(db_name))
+
+    def _load(self, db_name, conn, entry):
+        cursor = conn.cursor()
+        cursor.execute("PRAGMA schema_version")
+        schema_version = cursor.fetchone()[0]
+        self.version_checks += 1
+
+        if entry is not None and entry["schema_version"] == schema_version:
+            entry["checked_at"] = time.monotonic()
+            return entry
+
+        # 뷰도 조회 대상이므로 함께 읽음
+        cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'view')")
+        entry = {
+            "tables": {row[0] for row in cursor.fetchall()},
+            "schema_version": schema_version,
+            "checked_at": time.monotonic(),
+        }
+        self.loads += 1
+        self._entries[db_name] = entry
+        return entry
+
+    def stats(self):
+        return {"hits": self.hits, "loads": self.loads, "version_checks": self.version_checks}
+
+# 데코레이터, 함수 기반 스크립트, Finder 가 공유하는 캐시
+schema_cache = SchemaCache()
+
+def table_exists(db_name, table_name, conn=None):
+    return schema_cache.table_exists(db_name, table_name, conn)
+
+def invalidate_schema(db_name=None):
+    schema_cache.invalidate(db_name)
@@ -0,0 +1,150 @@
+import argparse
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from connection_pool import get_connection, read_only_uri
+import content_store
+from read_replica import read_db_name
+
+# 시즌 집계 (여러 기간의 컨텐츠 레코드를 한 번에 요약)
+# 기간(content_name, start_date)마다 독립적으로 집계할 수 있으므로
+#   map    : 기간 하나를 읽기 전용 커넥션으로 GROUP BY 집계 (프로세스 풀에서 병렬 실행)
+#   reduce : 기간별 부분 결과를 멤버별 / 기간별 합계로 합침
+# 기간별 테이블(raid_YYYYMMDD)과 통합 저장소(content_record) 모두 지원
+
+# 집계 대상 기간 [(source, content_name, start_date)]
+#   source 는 기간별 테이블 이름, 통합 저장소면 CONTENT_RECORD_TABLE
+def find_periods(db_name="MemberManagement.db", content_name=None, from_date=None, to_date=None):
+    with get_connection(db_name) as conn:
+        if content_store.is_enabled(conn):
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT DISTINCT content_name, start_date FROM {content_store.CONTENT_RECORD_TABLE} "
+                           "ORDER BY content_name, start_date")
+            periods = [(content_store.CONTENT_RECORD_TABLE, name, start_date) for name, start_date in cursor.fetchall()]
+        else:
+            periods = content_store.find_period_tables(conn)
+
+    return [(source, name, start_date) for source, name, start_date in periods
+            if (content_name is None or name == content_name)
+            and (from_date is None or start_date >= from_date)
+            and (to_date is None or start_date <= to_date)]
+
+# map : 기간 하나 집계 (다른 프로세스에서 실행되므로 모듈 최상위 함수)
+def aggregate_period(db_uri, source, content_name, start_date):
+    """{"members": {nick_name: (점수, 참여 횟수, 레코드 수)}, "days": {day: (점수, 참여 횟수, 참여 멤버 수)}}"""
+    conn = sqlite3.connect(db_uri, uri=True)
+    try:
+        conn.execute("PRAGMA query_only = ON")
+        # 큰 파일은 mmap 으로 읽어 페이지 복사를 줄임
+        conn.execute("PRAGMA mmap_size = 268435456")
+
+        if source == content_store.CONTENT_RECORD_TABLE:
+            where_clause = " WHERE content_name = ? AND start_date = ?"
+            params = (content_name, start_date)
+        else:
+            where_clause = ""
+            params = ()
+
+        cursor = conn.cursor()
+        cursor.execute(f"SELECT nick_name, SUM(score), SUM(participation_count), COUNT(*) FROM {source}{where_clause} "
+                       "GROUP BY nick_name", params)
+        members = {nick_name: (score or 0, participation_count or 0, records)
+                   for nick_name, score, participation_count, records in cursor}
+
+        cursor.execute(f"SELECT day, SUM(score), SUM(participation_count), COUNT(DISTINCT nick_name) FROM {source}{where_clause} "
+                       "GROUP BY day", params)
+        days = {day: (score or 0, participation_count or 0, active_members)
+                for day, score, participation_count, active_members in cursor}
+    finally:
+        conn.close()
+    return {"members": members, "days": days}
+
+# reduce : 부분 결과 합치기
+class SeasonSummary:
+    def __init__(self):
+        # nick_name -> {"score", "participation_count", "records", "periods"}
+        self.members = {}
+        # (content_name, start_date) -> {"score", "participation_count", "records", "members", "days"}
+        self.periods = {}
+
+    def merge(self, content_name, start_date, partial):
+        members = self.members
+        period_score = period_participation = period_records = 0
+        for nick_name, (score, participation_count, records) in partial["members"].items():
+            total = members.get(nick_name)
+            if total is None:
+                total = members[nick_name] = {"score": 0, "participation_count": 0, "records": 0, "periods": 0}
+            total["score"] += score
+            total["participation_count"] += participation_count
+            total["records"] += records
+            total["periods"] += 1
+            period_score += score
+            period_participation += participation_count
+            period_records += records
+
+        self.periods[(content_name, start_date)] = {
+            "score": period_score,
+            "participation_count": period_participation,
+            "records": period_records,
+            "members": len(partial["members"]),
+            "days": {day: {"score": score, "participation_count": participation_count, "members": active_members}
+                     for day, (score, participation_count, active_members) in sorted(partial["days"].items())},
+        }
+
+    def top_members(self, count=10):
+        """총 점수 상위 멤버 [(nick_name, 합계)]"""
+        return sorted(self.members.items(), key=lambda item: (-item[1]["score"], item[0]))[:count]
+
+def aggregate_season(db_name="MemberManagement.db", content_name=None, from_date=None, to_date=None, processes=None):
+    """조건에 맞는 모든 기간을 집계해 SeasonSummary 로 반환
+    processes : 프로세스 수 (None 이면 CPU 수, 1 이면 현재 프로세스에서 차례로 실행)"""
+    # 읽기 복제본이 있으면 복제본 한 세대를 대상으로 집계
+    db_name = read_db_name(db_name)
+    periods = find_periods(db_name, content_name, from_date, to_date)
+    summary = SeasonSummary()
+    if not periods:
+        return summary
+
+    db_uri = read_only_uri(db_name)
+    processes = min(processes or os.cpu_count() or 1, len(periods))
+
+    if processes == 1:
+        for source, name, start_date in periods:
+            summary.merge(name, start_date, aggregate_period(db_uri, source, name, start_date))
+        return summary
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = {executor.submit(aggregate_period, db_uri, source, name, start_date): (name, start_date)
+                   for source, name, start_date in periods}
+        # 끝난 순서대로 합침 (결과는 기간 순으로 정렬해 둠)
+        for future in as_completed(futures):
+            name, start_date = futures[future]
+            summary.merge(name, start_date, future.result())
+
+    summary.periods = dict(sorted(summary.periods.items()))
+    return summary
+
+def main():
+    parser = argparse.ArgumentParser(description="season aggregation across content periods")
+    parser.add_argument("--db", default="MemberManagement.db")
+    parser.add_argument("--content", help="content name (e.g. raid)")
+    parser.add_argument("--from-date", help="first period start date (%%Y%%m%%d)")
+    parser.add_argument("--to-date", help="last period start date (%%Y%%m%%d)")
+    parser.add_argument("--processes", type=int, help="worker processes (default: CPU count)")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    summary = aggregate_season(args.db, args.content, args.from_date, args.to_date, args.processes)
+    elapsed = time.perf_counter() - started
+
+    print(f"{len(summary.periods)} periods, {len(summary.members)} members in {elapsed:.2f}s")
+    for (name, start_date), period in summary.periods.items():
+        print(f"{name}_{start_date}: score {period['score']}, participation {period['participation_count']}, members {period['members']}")
+    for rank, (nick_name, total) in enumerate(summary.top_members(args.top), 1):
+        print(f"{rank:>3}. {nick_name}: score {total['score']}, participation {total['participation_count']}, periods {total['periods']}")
+
+if __name__ == "__main__":
+    main()
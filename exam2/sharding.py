@@ -0,0 +1,512 @@
+import heapq
+import sys
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+from connection_pool import get_connection
+from schema_cache import table_exists
+from write_events import publish_member, publish_content_record
+from statement_registry import content_record_sql
+from leaderboard import rankings
+from row_data_gateway import select_member, Finder, MemberGateway, ContentRecordGateway, Member, ContentRecord
+from content_schedule import schedule
+import batch_writer
+import content_store
+import schema
+
+# 여러 DB 파일로 나눈 멤버 저장 (샤딩)
+# 멤버가 들어갈 샤드(DB 파일) 는 다음 순서로 정함
+#   1. 배치 기록 (길드로 만든 멤버, 옮긴 멤버) : 디렉터리 DB 의 member_shard
+#   2. 길드 배정 (assign_guild) : 디렉터리 DB 의 guild_shard
+#   3. nick_name 해시 (jump consistent hash : 샤드를 끝에 추가하면 새 샤드로 갈 멤버만 옮겨짐)
+# 샤드마다 풀이 따로 있으므로 한 샤드의 쓰기가 다른 샤드의 쓰기를 막지 않음
+# 샤드 전체 조회 (멤버 찾기, 전체 순위) 는 샤드별로 스레드에서 동시에 실행한 뒤 합침
+# 멤버를 옮기는 동안 shard_of 는 기다리고, 원래 샤드에서 지우기 직전에 쓰기 잠금을 잡고 복사한 뒤 바뀐 멤버를 다시 복사함
+#
+#   router = ShardRouter(["guild_0.db", "guild_1.db"])
+#   router.create_member("User_0001", "Kakao_0001", "20240101", Grant.USER, 0, 10, guild="red")
+#   router.member_gateway("User_0001").update_score(15)
+#   router.run(scripts.update_grant, "User_0001", Grant.ADMIN)      # 트랜잭션 스크립트 (conn, nick_name, ...)
+#   router.top_members(10)
+#
+#   python sharding.py status guild_0.db guild_1.db
+#   python sharding.py rebalance guild_0.db guild_1.db guild_2.db   # 샤드를 추가한 뒤 해시 위치로 옮김
+#   python sharding.py plan guild_0.db guild_1.db guild_2.db        # 옮길 멤버 수만 출력
+
+DEFAULT_DIRECTORY_DB = "shard_directory.db"
+
+# 한 번에 옮기는 멤버 수 (IN 목록 크기)
+MOVE_CHUNK_SIZE = 500
+
+MEMBER_VALUE_COLUMNS = ("kakao_nick_name", "join_date", "grant", "last_login", "score")
+
+def _create_directory(conn):
+    cursor = conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS member_shard (
+            nick_name TEXT PRIMARY KEY,
+            shard TEXT NOT NULL,
+            guild TEXT
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS member_shard_guild ON member_shard (guild)")
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS guild_shard (
+            guild TEXT PRIMARY KEY,
+            shard TEXT NOT NULL
+        )
+    """)
+    conn.commit()
+
+def _chunks(values, size=MOVE_CHUNK_SIZE):
+    values = list(values)
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+def jump_hash(key, buckets):
+    """key(문자열) 를 0 ~ buckets-1 로 (buckets 가 늘어나면 약 1/buckets 만 새 버킷으로 이동)"""
+    value = zlib.crc32(key.encode("utf-8"))
+    bucket, candidate = -1, 0
+    while candidate < buckets:
+        bucket = candidate
+        value = (value * 2862933555777941757 + 1) & 0xFFFFFFFFFFFFFFFF
+        candidate = int((bucket + 1) * ((1 << 31) / ((value >> 33) + 1)))
+    return bucket
+
+def _placeholders(values):
+    return ", ".join("?" * len(values))
+
+class ShardRouter:
+    def __init__(self, shards, directory_db=DEFAULT_DIRECTORY_DB, bootstrap=True, max_workers=None):
+        if not shards:
+            raise ValueError("at least one shard is required.")
+        self.shards = list(shards)
+        self.directory_db = directory_db
+
+        # 디렉터리 (메모리에 전부 올려 두고 바꿀 때 DB 에도 기록)
+        self._placements = {}
+        self._member_guilds = {}
+        self._guilds = {}
+        self._lock = threading.Lock()
+        # 옮기는 중인 멤버 (shard_of 는 옮기기가 끝날 때까지 기다림)
+        self._moving = set()
+        self._moved = threading.Condition(self._lock)
+
+        # 통계
+        self.routed = 0
+        self.fan_outs = 0
+        self.moved = 0
+        self.recopied = 0
+
+        if bootstrap:
+            for shard in self.shards:
+                schema.bootstrap(shard)
+        self._load_directory()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or len(self.shards), thread_name_prefix="shard")
+
+    def _load_directory(self):
+        with get_connection(self.directory_db) as conn:
+            _create_directory(conn)
+            cursor = conn.cursor()
+            cursor.execute("SELECT nick_name, shard, guild FROM member_shard")
+            for nick_name, shard, guild in cursor.fetchall():
+                self._placements[nick_name] = shard
+                if guild is not None:
+                    self._member_guilds[nick_name] = guild
+            cursor.execute("SELECT guild, shard FROM guild_shard")
+            self._guilds = dict(cursor.fetchall())
+
+    def close(self):
+        self._executor.shutdown()
+
+    # 라우팅
+    def home_shard(self, nick_name):
+        """nick_name 해시로 정한 샤드"""
+        return self.shards[jump_hash(nick_name, len(self.shards))]
+
+    def guild_shard(self, guild):
+        shard = self._guilds.get(guild)
+        return shard if shard is not None else self.shards[jump_hash(guild, len(self.shards))]
+
+    def shard_of(self, nick_name, guild=None):
+        self.routed += 1
+        if nick_name in self._moving:
+            with self._moved:
+                while nick_name in self._moving:
+                    self._moved.wait()
+        return self._route(nick_name, guild)
+
+    def _route(self, nick_name, guild=None):
+        shard = self._placements.get(nick_name)
+        if shard is not None:
+            return shard
+        if guild is not None:
+            return self.guild_shard(guild)
+        return self.home_shard(nick_name)
+
+    def assign_guild(self, guild, shard):
+        """길드의 새 멤버가 들어갈 샤드 (이미 있는 멤버는 move_guild 로 옮김)"""
+        if shard not in self.shards:
+            raise ValueError(f"unknown shard '{shard}'.")
+        with get_connection(self.directory_db) as conn:
+            conn.execute("INSERT INTO guild_shard (guild, shard) VALUES (?, ?) "
+                         "ON CONFLICT (guild) DO UPDATE SET shard = excluded.shard", (guild, shard))
+        self._guilds[guild] = shard
+
+    def _place(self, placements):
+        """placements: [(nick_name, shard, guild)] 를 디렉터리에 기록 (해시 위치이고 길드가 없으면 기록을 지움)"""
+        keep = [(nick_name, shard, guild) for nick_name, shard, guild in placements
+                if guild is not None or shard != self.home_shard(nick_name)]
+        drop = [(nick_name,) for nick_name, shard, guild in placements
+                if guild is None and shard == self.home_shard(nick_name)]
+        with get_connection(self.directory_db) as conn:
+            conn.executemany("INSERT INTO member_shard (nick_name, shard, guild) VALUES (?, ?, ?) "
+                             "ON CONFLICT (nick_name) DO UPDATE SET shard = excluded.shard, guild = excluded.guild", keep)
+            conn.executemany("DELETE FROM member_shard WHERE nick_name = ?", drop)
+        with self._lock:
+            for nick_name, shard, guild in keep:
+                self._placements[nick_name] = shard
+                if guild is not None:
+                    self._member_guilds[nick_name] = guild
+            for (nick_name,) in drop:
+                self._placements.pop(nick_name, None)
+                self._member_guilds.pop(nick_name, None)
+
+    # 샤드로 보내는 호출
+    def connection(self, nick_name, guild=None):
+        return get_connection(self.shard_of(nick_name, guild))
+
+    def run(self, func, nick_name, *args, guild=None, **kwargs):
+        """트랜잭션 스크립트 func(conn, nick_name, ...) 를 nick_name 의 샤드에서 실행"""
+        with self.connection(nick_name, guild) as conn:
+            return func(conn, nick_name, *args, **kwargs)
+
+    def member_gateway(self, nick_name):
+        return MemberGateway(self.shard_of(nick_name), nick_name)
+
+    def content_record_gateway(self, table_name, nick_name, day):
+        return ContentRecordGateway(self.shard_of(nick_name), table_name, nick_name, day)
+
+    def member(self, nick_name, kakao_nick_name, join_date=None, grant=None, last_login=None, score=None):
+        return Member(nick_name, kakao_nick_name, join_date, grant, last_login, score, db_name=self.shard_of(nick_name))
+
+    def content_record(self, nick_name, day, score=0, participation_count=0, table_name="raid_20240925"):
+        return ContentRecord(nick_name, day, score, participation_count, self.shard_of(nick_name), table_name)
+
+    def create_member(self, nick_name, kakao_nick_name, join_date, grant, last_login, score, guild=None):
+        """멤버를 샤드에 만들고 샤드 이름을 반환 (guild 가 있으면 길드 샤드에 만들고 배치를 기록)"""
+        shard = self.shard_of(nick_name, guild)
+        if guild is not None or shard != self.home_shard(nick_name):
+            self._place([(nick_name, shard, guild)])
+        MemberGateway(shard, nick_name).create(kakao_nick_name, join_date, grant, last_login, score)
+        return shard
+
+    # 샤드 전체 조회
+    def scatter(self, func):
+        """func(shard) 를 샤드마다 동시에 실행하고 {shard: 결과} 를 반환"""
+        self.fan_outs += 1
+        return dict(zip(self.shards, self._executor.map(func, self.shards)))
+
+    def locate(self, nick_name):
+        """nick_name 이 실제로 들어 있는 샤드 목록 (옮기는 중이면 둘일 수 있음)"""
+        def exists(shard):
+            with get_connection(shard) as conn:
+                return conn.execute("SELECT 1 FROM member WHERE nick_name = ?", (nick_name,)).fetchone() is not None
+        return [shard for shard, found in self.scatter(exists).items() if found]
+
+    def find_member(self, nick_name):
+        """(shard, 행) 을 반환 (배치 기록이 없는 샤드로 옮겨졌으면 전체 샤드에서 찾음, 없으면 None)"""
+        shard = self.shard_of(nick_name)
+        row = select_member(shard, nick_name)
+        if row is not None:
+            return shard, row
+
+        for shard in self.locate(nick_name):
+            return shard, select_member(shard, nick_name)
+        return None
+
+    def find_members(self, lazy=False):
+        """전체 샤드의 Member 를 nick_name 순으로"""
+        results = self.scatter(lambda shard: Finder(shard).find_members(lazy) or [])
+        return list(heapq.merge(*results.values(), key=lambda member: member.nick_name))
+
+    def count_members(self):
+        def count(shard):
+            with get_connection(shard) as conn:
+                return conn.execute("SELECT COUNT(*) FROM member").fetchone()[0]
+        return sum(self.scatter(count).values())
+
+    def _merge_top(self, boards, count, page):
+        # 샤드마다 (page + 1) * count 명씩 받아 점수 내림차순, 같은 점수는 nick_name 순으로 합침
+        stop = (page + 1) * count
+        entries = self.scatter(lambda shard: boards(shard).top(stop))
+        merged = heapq.merge(*entries.values(), key=lambda entry: (-entry[2], entry[1]))
+        start = page * count
+        return [(start + i + 1, nick_name, score)
+                for i, (_, nick_name, score) in enumerate(list(merged)[start:stop])]
+
+    def top_members(self, count=10, page=0):
+        """전체 샤드의 멤버 점수 순위 [(순위, nick_name, 점수)]"""
+        return self._merge_top(rankings.member_board, count, page)
+
+    def top_content(self, content_name, start_date, count=10, page=0):
+        """전체 샤드의 한 기간 점수 합계 순위 [(순위, nick_name, 점수)]"""
+        return self._merge_top(lambda shard: rankings.content_board(content_name, start_date, shard), count, page)
+
+    # 재배치
+    def move_members(self, nick_names, target):
+        """멤버와 컨텐츠 레코드를 target 샤드로 옮기고 옮긴 멤버 수를 반환
+        target 에 복사 -> 디렉터리 기록 -> 원래 샤드에서 삭제 순서이므로 중간에 멈춰도 다시 실행하면 이어서 처리됨"""
+        if target not in self.shards:
+            raise ValueError(f"unknown shard '{target}'.")
+
+        nick_names = list(nick_names)
+        found = self.scatter(lambda shard: _existing(shard, nick_names) if shard != target else set())
+        moved = 0
+        for source, names in found.items():
+            for chunk in _chunks(sorted(names)):
+                moved += self._move_chunk(source, target, chunk)
+        return moved
+
+    def _move_chunk(self, source, target, nick_names):
+        # 옮기는 동안 이 라우터를 거치는 호출은 기다리게 함 (그 전에 라우팅을 받아 둔 쓰기는 삭제 직전에 다시 확인)
+        with self._moved:
+            self._moving.update(nick_names)
+        try:
+            # target 에 이미 있고 라우팅도 target 이면 복사가 끝난 멤버 (그 뒤의 쓰기는 target 에 있으므로 원래 샤드의 행만 지움)
+            in_target = _existing(target, nick_names)
+            leftovers = [nick_name for nick_name in nick_names
+                         if nick_name in in_target and self._route(nick_name, self._member_guilds.get(nick_name)) == target]
+            copying = [nick_name for nick_name in nick_names if nick_name not in leftovers]
+
+            members, records = _read_members(source, copying)
+            if members:
+                _write_members(target, members, records)
+                self._place([(member[0], target, self._member_guilds.get(member[0])) for member in members])
+            self.recopied += _delete_moved(source, target, nick_names, copying, (members, records),
+                                           records.keys() | _record_periods(source, leftovers))
+        finally:
+            with self._moved:
+                self._moving.difference_update(nick_names)
+                self._moved.notify_all()
+        self.moved += len(members)
+        return len(members)
+
+    def move_guild(self, guild, target):
+        """길드를 target 샤드로 배정하고 기존 멤버도 옮김"""
+        self.assign_guild(guild, target)
+        nick_names = [nick_name for nick_name, member_guild in self._member_guilds.items() if member_guild == guild]
+        return self.move_members(nick_names, target)
+
+    def misplaced(self):
+        """지금 라우팅과 다른 샤드에 있는 멤버 {(source, target): [nick_name]} (샤드를 추가/제거한 뒤 등)"""
+        def scan(shard):
+            with get_connection(shard) as conn:
+                return [row[0] for row in conn.execute("SELECT nick_name FROM member")]
+
+        plan = {}
+        for source, nick_names in self.scatter(scan).items():
+            for nick_name in nick_names:
+                target = self.shard_of(nick_name, self._member_guilds.get(nick_name))
+                if target != source:
+                    plan.setdefault((source, target), []).append(nick_name)
+        return plan
+
+    def rebalance(self, dry_run=False):
+        """misplaced() 의 멤버를 라우팅대로 옮기고 {(source, target): 멤버 수} 를 반환"""
+        plan = self.misplaced()
+        if not dry_run:
+            for (source, target), nick_names in plan.items():
+                for chunk in _chunks(nick_names):
+                    self._move_chunk(source, target, chunk)
+        return {route: len(nick_names) for route, nick_names in plan.items()}
+
+    def stats(self):
+        return {"shards": len(self.shards), "placements": len(self._placements), "guilds": len(self._guilds),
+                "routed": self.routed, "fan_outs": self.fan_outs, "moved": self.moved, "recopied": self.recopied}
+
+    def shard_stats(self):
+        def count(shard):
+            with get_connection(shard) as conn:
+                return conn.execute("SELECT COUNT(*) FROM member").fetchone()[0]
+        return self.scatter(count)
+
+# 재배치용 읽기 / 쓰기 (샤드 하나)
+def _existing(db_name, nick_names):
+    """nick_names 중 db_name 의 member 에 있는 것 (set)"""
+    found = set()
+    with get_connection(db_name) as conn:
+        for chunk in _chunks(nick_names):
+            cursor = conn.execute(f"SELECT nick_name FROM member WHERE nick_name IN ({_placeholders(chunk)})", chunk)
+            found.update(row[0] for row in cursor.fetchall())
+    return found
+
+def _record_periods(db_name, nick_names):
+    """nick_names 의 레코드가 있는 기간 {(content_name, start_date)}"""
+    if not nick_names:
+        return set()
+    periods = set()
+    with get_connection(db_name) as conn:
+        if content_store.is_enabled(conn):
+            cursor = conn.execute(f"SELECT DISTINCT content_name, start_date FROM {content_store.CONTENT_RECORD_TABLE} "
+                                  f"WHERE nick_name IN ({_placeholders(nick_names)})", nick_names)
+            return set(cursor.fetchall())
+        for table_name, content_name, start_date in content_store.find_period_tables(conn):
+            cursor = conn.execute(f"SELECT 1 FROM {table_name} WHERE nick_name IN ({_placeholders(nick_names)}) LIMIT 1", nick_names)
+            if cursor.fetchone() is not None:
+                periods.add((content_name, start_date))
+    return periods
+
+def _read_members(db_name, nick_names):
+    """([member 행], {(content_name, start_date): (end_date, [(nick_name, score, participation_count, day)])})"""
+    if not nick_names:
+        return [], {}
+    with get_connection(db_name) as conn:
+        return _read_rows(conn, db_name, nick_names)
+
+def _read_rows(conn, db_name, nick_names):
+    records = {}
+    cursor = conn.cursor()
+    cursor.execute("SELECT nick_name, kakao_nick_name, join_date, grant, last_login, score FROM member "
+                   f"WHERE nick_name IN ({_placeholders(nick_names)})", nick_names)
+    members = cursor.fetchall()
+
+    if content_store.is_enabled(conn):
+        cursor.execute("SELECT content_name, start_date, nick_name, score, participation_count, day "
+                       f"FROM {content_store.CONTENT_RECORD_TABLE} WHERE nick_name IN ({_placeholders(nick_names)})", nick_names)
+        for content_name, start_date, *record in cursor.fetchall():
+            records.setdefault((content_name, start_date), []).append(tuple(record))
+    else:
+        for table_name, content_name, start_date in content_store.find_period_tables(conn):
+            cursor.execute(f"SELECT nick_name, score, participation_count, day FROM {table_name} "
+                           f"WHERE nick_name IN ({_placeholders(nick_names)})", nick_names)
+            rows = cursor.fetchall()
+            if rows:
+                records[(content_name, start_date)] = rows
+
+    # 기간 일정도 함께 옮김 (target 에 기간 테이블을 만들 때 사용)
+    end_dates = {}
+    if records and table_exists(db_name, "content_schedule", conn):
+        cursor.execute("SELECT content_name, start_date, end_date FROM content_schedule")
+        end_dates = {(content_name, start_date): end_date for content_name, start_date, end_date in cursor.fetchall()}
+    return members, {period: (end_dates.get(period), rows) for period, rows in records.items()}
+
+def _rows_by_member(members, records):
+    """{nick_name: (member 행, 정렬한 [(기간, 레코드)])} (복사한 뒤 바뀌었는지 비교할 때 사용)"""
+    rows = {member[0]: (tuple(member), []) for member in members}
+    for period, (_, period_rows) in records.items():
+        for row in period_rows:
+            rows.setdefault(row[0], (None, []))[1].append((period, tuple(row)))
+    return {nick_name: (member, sorted(member_records)) for nick_name, (member, member_records) in rows.items()}
+
+def _write_members(db_name, members, records, nick_names=None):
+    """nick_names(기본은 members 의 nick_name) 의 멤버 / 레코드를 members, records 로 바꿈"""
+    if nick_names is None:
+        nick_names = [member[0] for member in members]
+    with get_connection(db_name) as conn:
+        use_store = content_store.is_enabled(conn)
+        scheduled = set()
+        if table_exists(db_name, "content_schedule", conn):
+            scheduled = set(conn.execute("SELECT content_name, start_date FROM content_schedule").fetchall())
+
+    # 없는 기간 테이블은 만들고, 일정이 없으면 함께 등록 (이미 있는 테이블은 그대로 사용)
+    for (content_name, start_date), (end_date, _) in records.items():
+        missing_table = not use_store and not table_exists(db_name, content_store.period_table_name(content_name, start_date))
+        missing_schedule = end_date is not None and (content_name, start_date) not in scheduled
+        if missing_table or (use_store and missing_schedule):
+            schema.create_content_table(db_name, content_name, start_date, end_date)
+        elif missing_schedule:
+            with get_connection(db_name) as conn:
+                conn.execute("INSERT INTO content_schedule (content_name, start_date, end_date) VALUES (?, ?, ?)",
+                             (content_name, start_date, end_date))
+            schedule.invalidate(db_name)
+
+    # 멤버, 레코드, 쓰기 이벤트를 하나의 트랜잭션으로 (batch_writer 는 스스로 커밋하므로 쓰지 않음)
+    with get_connection(db_name) as conn:
+        cursor = conn.cursor()
+        # 다시 실행해도 같은 결과가 되도록 지우고 넣음
+        cursor.executemany(batch_writer.insert_member_sql(upsert=True), members)
+        copied = {member[0] for member in members}
+        gone = [nick_name for nick_name in nick_names if nick_name not in copied]
+        if gone:
+            cursor.execute(f"DELETE FROM member WHERE nick_name IN ({_placeholders(gone)})", gone)
+        for (content_name, start_date), (_, rows) in records.items():
+            if use_store:
+                cursor.execute(f"DELETE FROM {content_store.CONTENT_RECORD_TABLE} WHERE content_name = ? AND start_date = ? "
+                               f"AND nick_name IN ({_placeholders(nick_names)})", (content_name, start_date, *nick_names))
+                cursor.executemany(content_store.insert_sql(), ((content_name, start_date, *row) for row in rows))
+            else:
+                table_name = content_store.period_table_name(content_name, start_date)
+                cursor.execute(f"DELETE FROM {table_name} WHERE nick_name IN ({_placeholders(nick_names)})", nick_names)
+                cursor.executemany(content_record_sql(conn, "insert", table_name), rows)
+
+        for member in members:
+            publish_member(db_name, "insert", member[0], dict(zip(MEMBER_VALUE_COLUMNS, member[1:])))
+        for nick_name in gone:
+            publish_member(db_name, "delete", nick_name)
+        for content_name, start_date in records:
+            publish_content_record(db_name, "bulk", content_name, start_date)
+
+def _delete_moved(source, target, nick_names, copying, copied, periods):
+    """source 의 쓰기 잠금을 잡은 채 복사한 뒤 바뀐 멤버를 target 에 다시 복사하고 source 에서 지움
+    (복사와 삭제 사이에 source 로 들어온 쓰기를 잃지 않도록), 다시 복사한 멤버 수를 반환"""
+    with get_connection(source) as conn:
+        if not conn.in_transaction:
+            conn.execute("BEGIN IMMEDIATE")
+        current = _read_rows(conn, source, copying) if copying else ([], {})
+        before, after = _rows_by_member(*copied), _rows_by_member(*current)
+        changed = sorted(nick_name for nick_name in before.keys() | after.keys() if before.get(nick_name) != after.get(nick_name))
+        if changed:
+            members, records = current
+            changed_set = set(changed)
+            # 레코드가 모두 지워진 기간도 target 에서 지우도록 복사했던 기간을 함께 넘김
+            end_dates = {period: end_date for period, (end_date, _) in copied[1].items()}
+            end_dates.update({period: end_date for period, (end_date, _) in records.items()})
+            changed_records = {period: (end_date, [row for row in records.get(period, (None, []))[1] if row[0] in changed_set])
+                               for period, end_date in end_dates.items()}
+            _write_members(target, [member for member in members if member[0] in changed_set], changed_records, changed)
+            periods = periods | records.keys()
+        _delete_members(source, nick_names, periods)
+    return len(changed)
+
+def _delete_members(db_name, nick_names, periods):
+    with get_connection(db_name) as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"DELETE FROM member WHERE nick_name IN ({_placeholders(nick_names)})", nick_names)
+        use_store = content_store.is_enabled(conn)
+        for content_name, start_date in periods:
+            if use_store:
+                cursor.execute(f"DELETE FROM {content_store.CONTENT_RECORD_TABLE} WHERE content_name = ? AND start_date = ? "
+                               f"AND nick_name IN ({_placeholders(nick_names)})", (content_name, start_date, *nick_names))
+            else:
+                table_name = content_store.period_table_name(content_name, start_date)
+                cursor.execute(f"DELETE FROM {table_name} WHERE nick_name IN ({_placeholders(nick_names)})", nick_names)
+
+        for nick_name in nick_names:
+            publish_member(db_name, "delete", nick_name)
+        for content_name, start_date in periods:
+            publish_content_record(db_name, "bulk", content_name, start_date)
+
+def main():
+    if len(sys.argv) < 3 or sys.argv[1] not in ("status", "plan", "rebalance"):
+        print("usage: python sharding.py [status|plan|rebalance] shard.db [shard.db ...]")
+        return
+
+    command, shards = sys.argv[1], sys.argv[2:]
+    router = ShardRouter(shards)
+    try:
+        if command == "status":
+            for shard, count in router.shard_stats().items():
+                print(f"{shard}: {count} members")
+            print(router.stats())
+        else:
+            plan = router.rebalance(dry_run=command == "plan")
+            for (source, target), count in sorted(plan.items()):
+                print(f"{source} -> {target}: {count} members")
+            print(f"{sum(plan.values())} members {'to move' if command == 'plan' else 'moved'}")
+    finally:
+        router.close()
+
+if __name__ == "__main__":
+    main()
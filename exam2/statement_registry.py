@@ -0,0 +1,88 @@
+import re
+import sqlite3
+import threading
+
+from connection_pool import STATEMENT_CACHE_SIZE
+from schema_cache import table_exists
+
+# 기간별 컨텐츠 테이블용 SQL 문장 레지스트리
+# 테이블 이름은 이름 규칙과 스키마로 한 번 검증한 뒤에만 SQL 에 넣고,
+# 문장 텍스트는 (작업, 테이블) 마다 한 번만 만들어 재사용
+# 같은 텍스트를 계속 쓰므로 sqlite3 의 prepared statement 캐시(cached_statements)에서 재사용됨
+
+# 기간별 테이블 이름 규칙 (예: raid_20240925)
+PERIOD_TABLE_PATTERN = re.compile(r"^(?P<content_name>[A-Za-z][A-Za-z0-9]*)_(?P<start_date>\d{8})$")
+
+# 작업별 문장 템플릿
+CONTENT_RECORD_STATEMENTS = {
+    "find": "SELECT score, participation_count, day FROM {table} WHERE nick_name = ?",
+    "scan": "SELECT nick_name, score, participation_count, day FROM {table}",
+    "find_day": "SELECT score, participation_count, day FROM {table} WHERE nick_name = ? AND day = ?",
+    "insert": "INSERT INTO {table} (nick_name, score, participation_count, day) VALUES (?, ?, ?, ?)",
+    "upsert": ("INSERT INTO {table} (nick_name, score, participation_count, day) VALUES (?, ?, ?, ?)"
+               " ON CONFLICT(nick_name, day) DO UPDATE SET"
+               " score = excluded.score, participation_count = excluded.participation_count"),
+    "update": "UPDATE {table} SET score = ?, participation_count = ? WHERE nick_name = ?",
+    "update_day": "UPDATE {table} SET score = ?, participation_count = ? WHERE nick_name = ? AND day = ?",
+    "delete_day": "DELETE FROM {table} WHERE nick_name = ? AND day = ?",
+}
+
+# 이름 규칙에 맞지 않거나 스키마에 없는 테이블 (기존과 같이 sqlite3.Error 로 잡을 수 있도록 상속)
+class UnknownTableError(sqlite3.OperationalError):
+    pass
+
+class StatementRegistry:
+    def __init__(self, templates=CONTENT_RECORD_STATEMENTS):
+        self.templates = templates
+
+        self._statements = {}
+        self._lock = threading.Lock()
+
+        # 통계
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+
+    def sql(self, conn, operation, table_name):
+        """검증된 table_name 에 대한 operation 문장 텍스트"""
+        key = (operation, table_name)
+        sql = self._statements.get(key)
+        if sql is None:
+            if operation not in self.templates:
+                raise ValueError(f"Unknown content record operation '{operation}'.")
+            if not PERIOD_TABLE_PATTERN.match(table_name):
+                self.rejected += 1
+                raise UnknownTableError(f"'{table_name}' is not a content period table name.")
+            with self._lock:
+                sql = self._statements.setdefault(key, self.templates[operation].format(table=table_name))
+                self.misses += 1
+        else:
+            self.hits += 1
+
+        # 스키마 확인 (풀 커넥션이면 스키마 캐시 조회로 끝남, 아니면 실행 시 sqlite 가 확인)
+        db_name = getattr(conn, "db_name", None)
+        if db_name is not None and not table_exists(db_name, table_name, conn):
+            self.rejected += 1
+            raise UnknownTableError(f"no such table: {table_name}")
+        return sql
+
+    def clear(self):
+        with self._lock:
+            self._statements.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "statements": len(self._statements),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "rejected": self.rejected,
+                "statement_cache_size": STATEMENT_CACHE_SIZE,
+            }
+
+statements = StatementRegistry()
+
+def content_record_sql(conn, operation, table_name):
+    return statements.sql(conn, operation, table_name)
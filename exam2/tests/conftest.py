@@ -0,0 +1,35 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# exam2 모듈은 같은 디렉터리의 모듈을 바로 import 하므로 상위 디렉터리를 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from connection_pool import close_all_pools
+from member_cache import member_cache
+from leaderboard import rankings
+import write_queue
+
+@pytest.fixture
+def db_name(tmp_path):
+    """멤버 5 명과 raid 기간 테이블 하나가 있는 임시 DB"""
+    db_name = str(tmp_path / "MemberManagement.db")
+    conn = sqlite3.connect(db_name)
+    conn.execute("CREATE TABLE member (nick_name TEXT PRIMARY KEY, kakao_nick_name TEXT, join_date TEXT, grant INTEGER, last_login INTEGER, score INTEGER)")
+    conn.execute("CREATE TABLE content_schedule (content_name TEXT, start_date TEXT, end_date TEXT)")
+    conn.execute("CREATE TABLE raid_20240925 (nick_name TEXT, score INTEGER, participation_count INTEGER, day INTEGER)")
+    conn.executemany("INSERT INTO member VALUES (?, ?, ?, ?, ?, ?)",
+                     [(f"User_{i}", f"Kakao_{i}", "20240101", 2, 0, i * 10) for i in range(5)])
+    conn.executemany("INSERT INTO raid_20240925 VALUES (?, ?, ?, ?)", [(f"User_{i}", i, 1, 1) for i in range(5)])
+    conn.execute("INSERT INTO content_schedule VALUES ('raid', '20240925', '20241001')")
+    conn.commit()
+    conn.close()
+
+    yield db_name
+
+    write_queue.disable_write_queue(db_name)
+    member_cache.clear(db_name)
+    rankings.invalidate(db_name)
+    close_all_pools()
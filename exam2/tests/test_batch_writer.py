@@ -0,0 +1,55 @@
+import sqlite3
+
+import pytest
+
+from connection_pool import get_connection
+from permissions import Grant
+import batch_writer
+import transaction_script_func_base as scripts
+
+def members(db_name):
+    with get_connection(db_name) as conn:
+        return conn.execute("SELECT nick_name, grant, last_login, score FROM member ORDER BY nick_name").fetchall()
+
+def test_chunked_splits_rows():
+    assert list(batch_writer.chunked(range(5), 2)) == [[0, 1], [2, 3], [4]]
+    with pytest.raises(ValueError):
+        list(batch_writer.chunked(range(5), 0))
+
+def test_insert_returns_row_count_across_chunks(db_name):
+    rows = [(f"New_{i}", "Kakao", "20240101", Grant.USER, 0, i) for i in range(7)]
+    with get_connection(db_name) as conn:
+        assert scripts.create_members(conn, rows, chunk_size=3) == 7
+    assert len(members(db_name)) == 12
+    # Grant 는 DB 값으로 저장
+    assert ("New_6", 2, 0, 6) in members(db_name)
+
+def test_duplicate_rolls_back_whole_batch(db_name):
+    rows = [("New_0", "Kakao", "20240101", 2, 0, 1), ("User_0", "Kakao", "20240101", 2, 0, 1)]
+    with get_connection(db_name) as conn:
+        with pytest.raises(sqlite3.IntegrityError):
+            batch_writer.insert_members(conn, rows, chunk_size=1)
+    assert len(members(db_name)) == 5
+
+def test_upsert_updates_existing_members(db_name):
+    rows = [("User_0", "Kakao_0", "20240101", 1, 3, 9), ("New_0", "Kakao", "20240101", 2, 0, 1)]
+    with get_connection(db_name) as conn:
+        assert scripts.create_members(conn, rows, upsert=True) == 2
+    result = members(db_name)
+    assert ("User_0", 1, 3, 9) in result and ("New_0", 2, 0, 1) in result
+    assert len(result) == 6
+
+def test_update_and_delete_members(db_name):
+    with get_connection(db_name) as conn:
+        assert scripts.update_members(conn, [("User_1", 0, 2, 3), ("User_2", 1, 4, 5)], chunk_size=1) == 2
+        assert scripts.delete_members(conn, ["User_3", "User_4"]) == 2
+    assert members(db_name) == [("User_0", 2, 0, 0), ("User_1", 0, 2, 3), ("User_2", 1, 4, 5)]
+
+def test_content_record_upsert(db_name):
+    with get_connection(db_name) as conn:
+        conn.execute("CREATE UNIQUE INDEX raid_20240925_nick_name_day ON raid_20240925 (nick_name, day)")
+        conn.commit()
+        records = [("User_0", 7, 2, 1), ("User_0", 3, 1, 2)]
+        assert scripts.insert_content_records(conn, "raid", "20240925", records, upsert=True) == 2
+        rows = conn.execute("SELECT score, participation_count, day FROM raid_20240925 WHERE nick_name = 'User_0' ORDER BY day").fetchall()
+    assert rows == [(7, 2, 1), (3, 1, 2)]
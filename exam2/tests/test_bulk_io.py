@@ -0,0 +1,66 @@
+import sqlite3
+
+import pytest
+
+from connection_pool import get_connection
+import bulk_io
+from write_queue import enable_write_queue
+import schema
+
+def write_roster(path, names):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("nick_name,kakao_nick_name,join_date,grant,last_login,score\n")
+        for name in names:
+            file.write(f"{name},Kakao,20240101,USER,0,1\n")
+
+def member_count(db_name):
+    with get_connection(db_name) as conn:
+        return conn.execute("SELECT COUNT(*) FROM member").fetchone()[0]
+
+@pytest.mark.parametrize("queued", [False, True])
+def test_failed_import_keeps_nothing(db_name, tmp_path, queued):
+    if queued:
+        enable_write_queue(db_name)
+    path = str(tmp_path / "roster.csv")
+    # 두 번째 청크의 중복 nick_name 에서 실패
+    write_roster(path, ["New_0", "New_1", "New_2", "User_0"])
+
+    with pytest.raises(sqlite3.IntegrityError):
+        bulk_io.import_members(db_name, path, chunk_size=2)
+    assert member_count(db_name) == 5
+
+@pytest.mark.parametrize("queued", [False, True])
+def test_import_commits_all_chunks(db_name, tmp_path, queued):
+    if queued:
+        enable_write_queue(db_name)
+    path = str(tmp_path / "roster.csv")
+    write_roster(path, [f"New_{i}" for i in range(5)])
+
+    stats = bulk_io.import_members(db_name, path, chunk_size=2)
+    assert stats.rows == 5 and stats.rejected == 0
+    assert member_count(db_name) == 10
+
+def all_rows(db_name):
+    with get_connection(db_name) as conn:
+        members = conn.execute("SELECT * FROM member ORDER BY nick_name").fetchall()
+        records = conn.execute("SELECT * FROM raid_20240925 ORDER BY nick_name, day").fetchall()
+    return members, records
+
+@pytest.mark.parametrize("file_format", ["csv", "columnar"])
+def test_export_import_round_trip(db_name, tmp_path, file_format):
+    with get_connection(db_name) as conn:
+        # 가져올 때 점수를 0 ~ 15 로 맞추므로 원본도 범위 안으로
+        conn.execute("UPDATE member SET score = MIN(score, 15)")
+        # 한글 이름, ADMIN 권한, 여러 day 도 그대로 옮겨지는지
+        conn.execute("INSERT INTO member VALUES ('멤버', '카카오', '20240102', 0, 3, 15)")
+        conn.execute("INSERT INTO raid_20240925 VALUES ('User_0', 0, 2, 3)")
+    members_path = str(tmp_path / f"members.{file_format}")
+    records_path = str(tmp_path / f"records.{file_format}")
+    assert bulk_io.export_members(db_name, members_path, file_format, chunk_size=2).rows == 6
+    assert bulk_io.export_content_records(db_name, records_path, file_format, chunk_size=2).rows == 6
+
+    copy = str(tmp_path / "copy.db")
+    schema.create_content_table(copy, "raid", "20240925", "20241001")
+    assert bulk_io.import_members(copy, members_path, chunk_size=2).rows == 6
+    assert bulk_io.import_content_records(copy, records_path, chunk_size=2).rows == 6
+    assert all_rows(copy) == all_rows(db_name)
@@ -0,0 +1,70 @@
+import pytest
+
+from connection_pool import get_connection
+import change_feed
+import schema
+import transaction_script_func_base as scripts
+from unit_of_work import UnitOfWork
+import row_data_gateway
+
+@pytest.fixture
+def feed_db(db_name):
+    schema.bootstrap(db_name)
+    return db_name
+
+def test_writes_are_recorded_in_order(feed_db):
+    with get_connection(feed_db) as conn:
+        scripts.update_score(conn, "User_1", 11)
+        scripts.insert_content_record(conn, "raid", "20240925", "User_1", 5, 1, 2)
+        scripts.delete_member(conn, "User_2")
+
+    changes = change_feed.read_changes(feed_db)
+    assert [(c.table, c.op) for c in changes] == [("member", "update"), ("content_record", "insert"), ("member", "delete")]
+    assert changes[0].key == "User_1" and changes[0].values == {"score": 11}
+    assert changes[1].key == ("raid", "20240925", "User_1", 2)
+    assert [c.seq for c in changes] == sorted(c.seq for c in changes)
+
+def test_no_op_and_rolled_back_writes_are_not_recorded(feed_db):
+    with get_connection(feed_db) as conn:
+        scripts.update_score(conn, "ghost", 1)
+    with pytest.raises(RuntimeError):
+        with get_connection(feed_db) as conn:
+            conn.execute("UPDATE member SET score = 0 WHERE nick_name = 'User_0'")
+            scripts.publish_member_write(conn, "update", "User_0", {"score": 0})
+            raise RuntimeError("abort")
+    assert change_feed.read_changes(feed_db) == []
+
+def test_unit_of_work_records_with_its_commit(feed_db):
+    finder = row_data_gateway.Finder(feed_db)
+    with UnitOfWork(feed_db) as uow:
+        for i in range(3):
+            member = row_data_gateway.Member(f"User_{i}", *finder.find_member(f"User_{i}"), db_name=feed_db)
+            member.score = 1
+            member.update(uow)
+    assert len(change_feed.read_changes(feed_db)) == 3
+
+def test_consumer_resumes_from_commit(feed_db):
+    consumer = change_feed.ChangeConsumer(feed_db, "test", batch_size=2)
+    with get_connection(feed_db) as conn:
+        for i in range(3):
+            scripts.update_last_login(conn, f"User_{i}", 7)
+
+    first = consumer.poll()
+    assert len(first) == 2
+    # commit 하기 전에는 같은 묶음을 다시 받음
+    assert consumer.poll() == first
+    consumer.commit()
+
+    again = change_feed.ChangeConsumer(feed_db, "test", batch_size=2)
+    assert [c.key for c in again.poll()] == ["User_2"]
+
+def test_compact_marks_lagging_consumer_for_rescan(feed_db):
+    consumer = change_feed.ChangeConsumer(feed_db, "slow")
+    with get_connection(feed_db) as conn:
+        for i in range(5):
+            scripts.update_last_login(conn, f"User_{i}", 3)
+
+    assert change_feed.compact(feed_db, retain_seconds=0, max_events=2) == 3
+    changes = consumer.poll()
+    assert consumer.needs_rescan
+    assert [c.key for c in changes] == ["User_3", "User_4"]
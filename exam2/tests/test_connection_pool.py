@@ -0,0 +1,76 @@
+import sqlite3
+import threading
+
+import pytest
+
+from connection_pool import PoolTimeoutError, configure_pool, get_connection
+
+def member_score(db_name, nick_name):
+    with get_connection(db_name) as conn:
+        return conn.execute("SELECT score FROM member WHERE nick_name = ?", (nick_name,)).fetchone()[0]
+
+def test_nested_checkout_shares_connection_and_commits_once(db_name):
+    with get_connection(db_name) as outer:
+        outer.execute("UPDATE member SET score = 99 WHERE nick_name = 'User_0'")
+        with get_connection(db_name) as inner:
+            assert inner is outer
+        # 안쪽 블록이 끝나도 커밋되지 않음
+        assert outer.raw.in_transaction
+    assert member_score(db_name, "User_0") == 99
+
+def test_exception_rolls_back(db_name):
+    with pytest.raises(ValueError):
+        with get_connection(db_name) as conn:
+            conn.execute("UPDATE member SET score = 99 WHERE nick_name = 'User_0'")
+            raise ValueError("boom")
+    assert member_score(db_name, "User_0") == 0
+
+def test_dead_owner_connection_is_reclaimed(db_name):
+    pool = configure_pool(db_name, size=1, timeout=1.0)
+
+    def leak():
+        # 반환하지 않고 스레드 종료 (쓰기 트랜잭션도 열어 둠)
+        conn = get_connection(db_name)
+        conn.execute("UPDATE member SET score = 99 WHERE nick_name = 'User_0'")
+
+    thread = threading.Thread(target=leak)
+    thread.start()
+    thread.join()
+    assert pool.stats()["in_use"] == 1
+
+    with pytest.warns(ResourceWarning):
+        with get_connection(db_name) as conn:
+            assert conn.execute("SELECT score FROM member WHERE nick_name = 'User_0'").fetchone()[0] == 0
+    stats = pool.stats()
+    assert stats["leaks_detected"] == 1 and stats["in_use"] == 0 and stats["created"] == 1
+
+def test_check_leaks_reports_long_checkout(db_name):
+    pool = configure_pool(db_name, size=2, leak_timeout=0.0)
+    conn = get_connection(db_name)
+    try:
+        with pytest.warns(ResourceWarning):
+            assert pool.check_leaks() == [conn]
+    finally:
+        conn.close()
+    assert pool.check_leaks() == []
+
+def test_exhausted_pool_times_out(db_name):
+    configure_pool(db_name, size=1, timeout=0.1)
+    held = threading.Event()
+    done = threading.Event()
+
+    def hold():
+        with get_connection(db_name):
+            held.set()
+            done.wait(5)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    try:
+        held.wait(5)
+        with pytest.raises(PoolTimeoutError) as info:
+            get_connection(db_name)
+        assert isinstance(info.value, sqlite3.OperationalError)
+    finally:
+        done.set()
+        thread.join()
@@ -0,0 +1,48 @@
+import random
+from datetime import date, timedelta
+
+from connection_pool import get_connection
+from content_schedule import Period, ScheduleIndex, ScheduleService
+# 처음 사용할 때 스키마를 확인하도록 등록 (일정 버전 트리거는 마이그레이션으로 생성)
+import schema
+
+def day(offset):
+    return (date(2024, 1, 1) + timedelta(offset)).strftime("%Y%m%d")
+
+def brute_force(index, content_name, on_date):
+    # 날짜를 포함하는 기간 중 시작일이 가장 늦은 것
+    candidates = sorted(period for period in index.periods(content_name) if period.contains(on_date))
+    return candidates[-1] if candidates else None
+
+def test_find_matches_brute_force():
+    rng = random.Random(1)
+    for _ in range(200):
+        rows = []
+        for _ in range(rng.randint(0, 15)):
+            start = rng.randint(0, 60)
+            # 끝이 시작보다 앞선(잘못된) 기간도 섞음
+            rows.append((rng.choice("ab"), day(start), day(start + rng.randint(-2, 20))))
+        index = ScheduleIndex(rows)
+        for offset in range(-3, 90):
+            for content_name in "abc":
+                assert index.find(content_name, day(offset)) == brute_force(index, content_name, day(offset))
+
+def test_overlapping_periods_prefer_latest_start():
+    index = ScheduleIndex([("raid", "20240901", "20240930"), ("raid", "20240910", "20240915")])
+    assert index.find("raid", "20240912") == Period("raid", "20240910", "20240915")
+    assert index.find("raid", "20240920") == Period("raid", "20240901", "20240930")
+    assert index.find("raid", "20241001") is None
+
+def test_service_sees_schedule_changes(db_name):
+    # 매번 버전을 확인하도록
+    service = ScheduleService(revalidate_interval=0)
+    assert service.active_period(db_name, "raid", "20240928") == Period("raid", "20240925", "20241001")
+    with get_connection(db_name) as conn:
+        conn.execute("INSERT INTO content_schedule VALUES ('raid', '20240927', '20241003')")
+    assert service.active_period(db_name, "raid", "20240928") == Period("raid", "20240927", "20241003")
+    with get_connection(db_name) as conn:
+        conn.execute("DELETE FROM content_schedule WHERE start_date = '20240927'")
+    assert service.active_period(db_name, "raid", "20240928") == Period("raid", "20240925", "20241001")
+    # 버전이 그대로면 다시 읽지 않음
+    service.active_period(db_name, "raid", "20240928")
+    assert service.stats()["loads"] == 3
@@ -0,0 +1,49 @@
+from connection_pool import get_connection
+import content_store
+import transaction_script_func_base as scripts
+
+def store_rows(db_name):
+    with get_connection(db_name) as conn:
+        return conn.execute("SELECT content_name, start_date, nick_name, day, score, participation_count "
+                            "FROM content_record ORDER BY nick_name, day").fetchall()
+
+def test_migrate_period_tables_moves_rows(db_name):
+    with get_connection(db_name) as conn:
+        # 같은 (nick_name, day) 가 여러 번 있으면 마지막 행이 남음
+        conn.execute("INSERT INTO raid_20240925 VALUES ('User_0', 50, 2, 1)")
+        conn.commit()
+        assert not content_store.is_enabled(conn)
+
+    assert content_store.migrate_period_tables(db_name) == {"raid_20240925": 6}
+    rows = store_rows(db_name)
+    assert len(rows) == 5
+    assert rows[0] == ("raid", "20240925", "User_0", 1, 50, 2)
+    with get_connection(db_name) as conn:
+        assert content_store.is_enabled(conn)
+        kind = conn.execute("SELECT type FROM sqlite_master WHERE name = 'raid_20240925'").fetchone()[0]
+    assert kind == "view"
+
+def test_compat_view_triggers_write_to_store(db_name):
+    content_store.migrate_period_tables(db_name)
+    with get_connection(db_name) as conn:
+        conn.execute("INSERT INTO raid_20240925 (nick_name, score, participation_count, day) VALUES ('User_0', 9, 1, 2)")
+        conn.execute("UPDATE raid_20240925 SET score = 8 WHERE nick_name = 'User_1' AND day = 1")
+        conn.execute("DELETE FROM raid_20240925 WHERE nick_name = 'User_2'")
+        conn.commit()
+        assert content_store.find_records(conn, "raid", "20240925", "User_0") == [(0, 1, 1), (9, 1, 2)]
+        assert content_store.find_records(conn, "raid", "20240925", "User_1") == [(8, 1, 1)]
+        assert content_store.find_records(conn, "raid", "20240925", "User_2") == []
+        # 뷰로 읽어도 같은 결과
+        assert conn.execute("SELECT COUNT(*) FROM raid_20240925").fetchone()[0] == 5
+
+def test_scripts_use_store_after_migration(db_name):
+    content_store.migrate_period_tables(db_name, keep_compat_views=False)
+    with get_connection(db_name) as conn:
+        assert conn.execute("SELECT name FROM sqlite_master WHERE name = 'raid_20240925'").fetchone() is None
+        scripts.insert_content_records(conn, "raid", "20240925", [("User_0", 4, 1, 3)])
+        assert content_store.find_records(conn, "raid", "20240925", "User_0") == [(0, 1, 1), (4, 1, 3)]
+
+def test_migrate_twice_is_noop(db_name):
+    content_store.migrate_period_tables(db_name)
+    assert content_store.migrate_period_tables(db_name) == {}
+    assert len(store_rows(db_name)) == 5
@@ -0,0 +1,54 @@
+from connection_pool import get_connection
+from leaderboard import Leaderboard, OrderStatisticList, rankings
+import transaction_script_func_base as scripts
+
+def test_order_statistic_list():
+    order = OrderStatisticList()
+    for key in (5, 1, 4, 2, 3):
+        order.insert(key)
+    assert order.slice(0, 5) == [1, 2, 3, 4, 5]
+    assert order.index(4) == 3
+    order.remove(1)
+    assert order.slice(0, 2) == [2, 3]
+
+def test_rank_top_and_around():
+    board = Leaderboard()
+    board.load([("a", 10), ("b", 30), ("c", 20), ("d", 20)])
+    assert board.top(2) == [(1, "b", 30), (2, "c", 20)]
+    assert board.rank_of("d") == 3
+    assert board.around("c", radius=1) == [(1, "b", 30), (2, "c", 20), (3, "d", 20)]
+
+    board.add_score("a", 25)
+    assert board.rank_of("a") == 1
+    board.remove("b")
+    assert board.rank_of("b") is None and len(board) == 3
+
+def test_member_board_follows_writes(db_name):
+    board = rankings.member_board(db_name)
+    assert board.top(1) == [(1, "User_4", 40)]
+
+    with get_connection(db_name) as conn:
+        scripts.update_score(conn, "User_0", 100)
+        scripts.delete_member(conn, "User_4")
+    assert board.rank_of("User_0") == 1
+    assert "User_4" not in board
+    assert rankings.member_board(db_name) is board
+
+def test_update_of_missing_member_is_ignored(db_name):
+    board = rankings.member_board(db_name)
+    with get_connection(db_name) as conn:
+        scripts.update_score(conn, "ghost", 500)
+    assert "ghost" not in board
+
+def test_content_board_sums_scores(db_name):
+    board = rankings.content_board("raid", "20240925", db_name)
+    assert board.score_of("User_3") == 3
+
+    with get_connection(db_name) as conn:
+        scripts.insert_content_record(conn, "raid", "20240925", "User_3", 7, 1, 2)
+    assert board.score_of("User_3") == 10
+
+    # 수정은 이전 점수를 모르므로 다음 조회 때 다시 만듦
+    with get_connection(db_name) as conn:
+        scripts.update_content_record(conn, "raid", "20240925", "User_3", 1, 1, 2)
+    assert rankings.content_board("raid", "20240925", db_name).score_of("User_3") == 4
@@ -0,0 +1,36 @@
+from datetime import date
+
+from connection_pool import get_connection
+import login_aging
+# 처음 사용할 때 스키마를 확인하도록 등록 (login_aging 테이블은 마이그레이션으로 생성)
+import schema
+
+def last_logins(db_name):
+    with get_connection(db_name) as conn:
+        return [row[0] for row in conn.execute("SELECT last_login FROM member ORDER BY nick_name")]
+
+def age(db_name, today):
+    with get_connection(db_name) as conn:
+        return login_aging.age_members(conn, today)
+
+def test_rerun_on_same_day_is_noop(db_name):
+    assert age(db_name, date(2024, 10, 1)) == (1, 5)
+    assert age(db_name, date(2024, 10, 1)) == (0, 0)
+    assert last_logins(db_name) == [1] * 5
+    assert [row[:3] for row in login_aging.status(db_name)] == [("20241001", 1, 5)]
+
+def test_catches_up_missed_days(db_name):
+    age(db_name, date(2024, 10, 1))
+    assert age(db_name, date(2024, 10, 4)) == (3, 5)
+    assert last_logins(db_name) == [4] * 5
+    # 이미 반영한 날보다 이전 날짜로 실행해도 바뀌지 않음
+    assert age(db_name, date(2024, 10, 2)) == (0, 0)
+    assert last_logins(db_name) == [4] * 5
+
+def test_run_skips_null_last_login(db_name):
+    with get_connection(db_name) as conn:
+        conn.execute("UPDATE member SET last_login = NULL WHERE nick_name = 'User_0'")
+    days, members, _ = login_aging.run(db_name, today=date(2024, 10, 1))
+    assert (days, members) == (1, 4)
+    assert login_aging.run(db_name, today=date(2024, 10, 1))[:2] == (0, 0)
+    assert last_logins(db_name) == [None, 1, 1, 1, 1]
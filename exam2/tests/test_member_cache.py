@@ -0,0 +1,75 @@
+import threading
+import time
+
+from connection_pool import get_connection
+from member_cache import MemberCache, member_cache
+import transaction_script_func_base as scripts
+
+def test_get_loads_once_then_hits():
+    cache = MemberCache()
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return ("Kakao", "20240101", 2, 0, 10)
+
+    assert cache.get("db", "User_0", loader) == ("Kakao", "20240101", 2, 0, 10)
+    assert cache.get("db", "User_0", loader) == ("Kakao", "20240101", 2, 0, 10)
+    assert len(calls) == 1
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+def test_missing_member_is_not_cached():
+    cache = MemberCache()
+    assert cache.get("db", "nobody", lambda: None) is None
+    assert cache.stats()["size"] == 0
+
+def test_lru_eviction_and_ttl():
+    cache = MemberCache(max_size=2, ttl=0.05)
+    for name in ("a", "b", "c"):
+        cache.put("db", name, (name,))
+    assert cache.stats()["evictions"] == 1
+    assert cache.get("db", "a", lambda: ("reloaded",)) == ("reloaded",)
+
+    time.sleep(0.06)
+    assert cache.get("db", "c", lambda: ("fresh",)) == ("fresh",)
+    assert cache.stats()["expirations"] == 1
+
+def test_invalidate_during_load_skips_stale_put():
+    cache = MemberCache()
+    loading = threading.Event()
+    release = threading.Event()
+
+    def slow_loader():
+        loading.set()
+        release.wait(5)
+        return ("stale",)
+
+    reader = threading.Thread(target=cache.get, args=("db", "User_0", slow_loader))
+    reader.start()
+    loading.wait(5)
+    cache.invalidate("db", "User_0")
+    release.set()
+    reader.join()
+
+    assert cache.get("db", "User_0", lambda: ("fresh",)) == ("fresh",)
+
+def test_write_invalidates_shared_cache(db_name):
+    with get_connection(db_name) as conn:
+        assert scripts.find_member(conn, "User_1")[4] == 10
+        scripts.update_score(conn, "User_1", 99)
+        assert scripts.find_member(conn, "User_1")[4] == 99
+    assert member_cache.stats()["invalidations"] >= 1
+
+def test_rolled_back_write_keeps_cache(db_name):
+    with get_connection(db_name) as conn:
+        scripts.find_member(conn, "User_2")
+    try:
+        with get_connection(db_name) as conn:
+            conn.execute("UPDATE member SET score = 77 WHERE nick_name = 'User_2'")
+            scripts.publish_member_write(conn, "update", "User_2", {"score": 77})
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+
+    with get_connection(db_name) as conn:
+        assert scripts.find_member(conn, "User_2")[4] == 20
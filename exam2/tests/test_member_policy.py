@@ -0,0 +1,47 @@
+from connection_pool import get_connection
+from member_policy import ClampScore, KickInactive, run_policy
+
+def snapshot(db_name):
+    with get_connection(db_name) as conn:
+        return conn.execute("SELECT nick_name, join_date, last_login, score FROM member ORDER BY nick_name").fetchall()
+
+def prepare(db_name):
+    with get_connection(db_name) as conn:
+        conn.execute("UPDATE member SET score = 40 WHERE nick_name = 'User_4'")
+        conn.execute("UPDATE member SET last_login = 7 WHERE nick_name = 'User_3'")
+        conn.execute("UPDATE member SET last_login = -2 WHERE nick_name = 'User_2'")
+        conn.execute("UPDATE member SET join_date = '29991231' WHERE nick_name = 'User_1'")
+
+def test_dry_run_reports_and_rolls_back(db_name):
+    prepare(db_name)
+    before = snapshot(db_name)
+
+    report = run_policy(db_name, dry_run=True)
+    assert report == {
+        "ClampScore": ["User_2", "User_3", "User_4"],
+        "ClampLastLogin": ["User_2"],
+        "FixFutureJoinDate": ["User_1"],
+        "KickLowScore": ["User_0"],
+        "KickInactive": ["User_3"],
+    }
+    assert snapshot(db_name) == before
+
+    # 실제 적용도 같은 결과
+    assert run_policy(db_name) == report
+    after = {row[0]: row for row in snapshot(db_name)}
+    assert sorted(after) == ["User_1", "User_2", "User_4"]
+    assert after["User_4"][3] == 15
+    assert after["User_2"][2] == 0
+    assert after["User_1"][1] != "29991231"
+
+def test_rules_see_earlier_rule_results(db_name):
+    # 점수 보정 뒤에 강퇴 대상을 고르므로 dry_run 도 보정된 값 기준
+    with get_connection(db_name) as conn:
+        conn.execute("UPDATE member SET score = -5, last_login = 9 WHERE nick_name = 'User_1'")
+    report = run_policy(db_name, rules=(ClampScore(0, 15), KickInactive(5)), dry_run=True)
+    assert report == {"ClampScore": ["User_1", "User_2", "User_3", "User_4"], "KickInactive": ["User_1"]}
+
+def test_no_matches_changes_nothing(db_name):
+    before = snapshot(db_name)
+    assert run_policy(db_name, rules=(KickInactive(5),)) == {"KickInactive": []}
+    assert snapshot(db_name) == before
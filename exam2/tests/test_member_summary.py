@@ -0,0 +1,61 @@
+from connection_pool import get_connection
+import content_store
+import member_summary
+import schema
+import transaction_script_func_base as scripts
+
+def summary_tables(db_name):
+    with get_connection(db_name) as conn:
+        return {table_name: sorted(conn.execute(f"SELECT * FROM {table_name}").fetchall())
+                for table_name in (member_summary.SUMMARY_TABLE, member_summary.CONTENT_SUMMARY_TABLE,
+                                   member_summary.PERIOD_SUMMARY_TABLE)}
+
+def assert_matches_rebuild(db_name):
+    assert member_summary.check(db_name) == {"missing_triggers": [], "mismatches": {}}
+    maintained = summary_tables(db_name)
+    member_summary.rebuild(db_name)
+    assert summary_tables(db_name) == maintained
+
+def test_install_summarises_existing_records(db_name):
+    assert member_summary.install(db_name) == ["raid_20240925"]
+    assert member_summary.member_stats(db_name, "User_3") == {
+        "score": 3, "participation_count": 1, "records": 1, "periods": 1, "last_active": "20240925"}
+    assert member_summary.member_stats(db_name, "Nobody") is None
+
+def test_triggers_follow_writes(db_name):
+    member_summary.install(db_name)
+    with get_connection(db_name) as conn:
+        scripts.insert_content_records(conn, "raid", "20240925", [("User_0", 5, 2, 2), ("User_9", 1, 1, 1)])
+        conn.execute("UPDATE raid_20240925 SET score = 20 WHERE nick_name = 'User_1'")
+        conn.execute("DELETE FROM raid_20240925 WHERE nick_name = 'User_2'")
+    assert member_summary.member_stats(db_name, "User_0")["records"] == 2
+    assert member_summary.member_stats(db_name, "User_1")["score"] == 20
+    assert member_summary.member_stats(db_name, "User_2") is None
+    assert_matches_rebuild(db_name)
+
+def test_new_period_table_needs_install(db_name):
+    member_summary.install(db_name)
+    with get_connection(db_name) as conn:
+        conn.execute("CREATE TABLE raid_20241002 (nick_name TEXT, score INTEGER, participation_count INTEGER, day INTEGER)")
+        conn.execute("INSERT INTO raid_20241002 VALUES ('User_0', 4, 1, 1)")
+    assert member_summary.check(db_name)["missing_triggers"] == ["raid_20241002"]
+
+    assert member_summary.install(db_name) == ["raid_20241002"]
+    assert member_summary.member_stats(db_name, "User_0")["periods"] == 2
+    assert_matches_rebuild(db_name)
+
+def test_create_content_table_installs_triggers(db_name):
+    member_summary.install(db_name)
+    schema.create_content_table(db_name, "raid", "20241009", "20241015")
+    with get_connection(db_name) as conn:
+        conn.execute("INSERT INTO raid_20241009 VALUES ('User_1', 4, 1, 1)")
+    assert member_summary.member_stats(db_name, "User_1")["score"] == 5
+    assert_matches_rebuild(db_name)
+
+def test_summary_follows_store_migration(db_name):
+    member_summary.install(db_name)
+    content_store.migrate_period_tables(db_name)
+    with get_connection(db_name) as conn:
+        conn.execute("INSERT INTO raid_20240925 (nick_name, score, participation_count, day) VALUES ('User_4', 6, 1, 2)")
+    assert member_summary.member_stats(db_name, "User_4")["score"] == 10
+    assert_matches_rebuild(db_name)
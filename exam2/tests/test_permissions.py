@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from permissions import Grant, GrantTable, PermissionService
+
+def expected_members(model, grants):
+    values = {grant.value for grant in grants}
+    return {nick_name for nick_name, grant in model.items() if grant in values}
+
+def assert_matches(table, model):
+    assert len(table) == len(model)
+    for grant in Grant:
+        assert table.count(grant) == sum(1 for value in model.values() if value == grant.value)
+        assert set(table.members([grant])) == expected_members(model, [grant])
+    assert set(table.members([Grant.ADMIN, Grant.SUB_ADMIN])) == expected_members(model, [Grant.ADMIN, Grant.SUB_ADMIN])
+    for nick_name, grant in model.items():
+        assert table.get(nick_name) == grant
+
+def test_masks_follow_random_changes():
+    rng = random.Random(7)
+    table = GrantTable()
+    model = {}
+    table.load([(f"User_{i}", i % 3) for i in range(50)])
+    model.update({f"User_{i}": i % 3 for i in range(50)})
+    assert_matches(table, model)
+
+    for step in range(2000):
+        nick_name = f"User_{rng.randrange(80)}"
+        if rng.random() < 0.2:
+            table.remove(nick_name)
+            model.pop(nick_name, None)
+        else:
+            grant = rng.choice(list(Grant))
+            table.set(nick_name, grant)
+            model[nick_name] = grant.value
+        if step % 100 == 0:
+            assert_matches(table, model)
+    assert_matches(table, model)
+
+def test_members_in_slot_order_and_slot_reuse():
+    table = GrantTable()
+    table.load([("a", Grant.ADMIN), ("b", Grant.USER), ("c", Grant.ADMIN)])
+    assert table.members([Grant.ADMIN]) == ["a", "c"]
+    table.remove("a")
+    assert table.members([Grant.ADMIN]) == ["c"]
+    # 비운 슬롯을 새 멤버가 재사용
+    table.set("d", Grant.ADMIN)
+    assert table.members([Grant.ADMIN]) == ["d", "c"]
+    assert table.get("a") is None
+
+def test_unknown_grant_removes_member():
+    table = GrantTable()
+    table.load([("a", 2), ("b", 9)])
+    assert len(table) == 1 and table.get("b") is None
+    table.set("a", 9)
+    assert len(table) == 0 and table.count(Grant.USER) == 0
+
+def test_service_keeps_table_in_sync(db_name):
+    service = PermissionService()
+    assert service.count(db_name, Grant.USER) == 5
+    assert service.change_grant(db_name, "User_1", Grant.ADMIN)
+    assert service.members_with(db_name, Grant.ADMIN) == ["User_1"]
+    assert service.has_grant(db_name, "User_1", Grant.SUB_ADMIN)
+    assert not service.has_grant(db_name, "User_2", Grant.SUB_ADMIN)
+    assert not service.change_grant(db_name, "Nobody", Grant.ADMIN)
+    with pytest.raises(ValueError):
+        service.change_grant(db_name, "User_1", 9)
+    # DB 에서 다시 읽어도 같은 결과
+    assert service.load(db_name).members([Grant.ADMIN]) == ["User_1"]
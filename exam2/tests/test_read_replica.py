@@ -0,0 +1,68 @@
+import os
+import sqlite3
+
+import pytest
+
+from connection_pool import get_connection
+from read_replica import ReadReplica, disable_replica, enable_replica, read_db_name
+
+def score(db_name, nick_name):
+    with get_connection(db_name) as conn:
+        return conn.execute("SELECT score FROM member WHERE nick_name = ?", (nick_name,)).fetchone()[0]
+
+def test_route_by_staleness(db_name, tmp_path):
+    replica = ReadReplica(db_name, max_staleness=60, replica_dir=str(tmp_path))
+    try:
+        # 첫 복사 전에는 주 DB
+        assert replica.route() == db_name
+        replica.refresh()
+        path = replica.route()
+        assert path != db_name and os.path.exists(path)
+        assert replica.route(max_staleness=0) == db_name
+        stats = replica.stats()
+        assert stats["replica_reads"] == 1 and stats["primary_reads"] == 2
+    finally:
+        replica.close()
+
+def test_replica_is_a_read_only_snapshot(db_name, tmp_path):
+    replica = ReadReplica(db_name, max_staleness=60, replica_dir=str(tmp_path))
+    try:
+        replica.refresh()
+        path = replica.route()
+        with get_connection(db_name) as conn:
+            conn.execute("UPDATE member SET score = 99 WHERE nick_name = 'User_0'")
+        assert score(path, "User_0") == 0
+        with pytest.raises(sqlite3.OperationalError):
+            with get_connection(path) as conn:
+                conn.execute("UPDATE member SET score = 1 WHERE nick_name = 'User_0'")
+
+        replica.refresh()
+        assert score(replica.route(), "User_0") == 99
+    finally:
+        replica.close()
+
+def test_refresh_retires_older_generations(db_name, tmp_path):
+    replica = ReadReplica(db_name, max_staleness=60, replica_dir=str(tmp_path))
+    paths = []
+    try:
+        for _ in range(3):
+            replica.refresh()
+            paths.append(replica.route())
+        # 직전 세대는 남기고 그 이전 세대는 삭제
+        assert [os.path.exists(path) for path in paths] == [False, True, True]
+        assert replica.stats()["generation"] == 3
+    finally:
+        replica.close()
+    assert not any(os.path.exists(path) for path in paths)
+
+def test_enable_routes_reads(db_name, tmp_path):
+    enable_replica(db_name, max_staleness=60, refresh_interval=3600, replica_dir=str(tmp_path))
+    try:
+        path = read_db_name(db_name)
+        assert path != db_name
+        assert score(path, "User_4") == 40
+        assert read_db_name(db_name, max_staleness=0) == db_name
+    finally:
+        disable_replica(db_name)
+    assert read_db_name(db_name) == db_name
+    assert not os.path.exists(path)
@@ -0,0 +1,51 @@
+import pytest
+
+from connection_pool import get_connection
+import content_store
+import record_stream
+
+def all_members(db_name):
+    with get_connection(db_name) as conn:
+        return conn.execute("SELECT nick_name, kakao_nick_name, join_date, grant, last_login, score FROM member ORDER BY nick_name").fetchall()
+
+def add_records(db_name):
+    # 한 멤버가 여러 day 를 가져 페이지 경계가 nick_name 중간에 걸리도록
+    with get_connection(db_name) as conn:
+        conn.executemany("INSERT INTO raid_20240925 VALUES (?, ?, ?, ?)",
+                         [(f"User_{i}", i + day, 1, day) for i in range(5) for day in range(2, 5)])
+        conn.execute("CREATE TABLE raid_20241002 (nick_name TEXT, score INTEGER, participation_count INTEGER, day INTEGER)")
+        conn.executemany("INSERT INTO raid_20241002 VALUES (?, ?, ?, ?)", [(f"User_{i}", i, 1, 1) for i in range(3)])
+
+@pytest.mark.parametrize("page_size", [1, 2, 5, 100])
+def test_iter_members_pages_in_key_order(db_name, page_size):
+    with get_connection(db_name) as conn:
+        conn.executemany("INSERT INTO member VALUES (?, 'Kakao', '20240101', 2, 0, ?)", [(f"Extra_{i}", i) for i in range(7)])
+    assert list(record_stream.iter_members(db_name, page_size=page_size)) == all_members(db_name)
+
+def test_iter_members_filters(db_name):
+    with get_connection(db_name) as conn:
+        conn.execute("INSERT INTO member VALUES ('Users', 'Kakao', '20240101', 2, 0, 25)")
+    names = [row[0] for row in record_stream.iter_members(db_name, nick_name_prefix="User_", min_score=10, max_score=30, page_size=1)]
+    assert names == ["User_1", "User_2", "User_3"]
+
+def expected_records(db_name):
+    with get_connection(db_name) as conn:
+        rows = []
+        for table_name, content_name, start_date in content_store.find_period_tables(conn):
+            rows += [(content_name, start_date) + row for row in conn.execute(
+                f"SELECT nick_name, score, participation_count, day FROM {table_name}")]
+    return sorted(rows)
+
+@pytest.mark.parametrize("store", [False, True])
+@pytest.mark.parametrize("page_size", [1, 4, 1000])
+def test_iter_content_records_keyset(db_name, page_size, store):
+    add_records(db_name)
+    expected = expected_records(db_name)
+    if store:
+        content_store.migrate_period_tables(db_name)
+    rows = list(record_stream.iter_content_records(db_name, page_size=page_size))
+    assert sorted(rows) == expected
+    assert len(rows) == len(set(rows)) == 23
+
+    filtered = list(record_stream.iter_content_records(db_name, "raid", from_date="20241001", nick_name="User_1", page_size=page_size))
+    assert filtered == [("raid", "20241002", "User_1", 1, 1, 1)]
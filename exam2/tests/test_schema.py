@@ -0,0 +1,60 @@
+import asyncio
+import shutil
+import sqlite3
+
+import pytest
+
+from connection_pool import get_connection
+from async_api import AsyncMemberManagement
+import row_data_gateway
+import schema
+
+def test_first_connection_bootstraps_new_db(tmp_path):
+    db_name = str(tmp_path / "new.db")
+    # 처음 사용할 때 스키마가 만들어지므로 빈 파일에서도 바로 조회할 수 있음
+    assert row_data_gateway.Finder(db_name).find_member("nobody") is None
+    with get_connection(db_name) as conn:
+        assert schema.schema_version(conn) == schema.SCHEMA_VERSION
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+def test_async_read_before_any_write(tmp_path):
+    db_name = str(tmp_path / "async.db")
+
+    async def run():
+        async with AsyncMemberManagement(db_name) as api:
+            assert await api.find_member("nobody") is None
+            await api.create_member("User_0", "Kakao_0", "20240101", 2, 0, 1)
+            return await api.find_member("User_0")
+
+    assert asyncio.run(run())[4] == 1
+
+def test_bootstrap_is_idempotent(db_name):
+    schema.bootstrap(db_name)
+    assert schema.migrate(db_name) == []
+    assert "warm" in schema.bootstrap(db_name, warm=True)
+
+def schema_objects(db_name):
+    with get_connection(db_name) as conn:
+        version = schema.schema_version(conn)
+        objects = conn.execute("SELECT type, name, tbl_name FROM sqlite_master WHERE name NOT LIKE 'sqlite_%' ORDER BY name").fetchall()
+        members = conn.execute("SELECT COUNT(*) FROM member").fetchone()[0]
+    return version, objects, members
+
+@pytest.mark.parametrize("version", range(schema.SCHEMA_VERSION + 1))
+def test_migrate_from_each_version(db_name, tmp_path, version):
+    # version 까지 적용된 DB 를 sqlite3 로 직접 만든 뒤 (처음 사용 훅을 거치지 않도록) 풀로 열어 나머지를 적용
+    path = str(tmp_path / f"v{version}.db")
+    shutil.copyfile(db_name, path)
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    for number, _, apply in schema.MIGRATIONS[:version]:
+        apply(cursor)
+        cursor.execute(f"PRAGMA user_version = {number}")
+        conn.commit()
+    conn.close()
+
+    assert schema_objects(path) == schema_objects(db_name)
+    assert schema_objects(path)[0] == schema.SCHEMA_VERSION
+
+def test_migrations_are_numbered_in_order():
+    assert [version for version, _, _ in schema.MIGRATIONS] == list(range(1, schema.SCHEMA_VERSION + 1))
@@ -0,0 +1,86 @@
+import threading
+import time
+
+import pytest
+
+from row_data_gateway import ContentRecordGateway, MemberGateway, select_member
+import schema
+import sharding
+from sharding import ShardRouter, jump_hash
+
+def test_jump_hash_is_stable():
+    # 저장된 배치가 바뀌지 않도록 값 고정
+    assert [jump_hash(f"User_{i}", 10) for i in range(10)] == [9, 6, 7, 5, 7, 0, 6, 6, 9, 5]
+    assert jump_hash("멤버", 7) == 1
+    assert all(jump_hash(f"User_{i}", 1) == 0 for i in range(100))
+
+def test_jump_hash_moves_only_to_new_bucket():
+    keys = [f"User_{i}" for i in range(2000)]
+    for buckets in range(1, 12):
+        before = [jump_hash(key, buckets) for key in keys]
+        after = [jump_hash(key, buckets + 1) for key in keys]
+        moved = [new for old, new in zip(before, after) if old != new]
+        # 버킷이 늘어나면 새 버킷으로만, 약 1/(buckets+1) 만 이동
+        assert set(moved) <= {buckets}
+        assert abs(len(moved) / len(keys) - 1 / (buckets + 1)) < 0.05
+
+@pytest.fixture
+def router(db_name, tmp_path):
+    router = ShardRouter([db_name, str(tmp_path / "shard_b.db")], directory_db=str(tmp_path / "directory.db"))
+    for shard in router.shards:
+        schema.create_content_table(shard, "raid", "20241002", "20241008")
+    yield router
+    router.close()
+
+def other_shard(router, shard):
+    return next(candidate for candidate in router.shards if candidate != shard)
+
+def test_move_members_copies_rows_and_records(router):
+    source = router.create_member("Mover", "Kakao", "20240101", 2, 0, 3)
+    ContentRecordGateway(source, "raid_20241002", "Mover", 1).insert(4, 1, 1)
+    target = other_shard(router, source)
+
+    assert router.move_members(["Mover", "Nobody"], target) == 1
+    assert router.shard_of("Mover") == target
+    assert router.locate("Mover") == [target]
+    assert router.find_member("Mover") == (target, ("Kakao", "20240101", 2, 0, 3))
+    assert ContentRecordGateway(target, "raid_20241002", "Mover", 1).find() == (4, 1, 1)
+    assert ContentRecordGateway(source, "raid_20241002", "Mover", 1).find() is None
+    # 다시 실행하면 옮길 것이 없음
+    assert router.move_members(["Mover"], target) == 0
+    assert router.stats()["moved"] == 1
+
+    with pytest.raises(ValueError):
+        router.move_members(["Mover"], "unknown.db")
+
+def test_write_during_move_is_recopied(router, monkeypatch):
+    source = router.create_member("Mover", "Kakao", "20240101", 2, 0, 3)
+    target = other_shard(router, source)
+    # 옮기기 전에 라우팅을 받아 둔 쓰기
+    stale = MemberGateway(source, "Mover")
+    write_members = sharding._write_members
+    state = {}
+
+    def racing_write(db_name, members, records, nick_names=None):
+        write_members(db_name, members, records, nick_names)
+        if "thread" in state:
+            return
+        # 복사와 삭제 사이에 원래 샤드로 들어온 쓰기
+        stale.update_score(9)
+        ContentRecordGateway(source, "raid_20241002", "Mover", 1).insert(5, 1, 1)
+        # 옮기는 중에는 라우팅이 끝날 때까지 기다림
+        thread = threading.Thread(target=lambda: state.setdefault("routed", router.shard_of("Mover")))
+        state["thread"] = thread
+        thread.start()
+        time.sleep(0.1)
+        state["waited"] = thread.is_alive()
+
+    monkeypatch.setattr(sharding, "_write_members", racing_write)
+    assert router.move_members(["Mover"], target) == 1
+    state["thread"].join()
+
+    assert state["waited"] and state["routed"] == target
+    assert select_member(target, "Mover")[4] == 9
+    assert select_member(source, "Mover") is None
+    assert ContentRecordGateway(target, "raid_20241002", "Mover", 1).find() == (5, 1, 1)
+    assert router.stats()["recopied"] == 1
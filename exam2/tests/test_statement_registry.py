@@ -0,0 +1,46 @@
+import sqlite3
+
+import pytest
+
+from connection_pool import get_connection
+from statement_registry import StatementRegistry, UnknownTableError
+
+@pytest.mark.parametrize("table_name", [
+    "member",
+    "raid_2024092",
+    "raid_20240925; DROP TABLE member",
+    "raid_20240925 WHERE 1",
+    "_raid_20240925",
+    "raid-x_20240925",
+])
+def test_rejects_bad_table_names(db_name, table_name):
+    registry = StatementRegistry()
+    with get_connection(db_name) as conn:
+        with pytest.raises(UnknownTableError):
+            registry.sql(conn, "insert", table_name)
+        # 거부해도 아무것도 실행되지 않음
+        assert conn.execute("SELECT COUNT(*) FROM member").fetchone()[0] == 5
+    assert registry.stats()["rejected"] == 1
+    assert registry.stats()["statements"] == 0
+
+def test_rejects_missing_table(db_name):
+    registry = StatementRegistry()
+    with get_connection(db_name) as conn:
+        with pytest.raises(UnknownTableError) as info:
+            registry.sql(conn, "insert", "raid_20991231")
+    assert isinstance(info.value, sqlite3.OperationalError)
+    assert registry.stats()["rejected"] == 1
+
+def test_unknown_operation(db_name):
+    with get_connection(db_name) as conn:
+        with pytest.raises(ValueError):
+            StatementRegistry().sql(conn, "drop", "raid_20240925")
+
+def test_statement_is_cached(db_name):
+    registry = StatementRegistry()
+    with get_connection(db_name) as conn:
+        sql = registry.sql(conn, "insert", "raid_20240925")
+        assert registry.sql(conn, "insert", "raid_20240925") is sql
+        conn.execute(sql, ("User_9", 1, 1, 1))
+    stats = registry.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["rejected"] == 0
@@ -0,0 +1,78 @@
+import pytest
+
+from connection_pool import get_connection
+from permissions import Grant
+from row_data_gateway import Member
+from unit_of_work import UnitOfWork
+import query_log
+
+@pytest.fixture
+def logged():
+    query_log.reset()
+    query_log.enable(slow_threshold=60)
+    yield
+    query_log.disable()
+    query_log.reset()
+
+def load(db_name, nick_name):
+    with get_connection(db_name) as conn:
+        row = conn.execute("SELECT kakao_nick_name, join_date, grant, last_login, score FROM member WHERE nick_name = ?",
+                           (nick_name,)).fetchone()
+    return Member(nick_name, *row, db_name=db_name)
+
+def update_statements():
+    return {statement: stats["count"] for statement, stats in query_log.stats()["statements"].items()
+            if statement.startswith("UPDATE member")}
+
+def test_dirty_values_only_changed_fields(db_name):
+    member = load(db_name, "User_1")
+    assert member.dirty_values() == {}
+    member.score = 11
+    member.score = 12
+    member.grant = Grant.ADMIN
+    # 같은 필드를 여러 번 바꿔도 마지막 값 하나, Grant 는 DB 값으로
+    assert member.dirty_values() == {"grant": 0, "score": 12}
+    # 같은 값으로 되돌린 필드는 변경으로 보지 않음
+    member.kakao_nick_name = "Kakao_1"
+    assert "kakao_nick_name" not in member.dirty_values()
+
+def test_commit_groups_same_columns_into_one_statement(db_name, logged):
+    members = [load(db_name, f"User_{i}") for i in range(1, 5)]
+    with UnitOfWork(db_name) as uow:
+        for i, member in enumerate(members):
+            member.score = 5 + i
+            if i % 2:
+                member.last_login = 3
+            member.update(uow)
+        # 같은 객체를 다시 등록해도 한 번만 반영
+        members[0].update(uow)
+
+    assert update_statements() == {
+        "UPDATE member SET score = ? WHERE nick_name = ?": 1,
+        "UPDATE member SET last_login = ?, score = ? WHERE nick_name = ?": 1,
+    }
+    with get_connection(db_name) as conn:
+        rows = conn.execute("SELECT nick_name, last_login, score FROM member WHERE nick_name != 'User_0' ORDER BY nick_name").fetchall()
+    assert rows == [("User_1", 0, 5), ("User_2", 3, 6), ("User_3", 0, 7), ("User_4", 3, 8)]
+    assert all(member.dirty_values() == {} for member in members)
+
+def test_commit_skips_missing_rows(db_name):
+    ghost = Member("Ghost", "Kakao", "20240101", 2, 0, 1, db_name=db_name)
+    member = load(db_name, "User_1")
+    uow = UnitOfWork(db_name)
+    for obj in (ghost, member):
+        obj.score = 7
+        uow.register_dirty(obj)
+    assert uow.commit() == 1
+    assert load(db_name, "User_1").score == 7
+    # 반영할 것이 없으면 0
+    assert uow.commit() == 0
+
+def test_rollback_discards_changes(db_name):
+    member = load(db_name, "User_1")
+    uow = UnitOfWork(db_name)
+    member.score = 50
+    member.update(uow)
+    uow.rollback()
+    assert uow.commit() == 0
+    assert load(db_name, "User_1").score == 10
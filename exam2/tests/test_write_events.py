@@ -0,0 +1,32 @@
+import threading
+
+from change_feed import feed
+import write_events
+from write_events import WriteEvent
+
+def test_state_counters_are_thread_safe(db_name):
+    events = [WriteEvent(db_name, "member", "update", "User_0", None)]
+    threads_count, rounds = 8, 20000
+    # 카운터만 확인하므로 변경 피드 기록은 끔
+    feed.pause(db_name)
+
+    def worker():
+        for _ in range(rounds):
+            write_events.prepare(None, events)
+            write_events.deliver(events)
+
+    threads = [threading.Thread(target=worker) for _ in range(threads_count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    feed.resume(db_name)
+    assert write_events.state(db_name) == (0, threads_count * rounds)
+
+def test_abandon_releases_in_flight(db_name):
+    events = [WriteEvent(db_name, "member", "update", "User_0", None)]
+    write_events.prepare(None, events)
+    assert write_events.state(db_name) == (1, 0)
+    write_events.abandon(events)
+    assert write_events.state(db_name) == (0, 0)
@@ -0,0 +1,83 @@
+import threading
+
+import pytest
+
+from connection_pool import get_connection
+import row_data_gateway
+import transaction_script_func_base as scripts
+from write_queue import enable_write_queue, get_write_queue, disable_write_queue
+
+def score_of(db_name, nick_name):
+    with get_connection(db_name) as conn:
+        return conn.execute("SELECT score FROM member WHERE nick_name = ?", (nick_name,)).fetchone()[0]
+
+def test_queued_writes_from_many_threads(db_name):
+    queue = enable_write_queue(db_name)
+
+    def worker(n):
+        for i in range(5):
+            row_data_gateway.MemberGateway(db_name, f"User_{i}").update_last_login(n)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    stats = queue.stats()
+    assert stats["operations"] == 20
+    assert stats["groups"] <= stats["operations"]
+    assert stats["failed_operations"] == 0
+
+def test_queued_write_commits_before_returning(db_name):
+    enable_write_queue(db_name)
+    with get_connection(db_name) as conn:
+        scripts.update_score(conn, "User_3", 5)
+    assert score_of(db_name, "User_3") == 5
+
+def test_failed_operation_does_not_undo_group(db_name):
+    queue = enable_write_queue(db_name, max_delay=0.05)
+
+    def fail(conn):
+        conn.execute("UPDATE member SET score = 1 WHERE nick_name = 'User_1'")
+        raise ValueError("bad write")
+
+    bad = queue.submit(fail)
+    good = queue.execute("UPDATE member SET score = 2 WHERE nick_name = 'User_2'")
+    with pytest.raises(ValueError):
+        bad.result()
+    assert good.result() == 1
+
+    assert score_of(db_name, "User_1") == 10
+    assert score_of(db_name, "User_2") == 2
+    assert queue.stats()["failed_operations"] == 1
+
+def test_disable_flushes_and_closes(db_name):
+    queue = enable_write_queue(db_name)
+    futures = [queue.execute("UPDATE member SET last_login = ? WHERE nick_name = 'User_0'", (n,)) for n in range(10)]
+    disable_write_queue(db_name)
+
+    assert all(future.done() for future in futures)
+    assert get_write_queue(db_name) is None
+    with pytest.raises(RuntimeError):
+        queue.submit(lambda conn: None)
+
+def test_write_inside_open_transaction_runs_inline(db_name):
+    queue = enable_write_queue(db_name, busy_timeout=200)
+    # 커밋하지 않은 쓰기가 있는 커넥션에서 호출하면 writer 스레드를 기다리지 않고 같은 트랜잭션에서 실행
+    # (큐가 없을 때와 같이 스크립트의 commit 이 앞선 쓰기까지 함께 커밋)
+    with get_connection(db_name) as conn:
+        conn.execute("UPDATE member SET last_login = 1 WHERE nick_name = 'User_0'")
+        scripts.update_score(conn, "User_0", 3)
+        assert not conn.in_transaction
+    assert queue.stats()["operations"] == 0
+    with get_connection(db_name) as conn:
+        assert conn.execute("SELECT last_login, score FROM member WHERE nick_name = 'User_0'").fetchone() == (1, 3)
+
+def test_gateway_write_inside_open_transaction_runs_inline(db_name):
+    queue = enable_write_queue(db_name, busy_timeout=200)
+    with get_connection(db_name) as conn:
+        conn.execute("UPDATE member SET last_login = 1 WHERE nick_name = 'User_1'")
+        row_data_gateway.MemberGateway(db_name, "User_1").update_score(4)
+    assert queue.stats()["operations"] == 0
+    assert score_of(db_name, "User_1") == 4
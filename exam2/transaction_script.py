@@ -1,16 +1,14 @@
-import sqlite3
-from enum import Enum
 from datetime import datetime
 
-# 권한 Enum
-class Grant(Enum):
-    ADMIN = 0
-    SUB_ADMIN = 1
-    USER = 2
-
-# DB 접속 함수
-def get_connection(db_name="MemberManagement.db"):
-    return sqlite3.connect(db_name)
+from connection_pool import get_connection
+from schema_cache import table_exists
+from statement_registry import content_record_sql
+from permissions import Grant
+from write_events import publish_member, publish_content_record
+# 변경 피드가 쓰기 이벤트를 기록하도록 등록
+import change_feed
+# 처음 사용할 때 스키마를 확인하도록 등록
+import schema
 
 def main():
     db_name = "MemberManagement.db"
@@ -18,15 +16,15 @@ def main():
     cursor = conn.cursor()
 
     # 테이블 확인 (member 테이블이 존재하는지 확인)
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='member';")
-    if not cursor.fetchone():
+    if not table_exists(db_name, "member", conn):
         print("Error: 'member' table does not exist.")
+        conn.close()
         return
 
     # 테이블 확인 (content_schedule 테이블이 존재하는지 확인)
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='content_schedule';")
-    if not cursor.fetchone():
+    if not table_exists(db_name, "content_schedule", conn):
         print("Error: 'content_schedule' table does not exist.")
+        conn.close()
         return
 
     # 멤버 찾기
@@ -46,6 +44,8 @@ def main():
         score = 10
         cursor.execute("INSERT INTO member (nick_name, kakao_nick_name, join_date, grant, last_login, score) VALUES (?, ?, ?, ?, ?, ?)",
                        (nick_name, kakao_nick_name, join_date, grant, last_login, score))
+        publish_member(db_name, "insert", nick_name, {"kakao_nick_name": kakao_nick_name, "join_date": join_date,
+                                                      "grant": grant, "last_login": last_login, "score": score})
         conn.commit()
         print("Member created.")
 
@@ -55,11 +55,15 @@ def main():
     score = 15
     cursor.execute("UPDATE member SET grant = ?, last_login = ?, score = ? WHERE nick_name = ?",
                    (grant, last_login, score, nick_name))
+    if cursor.rowcount:
+        publish_member(db_name, "update", nick_name, {"grant": grant, "last_login": last_login, "score": score})
     conn.commit()
     print("Member updated.")
 
     # 멤버 삭제 (Delete)
     cursor.execute("DELETE FROM member WHERE nick_name = ?", (nick_name,))
+    if cursor.rowcount:
+        publish_member(db_name, "delete", nick_name)
     conn.commit()
     print(f"Member {nick_name} deleted.")
 
@@ -69,29 +73,33 @@ def main():
     table_name = f"{content_name}_{start_date}"
 
     # 테이블 확인 (content 테이블 존재 여부 확인)
-    cursor.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{table_name}';")
-    if cursor.fetchone():
+    if table_exists(db_name, table_name, conn):
         # 컨텐츠 레코드 조회
-        cursor.execute(f"SELECT score, participation_count, day FROM {table_name} WHERE nick_name = ?", (nick_name,))
-        content_data = cursor.fetchall()
-
-        if content_data:
-            print(f"Content records found for {nick_name}: {content_data}")
-        else:
+        cursor.execute(content_record_sql(conn, "find", table_name), (nick_name,))
+        # 한 행씩 읽음 (결과 전체를 리스트로 만들지 않음)
+        found = False
+        for content_data in cursor:
+            found = True
+            print(f"Content record found for {nick_name}: {content_data}")
+
+        if not found:
             # 컨텐츠 레코드 생성 (Create)
-            cursor.execute(f"INSERT INTO {table_name} (nick_name, score, participation_count, day) VALUES (?, ?, ?, ?)",
-                           (nick_name, 10, 1, 1))
+            cursor.execute(content_record_sql(conn, "insert", table_name), (nick_name, 10, 1, 1))
+            publish_content_record(db_name, "insert", content_name, start_date, nick_name, 1, {"score": 10, "participation_count": 1})
             conn.commit()
             print(f"Content record for {nick_name} created.")
 
         # 컨텐츠 레코드 업데이트 (Update)
-        cursor.execute(f"UPDATE {table_name} SET score = ?, participation_count = ? WHERE nick_name = ? AND day = ?",
-                       (12, 2, nick_name, 1))
+        cursor.execute(content_record_sql(conn, "update_day", table_name), (12, 2, nick_name, 1))
+        if cursor.rowcount:
+            publish_content_record(db_name, "update", content_name, start_date, nick_name, 1, {"score": 12, "participation_count": 2})
         conn.commit()
         print(f"Content record for {nick_name} updated.")
 
         # 컨텐츠 레코드 삭제 (Delete)
-        cursor.execute(f"DELETE FROM {table_name} WHERE nick_name = ? AND day = ?", (nick_name, 1))
+        cursor.execute(content_record_sql(conn, "delete_day", table_name), (nick_name, 1))
+        if cursor.rowcount:
+            publish_content_record(db_name, "delete", content_name, start_date, nick_name, 1)
         conn.commit()
         print(f"Content record for {nick_name} deleted.")
     else:
@@ -1,83 +1,220 @@
-import sqlite3
-from enum import Enum
 from datetime import datetime
 
-# 권한 Enum
-class Grant(Enum):
-    ADMIN = 0
-    SUB_ADMIN = 1
-    USER = 2
+from connection_pool import get_connection
+from schema_cache import table_exists
+from member_cache import member_cache
+from write_events import publish_member, publish_content_record
+import batch_writer
+import content_store
+from write_queue import queued_write
+from batch_writer import DEFAULT_CHUNK_SIZE
+from statement_registry import content_record_sql
+from record_stream import DEFAULT_PAGE_SIZE, iter_cursor
+from permissions import Grant, grant_value
+from content_schedule import resolve_period
+# 변경 피드가 쓰기 이벤트를 기록하도록 등록
+import change_feed
+# 처음 사용할 때 스키마를 확인하도록 등록
+import schema
 
-# DB 접속 함수
-def get_connection(db_name="MemberManagement.db"):
-    return sqlite3.connect(db_name)
-
-# 테이블 존재 여부 확인 함수
+# 테이블 존재 여부 확인 함수 (풀 커넥션이면 스키마 캐시를 사용)
 def ensure_table_exists(conn, table_name):
+    db_name = getattr(conn, "db_name", None)
+    if db_name is not None:
+        return table_exists(db_name, table_name, conn)
+
     cursor = conn.cursor()
-    cursor.execute(f"SELECT name FROM sqlite_master WHERE type='table' AND name='{table_name}';")
-    table_exists = cursor.fetchone()
-    return table_exists is not None
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?;", (table_name,))
+    return cursor.fetchone() is not None
+
+# 쓰기 이벤트 발행 (캐시/랭킹 등이 구독, 풀 커넥션이 아니면 DB 를 알 수 없으므로 발행하지 않음)
+# 수정/삭제는 바뀐 행이 있을 때만 발행 (없는 멤버를 수정해도 순위표 등에 나타나지 않도록)
+def publish_member_write(conn, op, nick_name=None, values=None):
+    publish_member(getattr(conn, "db_name", None), op, nick_name, values)
+
+def publish_content_record_write(conn, op, content_name, start_date, nick_name=None, day=None, values=None):
+    publish_content_record(getattr(conn, "db_name", None), op, content_name, start_date, nick_name, day, values)
 
 # 트랜잭션 스크립트: 멤버 관련
 def find_member(conn, nick_name):
-    cursor = conn.cursor()
-    cursor.execute("SELECT kakao_nick_name, join_date, grant, last_login, score FROM member WHERE nick_name = ?", (nick_name,))
-    return cursor.fetchone()
+    def load():
+        cursor = conn.cursor()
+        cursor.execute("SELECT kakao_nick_name, join_date, grant, last_login, score FROM member WHERE nick_name = ?", (nick_name,))
+        return cursor.fetchone()
+
+    db_name = getattr(conn, "db_name", None)
+    if db_name is None:
+        return load()
+    return member_cache.get(db_name, nick_name, load)
 
+@queued_write
 def create_member(conn, nick_name, kakao_nick_name, join_date, grant, last_login, score):
     cursor = conn.cursor()
     cursor.execute("INSERT INTO member (nick_name, kakao_nick_name, join_date, grant, last_login, score) VALUES (?, ?, ?, ?, ?, ?)", 
                    (nick_name, kakao_nick_name, join_date, grant, last_login, score))
+    publish_member_write(conn, "insert", nick_name,
+                         {"kakao_nick_name": kakao_nick_name, "join_date": join_date, "grant": grant, "last_login": last_login, "score": score})
     conn.commit()
 
+@queued_write
 def update_grant(conn, nick_name, grant):
     cursor = conn.cursor()
-    cursor.execute("UPDATE member SET grant = ? WHERE nick_name = ?", (grant.value, nick_name))
+    grant = grant_value(grant)
+    cursor.execute("UPDATE member SET grant = ? WHERE nick_name = ?", (grant, nick_name))
+    if cursor.rowcount:
+        publish_member_write(conn, "update", nick_name, {"grant": grant})
     conn.commit()
 
+@queued_write
 def update_last_login(conn, nick_name, last_login):
     cursor = conn.cursor()
     cursor.execute("UPDATE member SET last_login = ? WHERE nick_name = ?", (last_login, nick_name))
+    if cursor.rowcount:
+        publish_member_write(conn, "update", nick_name, {"last_login": last_login})
     conn.commit()
 
+@queued_write
 def update_score(conn, nick_name, score):
     cursor = conn.cursor()
     cursor.execute("UPDATE member SET score = ? WHERE nick_name = ?", (score, nick_name))
+    if cursor.rowcount:
+        publish_member_write(conn, "update", nick_name, {"score": score})
     conn.commit()
 
+@queued_write
 def delete_member(conn, nick_name):
     cursor = conn.cursor()
     cursor.execute("DELETE FROM member WHERE nick_name = ?", (nick_name,))
+    if cursor.rowcount:
+        publish_member_write(conn, "delete", nick_name)
     conn.commit()
 
+# 트랜잭션 스크립트: 멤버 일괄 처리 (전체를 하나의 트랜잭션으로 처리)
+# 일괄 처리 이벤트는 배치가 커밋하기 전에 발행 (같은 트랜잭션에서 변경 피드에 기록, 실패하면 롤백과 함께 버려짐)
+@queued_write
+def create_members(conn, members, chunk_size=DEFAULT_CHUNK_SIZE, upsert=False):
+    """members: (nick_name, kakao_nick_name, join_date, grant, last_login, score) 의 iterable"""
+    publish_member_write(conn, "bulk")
+    count = batch_writer.insert_members(conn, members, chunk_size, upsert)
+    return count
+
+@queued_write
+def update_members(conn, members, chunk_size=DEFAULT_CHUNK_SIZE):
+    """members: (nick_name, grant, last_login, score) 의 iterable"""
+    publish_member_write(conn, "bulk")
+    count = batch_writer.update_members(conn, members, chunk_size)
+    return count
+
+@queued_write
+def delete_members(conn, nick_names, chunk_size=DEFAULT_CHUNK_SIZE):
+    publish_member_write(conn, "bulk")
+    count = batch_writer.delete_members(conn, nick_names, chunk_size)
+    return count
+
 # 트랜잭션 스크립트: 컨텐츠 레코드 관련
+# 통합 저장소(content_store)가 있으면 그쪽으로 처리하고, 없으면 기간별 테이블을 사용
 def find_content_record(conn, content_name, start_date, nick_name):
+    if content_store.is_enabled(conn):
+        return content_store.find_records(conn, content_name, start_date, nick_name)
+
     table_name = f"{content_name}_{start_date}"
     cursor = conn.cursor()
-    cursor.execute(f"SELECT score, participation_count, day FROM {table_name} WHERE nick_name = ?", (nick_name,))
+    cursor.execute(content_record_sql(conn, "find", table_name), (nick_name,))
     return cursor.fetchall()
 
-def insert_content_record(conn, content_name, start_date, nick_name, score, participation_count, day):
-    table_name = f"{content_name}_{start_date}"
+def find_content_record_on(conn, content_name, on_date, nick_name):
+    """on_date 에 진행 중인 content_name 기간에서 조회 (진행 중인 기간이 없으면 빈 리스트)"""
+    period = resolve_period(conn, content_name, on_date)
+    if period is None:
+        print(f"Error: no '{content_name}' period on {on_date}.")
+        return []
+    return find_content_record(conn, content_name, period.start_date, nick_name)
+
+def iter_content_records(conn, content_name, start_date, page_size=DEFAULT_PAGE_SIZE):
+    """한 기간의 (nick_name, score, participation_count, day) 전체를 fetchmany 페이지 단위로 하나씩 반환
+    같은 커넥션(트랜잭션) 안에서 읽으므로 다 읽을 때까지 커넥션을 닫지 않아야 함"""
     cursor = conn.cursor()
-    cursor.execute(f"INSERT INTO {table_name} (nick_name, score, participation_count, day) VALUES (?, ?, ?, ?)", 
-                   (nick_name, score, participation_count, day))
+    if content_store.is_enabled(conn):
+        cursor.execute(f"SELECT nick_name, score, participation_count, day FROM {content_store.CONTENT_RECORD_TABLE} "
+                       "WHERE content_name = ? AND start_date = ? ORDER BY nick_name, day", (content_name, start_date))
+    else:
+        table_name = f"{content_name}_{start_date}"
+        cursor.execute(content_record_sql(conn, "scan", table_name))
+    return iter_cursor(cursor, page_size)
+
+@queued_write
+def insert_content_record(conn, content_name, start_date, nick_name, score, participation_count, day):
+    if content_store.is_enabled(conn):
+        content_store.insert_record(conn, content_name, start_date, nick_name, score, participation_count, day)
+    else:
+        table_name = f"{content_name}_{start_date}"
+        cursor = conn.cursor()
+        cursor.execute(content_record_sql(conn, "insert", table_name), (nick_name, score, participation_count, day))
+    publish_content_record_write(conn, "insert", content_name, start_date, nick_name, day,
+                                 {"score": score, "participation_count": participation_count})
     conn.commit()
 
+@queued_write
 def update_content_record(conn, content_name, start_date, nick_name, score, participation_count, day):
-    table_name = f"{content_name}_{start_date}"
-    cursor = conn.cursor()
-    cursor.execute(f"UPDATE {table_name} SET score = ?, participation_count = ? WHERE nick_name = ? AND day = ?", 
-                   (score, participation_count, nick_name, day))
+    if content_store.is_enabled(conn):
+        updated = content_store.update_record(conn, content_name, start_date, nick_name, score, participation_count, day)
+    else:
+        table_name = f"{content_name}_{start_date}"
+        cursor = conn.cursor()
+        cursor.execute(content_record_sql(conn, "update_day", table_name), (score, participation_count, nick_name, day))
+        updated = cursor.rowcount
+    if updated:
+        publish_content_record_write(conn, "update", content_name, start_date, nick_name, day,
+                                     {"score": score, "participation_count": participation_count})
     conn.commit()
 
+@queued_write
 def delete_content_record(conn, content_name, start_date, nick_name, day):
-    table_name = f"{content_name}_{start_date}"
-    cursor = conn.cursor()
-    cursor.execute(f"DELETE FROM {table_name} WHERE nick_name = ? AND day = ?", (nick_name, day))
+    if content_store.is_enabled(conn):
+        deleted = content_store.delete_record(conn, content_name, start_date, nick_name, day)
+    else:
+        table_name = f"{content_name}_{start_date}"
+        cursor = conn.cursor()
+        cursor.execute(content_record_sql(conn, "delete_day", table_name), (nick_name, day))
+        deleted = cursor.rowcount
+    if deleted:
+        publish_content_record_write(conn, "delete", content_name, start_date, nick_name, day)
     conn.commit()
 
+# 트랜잭션 스크립트: 컨텐츠 레코드 일괄 처리 (전체를 하나의 트랜잭션으로 처리)
+@queued_write
+def insert_content_records(conn, content_name, start_date, records, chunk_size=DEFAULT_CHUNK_SIZE, upsert=False):
+    """records: (nick_name, score, participation_count, day) 의 iterable"""
+    publish_content_record_write(conn, "bulk", content_name, start_date)
+    if content_store.is_enabled(conn):
+        count = content_store.insert_records(conn, content_name, start_date, records, chunk_size, upsert)
+    else:
+        table_name = f"{content_name}_{start_date}"
+        count = batch_writer.insert_content_records(conn, table_name, records, chunk_size, upsert)
+    return count
+
+@queued_write
+def update_content_records(conn, content_name, start_date, records, chunk_size=DEFAULT_CHUNK_SIZE):
+    """records: (nick_name, score, participation_count, day) 의 iterable"""
+    publish_content_record_write(conn, "bulk", content_name, start_date)
+    if content_store.is_enabled(conn):
+        count = content_store.update_records(conn, content_name, start_date, records, chunk_size)
+    else:
+        table_name = f"{content_name}_{start_date}"
+        count = batch_writer.update_content_records(conn, table_name, records, chunk_size)
+    return count
+
+@queued_write
+def delete_content_records(conn, content_name, start_date, keys, chunk_size=DEFAULT_CHUNK_SIZE):
+    """keys: (nick_name, day) 의 iterable"""
+    publish_content_record_write(conn, "bulk", content_name, start_date)
+    if content_store.is_enabled(conn):
+        count = content_store.delete_records(conn, content_name, start_date, keys, chunk_size)
+    else:
+        table_name = f"{content_name}_{start_date}"
+        count = batch_writer.delete_content_records(conn, table_name, keys, chunk_size)
+    return count
+
 # 메인 함수: 트랜잭션 스크립트 실행
 def main():
     db_name = "MemberManagement.db"
@@ -86,10 +223,12 @@ def main():
     # 테이블 확인
     if not ensure_table_exists(conn, "member"):
         print("Error: 'member' table does not exist.")
+        conn.close()
         return
 
     if not ensure_table_exists(conn, "content_schedule"):
         print("Error: 'content_schedule' table does not exist.")
+        conn.close()
         return
 
     # 멤버 관련 트랜잭션 스크립트
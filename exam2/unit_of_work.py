@@ -0,0 +1,83 @@
+from connection_pool import get_connection
+from schema_cache import table_exists
+from write_events import publish
+
+# Unit of Work
+# 도메인 객체의 변경된 필드만 모아 두었다가, commit() 시 하나의 트랜잭션에서
+# 객체마다 UPDATE ... SET a = ?, b = ? 한 번으로 반영
+#
+# 등록되는 객체는 다음을 제공해야 함
+#   table_name     : 대상 테이블
+#   key_fields     : WHERE 절에 사용할 키 필드
+#   dirty_values() : {컬럼: DB 값} (변경된 필드만)
+#   key_values()   : 키 필드 값 튜플
+#   mark_clean()   : 반영 완료 후 변경 기록 초기화
+class UnitOfWork:
+    def __init__(self, db_name="MemberManagement.db"):
+        self.db_name = db_name
+        self._dirty = {}
+
+    def register_dirty(self, obj):
+        """변경된 객체 등록 (같은 객체는 한 번만 반영)"""
+        self._dirty[id(obj)] = obj
+
+    def rollback(self):
+        """등록된 변경 내용 폐기 (DB 에는 아직 반영되지 않은 상태)"""
+        self._dirty.clear()
+
+    def commit(self):
+        """등록된 변경 내용을 하나의 트랜잭션으로 반영, 반영된 행 수를 반환
+        DB 에 없는 객체의 변경은 반영할 행이 없으므로 이벤트도 발행하지 않음"""
+        # 같은 테이블, 같은 컬럼 조합끼리 묶어서 executemany
+        statements = {}
+        for obj in self._dirty.values():
+            values = obj.dirty_values()
+            if not values:
+                continue
+            columns = tuple(values)
+            params = tuple(values[column] for column in columns) + tuple(obj.key_values())
+            statements.setdefault((obj.table_name, tuple(obj.key_fields), columns), []).append((obj, values, params))
+
+        if not statements:
+            self._dirty.clear()
+            return 0
+
+        for table_name, _, _ in statements:
+            if not table_exists(self.db_name, table_name):
+                # 변경 내용은 버리지 않고 남겨 둠 (테이블 생성 후 다시 commit 가능)
+                print(f"Error: '{table_name}' table does not exsist.")
+                return 0
+
+        updated = []
+        with get_connection(self.db_name) as conn:
+            cursor = conn.cursor()
+            for (table_name, key_fields, columns), entries in statements.items():
+                set_clause = ", ".join(f"{column} = ?" for column in columns)
+                where_clause = " AND ".join(f"{key} = ?" for key in key_fields)
+                cursor.executemany(f"UPDATE {table_name} SET {set_clause} WHERE {where_clause}",
+                                   [params for _, _, params in entries])
+                if cursor.rowcount < len(entries):
+                    # 일부 키가 DB 에 없음 (executemany 는 합계만 알려주므로 키마다 확인)
+                    entries = [entry for entry in entries
+                               if conn.execute(f"SELECT 1 FROM {table_name} WHERE {where_clause}", entry[0].key_values()).fetchone()]
+                updated.extend(entries)
+            # 같은 트랜잭션에서 발행 (변경 피드 기록이 한 번의 커밋에 함께 들어감)
+            for obj, values, _ in updated:
+                key_values = obj.key_values()
+                publish(self.db_name, obj.table_name, "update", key_values[0] if len(key_values) == 1 else key_values, values)
+
+        for entries in statements.values():
+            for obj, _, _ in entries:
+                obj.mark_clean()
+        self._dirty.clear()
+        return len(updated)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+        return False
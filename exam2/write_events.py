@@ -0,0 +1,109 @@
+import threading
+from collections import namedtuple
+
+# 쓰기 이벤트
+#   table  : "member" 또는 "content_record"
+#   op     : "insert", "update", "delete", "bulk" (bulk 는 어떤 행이 바뀌었는지 모르는 일괄 처리)
+#   key    : member 는 nick_name, content_record 는 (content_name, start_date, nick_name, day)
+#            bulk 일 때 content_record 는 (content_name, start_date, None, None), member 는 None
+#   values : 바뀐 컬럼 {컬럼: 값} (모르면 None)
+WriteEvent = namedtuple("WriteEvent", ["db_name", "table", "op", "key", "values"])
+
+# 이벤트 전달 시점
+#   이 스레드가 그 DB 의 커넥션을 쓰는 중이면 이벤트를 커넥션에 모아 두고
+#     - 커밋 직전 : 커밋 훅을 같은 트랜잭션에서 호출 (변경 피드 기록 등)
+#     - 커밋 후   : 리스너에 전달 (캐시, 랭킹 등 메모리 상태)
+#     - 롤백      : 버림
+#   커넥션이 없으면 (이미 커밋된 쓰기) 바로 훅 / 리스너 호출
+
+_listeners = []
+_commit_hooks = []
+
+# db_name -> 이 스레드가 사용 중인 커넥션 (connection_pool 이 등록)
+_connection_lookup = None
+
+# db_name -> 커밋했거나 커밋 중이지만 아직 리스너에 전달하지 않은 이벤트 묶음 수
+_in_flight = {}
+# db_name -> 리스너에 전달한 이벤트 묶음 수
+_generations = {}
+# 여러 스레드(풀 커넥션, 쓰기 큐, 샤드 작업 등) 가 동시에 바꾸므로 두 카운터를 같은 잠금으로 보호
+_state_lock = threading.Lock()
+
+def subscribe(listener):
+    """listener(event) 등록 (캐시, 랭킹 등 쓰기 경로를 따라가야 하는 모듈에서 사용, 커밋된 이벤트만 전달)"""
+    if listener not in _listeners:
+        _listeners.append(listener)
+    return listener
+
+def unsubscribe(listener):
+    if listener in _listeners:
+        _listeners.remove(listener)
+
+def add_commit_hook(hook):
+    """hook(conn, events) 등록 (커밋 직전 같은 트랜잭션에서 호출, 트랜잭션 밖에서 발행된 이벤트면 conn 은 None)"""
+    if hook not in _commit_hooks:
+        _commit_hooks.append(hook)
+    return hook
+
+def set_connection_lookup(lookup):
+    global _connection_lookup
+    _connection_lookup = lookup
+
+def publish(db_name, table, op, key=None, values=None):
+    """쓰기 경로에서 호출 (db_name 을 모르는 커넥션이면 발행하지 않음)"""
+    if db_name is None or not (_listeners or _commit_hooks):
+        return
+    event = WriteEvent(db_name, table, op, key, values)
+
+    conn = _connection_lookup(db_name) if _connection_lookup is not None else None
+    if conn is not None:
+        conn.pending_events.append(event)
+        return
+
+    prepare(None, [event])
+    deliver([event])
+
+def prepare(conn, events):
+    """커밋 직전 (conn 의 트랜잭션 안) 에 호출, 훅이 실패하면 예외를 그대로 올림 (호출한 쪽이 롤백)"""
+    if not events:
+        return
+    for hook in list(_commit_hooks):
+        hook(conn, events)
+    db_name = events[0].db_name
+    with _state_lock:
+        _in_flight[db_name] = _in_flight.get(db_name, 0) + 1
+
+def deliver(events):
+    """커밋 후 리스너에 전달 (이미 커밋된 쓰기이므로 리스너 오류는 기록만 함)"""
+    if not events:
+        return
+    db_name = events[0].db_name
+    try:
+        for event in events:
+            for listener in list(_listeners):
+                try:
+                    listener(event)
+                except Exception as e:
+                    print(f"Error: write listener {getattr(listener, '__qualname__', listener)} failed: {e}")
+    finally:
+        with _state_lock:
+            _generations[db_name] = _generations.get(db_name, 0) + 1
+            _in_flight[db_name] -= 1
+
+def abandon(events):
+    """prepare 한 뒤 커밋에 실패한 이벤트 (리스너에 전달하지 않음)"""
+    if events:
+        with _state_lock:
+            _in_flight[events[0].db_name] -= 1
+
+def state(db_name):
+    """(전달 대기 중인 묶음 수, 전달한 묶음 수)
+    DB 를 읽어 메모리 상태를 만드는 쪽은 읽기 전후로 비교해, 대기 중이거나 바뀌었으면 다시 읽음"""
+    with _state_lock:
+        return _in_flight.get(db_name, 0), _generations.get(db_name, 0)
+
+def publish_member(db_name, op, nick_name=None, values=None):
+    publish(db_name, "member", op, nick_name, values)
+
+def publish_content_record(db_name, op, content_name, start_date, nick_name=None, day=None, values=None):
+    publish(db_name, "content_record", op, (content_name, start_date, nick_name, day), values)
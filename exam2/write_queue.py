@@ -0,0 +1,244 @@
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from functools import wraps
+
+from connection_pool import STATEMENT_CACHE_SIZE, PooledConnection, get_pool, ensure_started
+from query_log import skip_caller_file
+import write_events
+
+# 단일 writer 스레드 + 그룹 커밋
+# writer 스레드 하나가 쓰기 전용 커넥션을 소유하고, 큐에 쌓인 쓰기 작업을 모아서 한 트랜잭션으로 커밋
+# 작업마다 SAVEPOINT 를 두어 하나가 실패해도 같은 그룹의 다른 작업은 커밋됨
+# 작업의 Future 는 커밋이 끝난 뒤에 완료됨
+# 작업이 발행한 쓰기 이벤트는 작업별로 모아 두었다가 (ROLLBACK TO 면 버림) 그룹 COMMIT 이 성공한 뒤에 전달
+
+_STOP = object()
+
+skip_caller_file(__file__)
+
+# writer 스레드에서 쓰는 커넥션 (커밋은 그룹 단위로 writer 가 직접 처리)
+class GroupConnection(PooledConnection):
+    # 현재 작업이 시작될 때의 pending_events 길이 (작업을 되돌리면 그 뒤의 이벤트를 버림)
+    op_mark = 0
+
+    def commit(self):
+        # 그룹 커밋 시점까지 미룸
+        pass
+
+    def rollback(self):
+        # 현재 작업만 되돌림
+        if self.raw.in_transaction:
+            self.raw.execute("ROLLBACK TO write_op")
+        del self.pending_events[self.op_mark:]
+
+    def close(self):
+        # 고정된 커넥션이므로 중첩 깊이만 줄임
+        if self.depth > 1:
+            self.depth -= 1
+
+class WriteQueue:
+    def __init__(self, db_name="MemberManagement.db", max_batch=256, max_delay=0.002, busy_timeout=5000):
+        self.db_name = db_name
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.busy_timeout = busy_timeout
+
+        self._queue = queue.Queue()
+        self._ready = threading.Event()
+        self._error = None
+        self._closed = False
+
+        # 통계
+        self.operations = 0
+        self.groups = 0
+        self.failed_operations = 0
+
+        self._thread = threading.Thread(target=self._run, name=f"write-queue-{db_name}", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+
+    def in_writer_thread(self):
+        return threading.current_thread() is self._thread
+
+    def submit(self, func, *args, **kwargs):
+        """func(conn, *args, **kwargs) 를 writer 스레드에서 실행할 작업으로 등록, Future 를 반환"""
+        if self._closed:
+            raise RuntimeError(f"Write queue for '{self.db_name}' is closed.")
+
+        future = Future()
+        self._queue.put((future, func, args, kwargs))
+        return future
+
+    def execute(self, sql, params=()):
+        """SQL 한 문장을 쓰기 작업으로 등록"""
+        return self.submit(lambda conn: conn.execute(sql, params).rowcount)
+
+    def _connect(self):
+        raw = sqlite3.connect(self.db_name, isolation_level=None, check_same_thread=False,
+                              cached_statements=STATEMENT_CACHE_SIZE)
+        raw.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout)}")
+        raw.execute("PRAGMA journal_mode = WAL")
+        raw.execute("PRAGMA synchronous = NORMAL")
+        return raw
+
+    def _run(self):
+        pool = get_pool(self.db_name)
+        try:
+            conn = GroupConnection(pool, self._connect())
+        except sqlite3.Error as e:
+            self._error = e
+            self._ready.set()
+            return
+
+        # writer 스레드 안에서 get_connection() 을 호출하면 이 커넥션을 사용
+        pool.pin(conn)
+        self._ready.set()
+
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            group = [item]
+            deadline = time.monotonic() + self.max_delay
+            while len(group) < self.max_batch:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                group.append(item)
+
+            self._commit_group(conn, group)
+
+        pool.unpin()
+        conn.raw.close()
+
+    def _commit_group(self, conn, group):
+        raw = conn.raw
+        results = []
+        conn.pending_events = []
+        try:
+            raw.execute("BEGIN IMMEDIATE")
+        except sqlite3.Error as e:
+            for future, _, _, _ in group:
+                if future.set_running_or_notify_cancel():
+                    future.set_exception(e)
+            return
+
+        for future, func, args, kwargs in group:
+            if not future.set_running_or_notify_cancel():
+                continue
+
+            raw.execute("SAVEPOINT write_op")
+            conn.depth = 1
+            conn.op_mark = len(conn.pending_events)
+            try:
+                result = func(conn, *args, **kwargs)
+            except BaseException as e:
+                raw.execute("ROLLBACK TO write_op")
+                raw.execute("RELEASE write_op")
+                del conn.pending_events[conn.op_mark:]
+                results.append((future, None, e))
+                self.failed_operations += 1
+            else:
+                raw.execute("RELEASE write_op")
+                results.append((future, result, None))
+
+        events, conn.pending_events = conn.pending_events, []
+        prepared = False
+        try:
+            # 커밋 훅 (변경 피드 등) 은 그룹 트랜잭션 안에서
+            write_events.prepare(conn, events)
+            prepared = True
+            raw.execute("COMMIT")
+        except Exception as e:
+            if raw.in_transaction:
+                raw.execute("ROLLBACK")
+            if prepared:
+                write_events.abandon(events)
+            events = []
+            results = [(future, None, e) for future, _, _ in results]
+        else:
+            # 커밋된 뒤에 리스너에 전달 (작업의 Future 가 완료되기 전에 캐시 / 랭킹이 반영됨)
+            write_events.deliver(events)
+
+        self.groups += 1
+        self.operations += len(results)
+        for future, result, error in results:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def stats(self):
+        return {
+            "db_name": self.db_name,
+            "queued": self._queue.qsize(),
+            "operations": self.operations,
+            "groups": self.groups,
+            "operations_per_group": self.operations / self.groups if self.groups else 0.0,
+            "failed_operations": self.failed_operations,
+        }
+
+    def close(self):
+        """남은 작업을 모두 커밋한 뒤 writer 스레드 종료"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join()
+
+# DB 파일별 쓰기 큐 레지스트리
+_queues = {}
+_queues_lock = threading.Lock()
+
+def enable_write_queue(db_name="MemberManagement.db", **options):
+    """DB 의 쓰기를 writer 스레드로 보내도록 설정 (queued_write 가 붙은 함수에 적용)"""
+    # 처음 사용 훅(스키마 확인)이 writer 스레드의 쓰기 작업 안에서 실행되지 않도록 먼저 실행
+    ensure_started(db_name)
+    with _queues_lock:
+        write_queue = _queues.get(db_name)
+        if write_queue is None:
+            write_queue = _queues[db_name] = WriteQueue(db_name, **options)
+    return write_queue
+
+def disable_write_queue(db_name="MemberManagement.db"):
+    with _queues_lock:
+        write_queue = _queues.pop(db_name, None)
+    if write_queue is not None:
+        write_queue.close()
+
+def get_write_queue(db_name):
+    return _queues.get(db_name)
+
+def _in_caller_transaction(target):
+    conn = target if isinstance(target, PooledConnection) else get_pool(target.db_name).held()
+    return conn is not None and conn.raw.in_transaction
+
+def queued_write(func):
+    """쓰기 함수 데코레이터 (시그니처는 그대로)
+    첫 번째 인자(커넥션 또는 게이트웨이)의 db_name 에 쓰기 큐가 켜져 있으면 writer 스레드에서 실행하고 커밋까지 기다림
+    첫 번째 인자가 커넥션이면 writer 스레드의 커넥션으로 바꿔서 호출
+    호출한 스레드의 커넥션에 커밋하지 않은 쓰기가 있으면 (with get_connection() 블록 안에서 이미 쓴 경우)
+    writer 스레드는 그 트랜잭션이 끝날 때까지 잠금을 얻지 못하므로 큐로 보내지 않고 그 트랜잭션 안에서 바로 실행
+    (쓰기 큐가 없을 때와 같이 함수의 commit 이 앞선 쓰기까지 함께 커밋)"""
+    @wraps(func)
+    def wrapper(target, *args, **kwargs):
+        write_queue = _queues.get(getattr(target, "db_name", None)) if _queues else None
+        if write_queue is None or write_queue.in_writer_thread() or _in_caller_transaction(target):
+            return func(target, *args, **kwargs)
+
+        if isinstance(target, PooledConnection):
+            return write_queue.submit(func, *args, **kwargs).result()
+        return write_queue.submit(lambda conn: func(target, *args, **kwargs)).result()
+
+    return wrapper